@@ -0,0 +1,144 @@
+"""
+This module provides numeric backends, which choose the number type a session or batch computes with.
+
+    float       Python floats (the default, and the fastest)
+    decimal     decimal.Decimal, rounded to a configurable number of significant digits
+    fraction    fractions.Fraction, exact rational arithmetic
+
+The functions in app.operations only use +, -, * and /, so every registered calculator works with any of
+these number types. A backend therefore supplies the two things that do differ: how operands are parsed
+from text, and the arithmetic context (for Decimal, the precision) in which the calculators run.
+
+Why keep float out of the backend machinery?
+-The REPL and batch mode take backend=None to mean float, and then run exactly the code they ran before,
+so sessions that do not need exact arithmetic do not pay for it.
+-Exact streams select a backend explicitly and only they pay for parsing and context switching.
+"""
+
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, ContextManager, Optional
+from app.calculation import CalculatorFactory
+
+# decimal and fractions are imported by the backends that use them, so a float session (which may still
+# create a plain Backend, e.g. for its variables) never loads them.
+if TYPE_CHECKING:
+    import decimal
+    from fractions import Fraction
+
+# Names accepted by get_backend.
+BACKENDS = ("float", "decimal", "fraction")
+
+# Significant digits used by the decimal backend when no precision is given (decimal's own default).
+DEFAULT_PRECISION = 28
+
+
+class Backend:
+    """
+    Base class of the numeric backends.
+
+    Attributes:
+        name (str): The backend name, as accepted by get_backend.
+
+    Methods:
+        parse(text: str) -> number: Convert an operand from text; raises ValueError for invalid input.
+        context() -> ContextManager: Return the context calculations of this backend must run in.
+        compute(operation: str, a, b) -> number: Return the result of an operation, like CalculatorFactory.compute.
+        describe(error: ArithmeticError) -> str: Return the message to report for an arithmetic error of this backend.
+    """
+
+    name = "float"
+
+    def parse(self, text: str):
+        return float(text)
+
+    def context(self) -> ContextManager:
+        return nullcontext()
+
+    def compute(self, operation: str, a, b):
+        with self.context():
+            return CalculatorFactory.compute(operation, a, b)
+
+    def describe(self, error: ArithmeticError) -> str:
+        return str(error)
+
+
+class DecimalBackend(Backend):
+    """
+    decimal.Decimal backend. Operands are parsed exactly; every result is rounded to precision significant digits.
+    """
+
+    name = "decimal"
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        if precision < 1:
+            raise ValueError("Precision must be at least 1.")
+        import decimal
+        self.precision = precision
+        self._decimal = decimal
+        self._context = decimal.Context(prec=precision)
+
+    def parse(self, text: str) -> "decimal.Decimal":
+        decimal = self._decimal
+        try:
+            return decimal.Decimal(text)
+        except decimal.InvalidOperation:
+            # Decimal signals invalid text with its own exception; report it like float() does.
+            raise ValueError(f"could not convert string to Decimal: '{text}'") from None
+
+    def context(self) -> ContextManager:
+        # localcontext copies the context, so sessions with different precisions never affect each other.
+        return self._decimal.localcontext(self._context)
+
+    def describe(self, error: ArithmeticError) -> str:
+        # Decimal signals carry no message of their own (str() is "[<class 'decimal.Overflow'>]").
+        decimal = self._decimal
+        if isinstance(error, decimal.Overflow):
+            return f"The result is too large for the decimal backend (precision {self.precision})."
+        if isinstance(error, decimal.InvalidOperation):
+            return "The result is undefined for these operands (for example, inf * 0)."
+        if isinstance(error, decimal.DecimalException):
+            return f"Decimal arithmetic signalled {type(error).__name__}."
+        return str(error)
+
+
+class FractionBackend(Backend):
+    """
+    fractions.Fraction backend. Operands may be written as decimals ("0.1") or ratios ("1/3"); results are exact.
+    """
+
+    name = "fraction"
+
+    def __init__(self) -> None:
+        from fractions import Fraction
+        self._fraction = Fraction
+
+    def parse(self, text: str) -> "Fraction":
+        try:
+            return self._fraction(text)
+        except ZeroDivisionError:
+            raise ValueError(f"could not convert string to Fraction: '{text}'") from None
+
+    def compute(self, operation: str, a, b) -> "Fraction":
+        # Fraction arithmetic needs no context.
+        return CalculatorFactory.compute(operation, a, b)
+
+
+def get_backend(name: str, precision: Optional[int] = None) -> Backend:
+    """
+    Return the backend with the given name.
+
+    Parameters:
+        name (str): One of BACKENDS.
+        precision (int): Significant digits of the decimal backend; not allowed for the other backends.
+    Raises:
+        ValueError: If the backend is not supported, or precision is given for a backend other than decimal.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend '{name}' is not supported.")
+    if precision is not None and name != "decimal":
+        raise ValueError("Precision only applies to the decimal backend.")
+    if name == "decimal":
+        return DecimalBackend(DEFAULT_PRECISION if precision is None else precision)
+    if name == "fraction":
+        return FractionBackend()
+    return Backend()
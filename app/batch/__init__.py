@@ -0,0 +1,321 @@
+"""
+This module provides a non-interactive batch mode for the calculator.
+
+Batch mode reads '<operation> <num1> <num2>' lines from a file (or standard input) and writes one
+result line per command, without prompts, banners or readline. The work is split into a pipeline
+of generators, so every line flows through parsing, dispatch and writing without building lists:
+
+    lines -> parse_commands -> evaluate_commands -> write_results
+
+Why use a generator pipeline?
+-Each stage only holds the line it is working on, so memory use does not depend on the input size.
+-Results are written through a buffered writer in large blocks instead of one flushed print per line.
+
+A numeric backend (see app.backends) can be passed to parse and compute with Decimal or Fraction
+values instead of floats; without one, the float pipeline above runs unchanged.
+
+For very large command files, run_batch_parallel memory-maps the file, splits it into chunks on line
+boundaries and runs the same pipeline on each chunk in a pool of worker processes. The output of the
+chunks is written back in input order.
+"""
+
+import io
+import mmap
+import os
+import sys
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from app.calculation import CalculatorFactory
+from app.scanner import MALFORMED, UNKNOWN_OPERATION, scan
+from app.vectors import VectorCommand, evaluate_vector, format_vector, is_vector_command
+from app.reductions import SUM_COMMAND, ReductionCommand, evaluate_reduction, reduction_command
+
+if TYPE_CHECKING:
+    # Only for annotations: app.backends imports decimal and fractions, which float runs never need.
+    from app.backends import Backend
+
+# Size of the read and write buffers used for files, in bytes.
+BUFFER_SIZE = 1 << 16
+
+# Default size of the chunks handed to worker processes, in bytes.
+CHUNK_SIZE = 8 << 20
+
+# Marker yielded by parse_commands for lines that are not in the '<operation> <num1> <num2>' format.
+INVALID_INPUT = None
+
+Command = Optional[Union[Tuple[str, float, float], VectorCommand, ReductionCommand]]
+
+
+def parse_commands(lines: Iterable[str], backend: Optional["Backend"] = None) -> Iterator[Command]:
+    """
+    Parse command lines into (operation, num1, num2) tuples.
+    Blank lines are skipped; malformed lines yield INVALID_INPUT so the output stays aligned with the input.
+    Lines with vector operands (see app.vectors) yield a VectorCommand, and n-ary lines such as
+    "add 1 2 3" or "sum @values.bin" (see app.reductions) yield a ReductionCommand.
+
+    Lines are read with app.scanner.scan, which rejects the common malformed lines (wrong token counts,
+    words instead of numbers) without raising an exception, and is as fast as plain splitting on valid lines.
+
+    Parameters:
+        lines (Iterable[str]): The input lines.
+        backend (Backend): Optional numeric backend that parses the numbers; floats are used without one.
+    """
+    if backend is not None:
+        yield from _parse_with_backend(lines, backend)
+        return
+    operation_name = CalculatorFactory.operation_name
+    for line in lines:
+        code, a, b = scan(line)
+        if code >= 0:
+            yield operation_name(code), a, b
+        elif code == MALFORMED:
+            # Rare path: vector and n-ary lines are not scalar commands, but are still valid.
+            parts = line.split()
+            if is_vector_command(parts):
+                yield VectorCommand(parts[0].lower(), parts[1], parts[2])
+            else:
+                yield reduction_command(parts) or INVALID_INPUT
+        elif code == UNKNOWN_OPERATION:
+            operation, num1_str, num2_str = line.split()
+            if operation.lower() == SUM_COMMAND:
+                # "sum 1 2" has the shape of a binary command, but sum is a reduction (see app.reductions).
+                yield ReductionCommand(SUM_COMMAND, (num1_str, num2_str))
+                continue
+            # Rare path: pass the unknown name on, so evaluation reports it like the REPL does.
+            yield operation.lower(), float(num1_str), float(num2_str)
+        # EMPTY: skip blank lines.
+
+
+def _parse_with_backend(lines: Iterable[str], backend: "Backend") -> Iterator[Command]:
+    """
+    Parse command lines like parse_commands, converting the numbers with a numeric backend.
+    """
+    parse = backend.parse
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != 3 or parts[0].lower() == SUM_COMMAND:
+            # n-ary lines such as "add 0.1 0.2 0.3" are reduced with the backend too.
+            yield reduction_command(parts) or INVALID_INPUT
+            continue
+        try:
+            yield parts[0].lower(), parse(parts[1]), parse(parts[2])
+        except ValueError:
+            yield INVALID_INPUT
+
+
+def evaluate_commands(
+    commands: Iterable[Command],
+    backend: Optional["Backend"] = None,
+    allow_files: bool = True,
+) -> Iterator[str]:
+    """
+    Dispatch parsed commands through the CalculatorFactory and yield one output line per command.
+    Results are formatted like Python floats (e.g., "8.0"), or like the backend's numbers (e.g., "1/3");
+    vector results are comma-separated (e.g., "5.0,7.0,9.0"). Failures are reported as "error: <message>".
+
+    Parameters:
+        commands (Iterable[Command]): The output of parse_commands.
+        backend (Backend): Optional numeric backend to compute with (must match the one used for parsing).
+        allow_files (bool): Whether vector commands may read "@path" operands.
+    """
+    if backend is not None:
+        yield from _evaluate_with_backend(commands, backend)
+        return
+    for command in commands:
+        if command is INVALID_INPUT:
+            yield "error: Invalid input. Please follow the format: <operation> <num1> <num2>"
+            continue
+        if type(command) is not tuple:
+            # Rare path: vector and reduction commands (plain commands are plain tuples).
+            try:
+                if type(command) is VectorCommand:
+                    yield format_vector(evaluate_vector(command, allow_files))
+                else:
+                    yield str(evaluate_reduction(command, allow_files))
+            except (ValueError, ZeroDivisionError) as e:
+                yield f"error: {e}"
+            continue
+        operation, a, b = command
+        try:
+            yield str(CalculatorFactory.create_calculator(operation, a, b).result)
+        except (ValueError, ZeroDivisionError) as e:
+            yield f"error: {e}"
+
+
+def _evaluate_with_backend(commands: Iterable[Command], backend: "Backend") -> Iterator[str]:
+    """
+    Evaluate parsed commands like evaluate_commands, computing with a numeric backend.
+    """
+    compute = backend.compute
+    for command in commands:
+        if command is INVALID_INPUT:
+            yield "error: Invalid input. Please follow the format: <operation> <num1> <num2>"
+            continue
+        try:
+            if type(command) is ReductionCommand:
+                yield str(evaluate_reduction(command, backend=backend))
+            else:
+                yield str(compute(*command))
+        except (ValueError, ZeroDivisionError) as e:
+            yield f"error: {e}"
+        except ArithmeticError as e:
+            # Decimal signals such as Overflow and InvalidOperation (e.g., inf * 0) fail one line, not the run.
+            yield f"error: {backend.describe(e)}"
+
+
+def write_results(results: Iterable[str], output: TextIO) -> int:
+    """
+    Write every result as one line to output and return the number of lines written.
+
+    Parameters:
+        results (Iterable[str]): The output of evaluate_commands.
+        output (TextIO): A text stream; it is written in blocks and flushed once at the end.
+    """
+    count = 0
+    write = output.write
+    for result in results:
+        write(result)
+        write("\n")
+        count += 1
+    output.flush()
+    return count
+
+
+def evaluate_line(line: str, allow_files: bool = True) -> Optional[str]:
+    """
+    Evaluate a single command line and return its output line, or None for a blank line.
+    This is a convenience wrapper around the pipeline for callers that handle one line at a time.
+    Callers that evaluate remote input pass allow_files=False, so "@path" operands cannot read local files.
+    """
+    return next(evaluate_commands(parse_commands((line,)), allow_files=allow_files), None)
+
+
+def run_batch(source: str, output: Optional[TextIO] = None, backend: Optional["Backend"] = None) -> int:
+    """
+    Run batch mode over a file and return the number of result lines written.
+
+    Parameters:
+        source (str): The path of the command file, or "-" to read from standard input.
+        output (TextIO): Where to write the results. Defaults to standard output.
+        backend (Backend): Optional numeric backend (see app.backends); floats are used without one.
+    """
+    if output is None:
+        output = sys.stdout
+    # Bytes that are not UTF-8 are decoded as U+FFFD, so they fail their own line as invalid input
+    # instead of raising UnicodeDecodeError out of the whole run.
+    if source == "-":
+        if isinstance(sys.stdin, io.TextIOWrapper):
+            sys.stdin.reconfigure(encoding="utf-8", errors="replace")
+        return write_results(evaluate_commands(parse_commands(sys.stdin, backend), backend), output)
+    with open(source, "r", buffering=BUFFER_SIZE, encoding="utf-8", errors="replace") as lines:
+        return write_results(evaluate_commands(parse_commands(lines, backend), backend), output)
+
+
+def split_chunks(buffer: mmap.mmap, chunk_size: int = CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split a memory-mapped file into (start, end) byte ranges that end on line boundaries.
+    Every range is roughly chunk_size bytes, except that it is extended to the end of its last line.
+
+    Parameters:
+        buffer (mmap.mmap): The memory-mapped command file.
+        chunk_size (int): The target size of each chunk in bytes.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    size = len(buffer)
+    chunks = []
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            # Move the end forward to just after the next newline, so no line is cut in half.
+            newline = buffer.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+# The memory map of the command file, opened once per worker process by _init_worker.
+_worker_buffer = None
+
+
+def _init_worker(path: str) -> None:
+    """
+    Open and memory-map the command file in a worker process.
+    """
+    global _worker_buffer
+    with open(path, "rb") as file:
+        _worker_buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _iter_chunk_lines(buffer: mmap.mmap, start: int, end: int) -> Iterator[str]:
+    """
+    Yield the lines of buffer[start:end] as strings (invalid UTF-8 is replaced, as in run_batch).
+    Each line is decoded straight from a memoryview slice of the map, so the chunk itself is never copied.
+    """
+    view = memoryview(buffer)
+    try:
+        while start < end:
+            newline = buffer.find(b"\n", start, end)
+            stop = end if newline == -1 else newline
+            yield str(view[start:stop], "utf-8", "replace")
+            start = stop + 1
+    finally:
+        # Release the view so the map can be closed once the chunk is done.
+        view.release()
+
+
+def _evaluate_chunk(chunk: Tuple[int, int]) -> Tuple[str, int]:
+    """
+    Run the batch pipeline over one chunk in a worker process.
+    Returns the chunk's output text and its number of result lines.
+    """
+    start, end = chunk
+    results = list(evaluate_commands(parse_commands(_iter_chunk_lines(_worker_buffer, start, end))))
+    if not results:
+        return "", 0
+    return "\n".join(results) + "\n", len(results)
+
+
+def run_batch_parallel(
+    path: str,
+    output: Optional[TextIO] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Run batch mode over a large command file using several processes and return the number of result lines.
+    The output is identical to run_batch, including its order.
+
+    Parameters:
+        path (str): The path of the command file (standard input cannot be memory-mapped).
+        output (TextIO): Where to write the results. Defaults to standard output.
+        workers (int): The number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int): The target size of each chunk in bytes.
+
+    Note:
+        Worker processes see the operations registered at import time of app.calculation.
+        Operations registered later at runtime are only visible to workers on platforms that fork.
+    """
+    # Imported here so that plain batch runs do not pay for loading concurrent.futures at start-up.
+    from concurrent.futures import ProcessPoolExecutor
+
+    if output is None:
+        output = sys.stdout
+    # An empty file cannot be memory-mapped, and has nothing to evaluate anyway.
+    if os.path.getsize(path) == 0:
+        return 0
+
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        chunks = split_chunks(buffer, chunk_size)
+
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as executor:
+        # executor.map returns the chunk results in submission order, which keeps the output in input order.
+        for text, lines in executor.map(_evaluate_chunk, chunks):
+            output.write(text)
+            count += lines
+    output.flush()
+    return count
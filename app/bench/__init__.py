@@ -0,0 +1,299 @@
+"""
+This module provides a benchmark suite for the calculation stack.
+
+Each layer of the stack is timed separately, from the raw arithmetic up to a scripted REPL session:
+
+    operations      Operations.add called directly
+    dispatch        CalculatorFactory.create_calculator
+    compute         CalculatorFactory.compute (no Calculation object)
+    excute          Calculation.excute on an existing calculation
+    str             Calculation.__str__ formatting (result already computed)
+    parse           app.scanner.scan on one command line
+    repl_session    calculator() fed from an in-memory script, per command line
+    cold_start      a new interpreter running "main.py --batch -" on empty input, per run
+
+Results are reported as nanoseconds per operation and can be saved as a JSON baseline.
+The report also includes the memory held per calculation object (see measure_memory); memory is
+informational and is not compared against the baseline.
+Later runs are compared against the baseline, and any layer slower than the baseline by more than
+a threshold (25% by default) is reported as a regression.
+
+Usage:
+    python -m app.bench                         # print results as JSON
+    python -m app.bench --save-baseline FILE    # also store them as a baseline
+    python -m app.bench --baseline FILE         # compare against a baseline (exit code 1 on regression)
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.calculation import AddCalculator, CalculatorFactory
+from app.operations import Operations
+from app.scanner import scan
+
+# Default number of calls per timing run, and number of runs (the fastest run is kept).
+NUMBER = 20_000
+REPEAT = 5
+
+# Default allowed slowdown before a layer counts as a regression (0.25 means 25% slower).
+THRESHOLD = 0.25
+
+# Number of calculations kept alive by the memory benchmark, and distinct triples among them when pooled.
+MEMORY_COUNT = 10_000
+POOLED_TRIPLES = 100
+
+# The application entry point, started in a new interpreter by the cold-start benchmark and the import profile.
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "main.py")
+
+# Number of imports listed by startup_profile.
+PROFILE_TOP = 15
+
+# Commands used for the scripted REPL session.
+SESSION_COMMANDS = ["add 5 3", "subtract 10 4", "multiply 2 3", "divide 8 2"]
+
+
+def _time(function: Callable[[], object], number: int, repeat: int) -> float:
+    """
+    Return the best time of one call to function, in nanoseconds.
+    """
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def _repl_session(lines: int) -> Callable[[], None]:
+    """
+    Build a function that runs calculator() over a script of the given number of command lines.
+    input() reads from an in-memory buffer and all output is discarded.
+    """
+    from app.calculator import calculator
+
+    script = "\n".join(SESSION_COMMANDS[i % len(SESSION_COMMANDS)] for i in range(lines)) + "\nexit\n"
+
+    def session() -> None:
+        stdin = sys.stdin
+        sys.stdin = io.StringIO(script)
+        try:
+            with redirect_stdout(io.StringIO()):
+                calculator()
+        except SystemExit:
+            pass
+        finally:
+            sys.stdin = stdin
+
+    return session
+
+
+def _run_main(arguments: List[str], python_options: Sequence[str] = ()) -> subprocess.CompletedProcess:
+    """
+    Run main.py with arguments in a new interpreter, with empty standard input, and capture its output.
+    """
+    return subprocess.run(
+        [sys.executable, *python_options, MAIN_PATH, *arguments],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def measure_cold_start(repeat: int = REPEAT) -> float:
+    """
+    Return the best wall-clock time, in nanoseconds, of starting a short-lived "main.py --batch -" run.
+    This covers interpreter start-up, every import main.py needs for batch mode, and exiting.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        _run_main(["--batch", "-"])
+        best = min(best, time.perf_counter_ns() - start)
+    return best
+
+
+def parse_importtime(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse the output of "python -X importtime" into (module, self_us, cumulative_us) rows, in output order.
+    Lines that are not import timings (such as the header, or the program's own error output) are skipped.
+    """
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def startup_profile(arguments: List[str], top: int = PROFILE_TOP) -> str:
+    """
+    Run main.py with arguments under "python -X importtime" and format its slowest imports.
+
+    The command runs with empty standard input (so the REPL exits at once) and its own output is discarded.
+    The report lists the top imports by cumulative time, and the total import time of the run.
+    """
+    rows = parse_importtime(_run_main(arguments, ("-X", "importtime")).stderr)
+    # Every microsecond of import time is the self time of exactly one module.
+    total = sum(self_us for _, self_us, _ in rows)
+    lines = [
+        f"Start-up imports of: main.py {' '.join(arguments)}".rstrip(),
+        f"{'self [us]':>10}{'cumulative [us]':>17}  module",
+    ]
+    for module, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        lines.append(f"{self_us:>10}{cumulative_us:>17}  {module}")
+    lines.append(f"Total import time: {total / 1000:.1f} ms over {len(rows)} modules")
+    return "\n".join(lines)
+
+
+def run_benchmarks(number: int = NUMBER, repeat: int = REPEAT) -> Dict[str, float]:
+    """
+    Time every layer and return a mapping of layer name to nanoseconds per operation.
+
+    Parameters:
+        number (int): Calls per timing run (the REPL session uses number // 100 lines, at least 10).
+        repeat (int): Timing runs per layer; the fastest is kept.
+    """
+    calculation = CalculatorFactory.create_calculator("add", 5.0, 3.0)
+    calculation.result  # compute once, so "str" only measures formatting
+    create = CalculatorFactory.create_calculator
+    compute = CalculatorFactory.compute
+    add = Operations.add
+
+    results = {
+        "operations": _time(lambda: add(5.0, 3.0), number, repeat),
+        "dispatch": _time(lambda: create("add", 5.0, 3.0), number, repeat),
+        "compute": _time(lambda: compute("add", 5.0, 3.0), number, repeat),
+        "excute": _time(calculation.excute, number, repeat),
+        "str": _time(calculation.__str__, number, repeat),
+        "parse": _time(lambda: scan("add 5 3"), number, repeat),
+    }
+
+    lines = max(10, number // 100)
+    results["repl_session"] = _time(_repl_session(lines), 1, repeat) / lines
+    results["cold_start"] = measure_cold_start(repeat)
+    return results
+
+
+class _DictAddCalculator(AddCalculator):
+    """
+    AddCalculator with an instance __dict__ (a subclass without __slots__), the layout used before __slots__.
+    """
+
+
+def _bytes_per_object(build: Callable[[], list]) -> float:
+    """
+    Return the memory held by the list that build returns, in bytes per element (including its list slot).
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = build()
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return held / len(objects)
+
+
+def measure_memory(count: int = MEMORY_COUNT) -> Dict[str, float]:
+    """
+    Measure the memory held per calculation, in bytes, while count calculations are kept alive:
+
+        slots       calculations from create_calculator (__slots__, no instance __dict__)
+        dict        the same calculations with an instance __dict__, for comparison
+        pooled      calculations from create_calculator with the instance pool enabled,
+                    where only POOLED_TRIPLES distinct (operation, a, b) triples occur
+
+    The operands are created before measuring, so only the calculations themselves are counted.
+    """
+    count = max(count, POOLED_TRIPLES)
+    operands = [float(i) for i in range(count)]
+    create = CalculatorFactory.create_calculator
+
+    results = {
+        "slots": _bytes_per_object(lambda: [create("add", a, 1.0) for a in operands]),
+        "dict": _bytes_per_object(lambda: [_DictAddCalculator(a, 1.0) for a in operands]),
+    }
+
+    previous = CalculatorFactory._instance_pool
+    CalculatorFactory.enable_instance_pool(POOLED_TRIPLES)
+    try:
+        repeated = [operands[i % POOLED_TRIPLES] for i in range(count)]
+        results["pooled"] = _bytes_per_object(lambda: [create("add", a, 1.0) for a in repeated])
+    finally:
+        CalculatorFactory._instance_pool = previous
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float = THRESHOLD) -> List[dict]:
+    """
+    Compare results with a baseline and return one entry per regressed layer.
+    A layer regresses when it is slower than its baseline by more than threshold (a fraction).
+    Layers missing from either side are ignored.
+    """
+    regressions = []
+    for layer, value in results.items():
+        reference = baseline.get(layer)
+        if reference is None or reference <= 0:
+            continue
+        change = value / reference - 1
+        if change > threshold:
+            regressions.append({"layer": layer, "baseline_ns": reference, "current_ns": value, "change": change})
+    return regressions
+
+
+def report(
+    results: Dict[str, float],
+    regressions: Optional[List[dict]] = None,
+    memory: Optional[Dict[str, float]] = None,
+) -> dict:
+    """
+    Build the JSON report for a run.
+    """
+    document = {
+        "python": platform.python_version(),
+        "unit": "ns/op",
+        "results": results,
+    }
+    if memory is not None:
+        document["memory_bytes_per_calculation"] = memory
+    if regressions is not None:
+        document["regressions"] = regressions
+    return document
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point. Returns the process exit code (1 if any layer regressed).
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description="Benchmark the calculation stack.")
+    parser.add_argument("--number", type=int, default=NUMBER, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timing runs per layer (the fastest is kept)")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a baseline JSON report")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write this run's report to FILE")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.number, args.repeat)
+    memory = measure_memory(args.number)
+
+    regressions = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+
+    document = report(results, regressions, memory)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(report(results), file, indent=2)
+    print(json.dumps(document, indent=2))
+    return 1 if regressions else 0
@@ -0,0 +1,8 @@
+"""
+Run the benchmark suite: python -m app.bench --help
+"""
+
+import sys
+from app.bench import main
+
+sys.exit(main())
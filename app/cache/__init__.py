@@ -0,0 +1,102 @@
+"""
+This module provides a small least-recently-used (LRU) cache.
+
+The CalculatorFactory uses it as an optional process-wide result cache keyed on (operation, a, b),
+so repeated calculations with an expensive registered operation are only computed once.
+
+Why write our own LRU cache instead of using functools.lru_cache?
+-functools.lru_cache wraps a single function, while we need one cache shared by every calculator class.
+-We also want to inspect and reset the cache (size bound, evictions, hit/miss counters) at runtime.
+
+The cache is shared by every thread that uses the factory, so each operation holds a lock: a lookup
+that moves an entry while another thread evicts it would otherwise fail, and counters would lose updates.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry when it is full.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept in the cache.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+        evictions (int): The number of entries removed to respect maxsize.
+
+    Methods:
+        get(key) -> Optional[Any]: Return the cached value for a key, or None.
+        put(key, value) -> None: Store a value, evicting the oldest entry if needed.
+        clear() -> None: Remove all entries and reset the counters.
+        info() -> dict: Return the counters and current size.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initialize an empty cache that holds at most maxsize entries.
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the value stored for key and mark it as recently used.
+        Returns None (and counts a miss) if the key is not cached.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store value under key. If the cache is full, the least recently used entry is evicted.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> dict:
+        """
+        Return a snapshot of the cache counters.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
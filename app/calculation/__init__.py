@@ -1,9 +1,39 @@
 """
 This module provides a factory for creating calculator instances based on the operation type.
+
+Operations can also come from other packages. A package lists its calculator classes as entry points
+in the "calculator.operations" group (name = operation type, value = "module:ClassName"), and the
+factory imports a plugin module only the first time its operation is used.
+
+The factory can be used from many threads at once. Registration is serialized by a lock, and every
+registry table is replaced rather than modified (copy-on-write), so lookups never take the lock and
+always see a complete table. Statistics are counted per thread and only merged when they are read.
 """
 
+import importlib
+import math
+import threading
 from abc import ABC, abstractmethod
+from array import array
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple
 from app.operations import Operations
+from app.cache import LRUCache
+from app.stats import OperationStats
+
+# Entry point group that third-party packages use to provide operations.
+ENTRY_POINT_GROUP = "calculator.operations"
+
+
+def _operand_key(a: float, b: float) -> tuple:
+    """
+    Return the part of a result cache or instance pool key that identifies the operands.
+    -0.0 == 0.0 and both hash alike, so zero operands also carry their signs (add -0 -0 is -0.0, add 0 0 is 0.0).
+    """
+    if a and b:
+        return a, b
+    return a, b, math.copysign(1.0, a), math.copysign(1.0, b)
+
 
 class Calculation(ABC):
     """
@@ -15,6 +45,15 @@ class Calculation(ABC):
         a (float): The first operand.
         b (float): The second operand.
         operator_symbol (str): The symbol representing the operation (e.g., "+", "-", "*", "/").
+        operation_function (callable): Optional plain function (a, b) -> result with the same behavior as excute.
+            CalculatorFactory.compute calls it directly; classes without one are computed through excute.
+        result (float): The result of the calculation, computed once and then remembered.
+
+    Why use __slots__?
+    -A class with __slots__ stores its attributes in fixed fields instead of a per-instance __dict__,
+    which roughly halves the size of every calculation kept in memory.
+    -Subclasses declare an empty __slots__ so they stay dictionary-free; a subclass that does not
+    (such as a user-defined calculator) still works, it just gets a __dict__ again.
 
     Methods:
         excute() -> float: Execute the calculation and return the result.
@@ -22,6 +61,9 @@ class Calculation(ABC):
         __repr__() -> str: Return a string representation of the calculation for debugging.
     """
 
+    # The operands and the memoized result are the only per-instance state.
+    __slots__ = ("a", "b", "_result")
+
     # __init__ method initializes the operands a and b.
     def __init__(self, a:float, b:float) -> None:
         """
@@ -52,6 +94,57 @@ class Calculation(ABC):
         """
         pass # This is an abstract method, so it does not have an implementation here. # pragma: no cover
 
+    # result property returns the memoized result of the calculation.
+    @property
+    def result(self) -> float:
+        """
+        The result of the calculation.
+        The first access runs excute (or reads the factory's result cache, if it is enabled)
+        and stores the value on the calculation, so later accesses do not recompute it.
+
+        Why memoize the result?
+        -The operands never change after creation, so the result never changes either.
+        -Formatting and history display read the result many times, and a registered
+        operation may be expensive to run.
+        """
+        result = getattr(self, "_result", None)
+        if result is None:
+            cache = CalculatorFactory._result_cache
+            # Only float calculations are cached. The result of a Decimal calculation also depends on the
+            # active context (its precision), which is not part of the operands, and equal numbers of
+            # other types (such as 0.5 and Fraction(1, 2)) have equal hashes but must not share results.
+            if cache is None or type(self.a) is not float:
+                result = self._run()
+            else:
+                # The cache is keyed on (operation, a, b), using the calculator class as the operation.
+                key = (type(self), _operand_key(self.a, self.b))
+                result = cache.get(key)
+                if result is None:
+                    result = self._run()
+                    cache.put(key, result)
+            self._result = result
+        return result
+
+    # The setter lets callers that already executed the calculation record its result.
+    @result.setter
+    def result(self, value: float) -> None:
+        self._result = value
+
+    # _run executes the calculation and records it in the factory's per-operation statistics.
+    def _run(self) -> float:
+        """
+        Run excute, recording its latency (or its error) in CalculatorFactory statistics.
+        """
+        stats = CalculatorFactory.stats_for(getattr(self, "calculation_type", type(self).__name__))
+        start = perf_counter_ns()
+        try:
+            result = self.excute()
+        except Exception:
+            stats.errors += 1
+            raise
+        stats.observe(perf_counter_ns() - start)
+        return result
+
     # __str__ method provides a string representation of the calculation.
     def __str__(self) -> str:
         """
@@ -63,7 +156,7 @@ class Calculation(ABC):
         -The __str__ method provides a clear and concise way to represent the calculation as a string.
         -It is useful for logging, debugging, and displaying results to the user.
         """
-        result = self.excute()
+        result = self.result # computed once, then reused from the memoized value
         #returns a string that includes the class name, operands, operator symbol, and result.
         return f"{self.__class__.__name__}: {self.a} {self.operator_symbol} {self.b} = {result}"
     
@@ -87,19 +180,78 @@ class CalculatorFactory:
 
     Attributes:
         _calculation (dict): A dictionary that maps operation types to their corresponding calculator classes.
+        _operation_names (list): The registered operation types in registration order.
+            The position of a name in this list is its operation code.
+        _operation_codes (dict): The reverse mapping of operation types to operation codes.
+        _functions (dict): A dictionary that maps operation types to plain (a, b) -> result functions, used by compute.
+        _instance_pool (LRUCache): Optional pool of calculations keyed on (operation, a, b), used by create_calculator.
+        _lazy (dict): Operation types that are known but not imported yet, mapped to their "module:ClassName" import path.
+        _discovered (bool): Whether the entry points of ENTRY_POINT_GROUP have been read.
+        _lock (RLock): Serializes changes to the registry tables; lookups do not take it.
+        _stats_local (threading.local): The calling thread's statistics shard (operation type -> OperationStats).
+        _stats_shards (list): The statistics shard of every thread that has used the factory.
 
     Methods:
         register_calculator(calculation_type: str) -> None: Decorator to register a calculator class.
+        register_lazy(calculation_type: str, target: str) -> None: Register a calculator class by import path only.
+        discover_plugins(group: str) -> list: Register the operations that installed packages provide as entry points.
+        get_calculator_class(operation: str) -> type: Return the class of an operation, importing a plugin on first use.
         create_calculator(operation: str, a: float, b: float) -> Calculation: Create a calculator instance based on the operation type.
+        compute(operation: str, a: float, b: float) -> float: Return the result of an operation without creating a calculator.
+        evaluate_batch(operation: str, a_values, b_values) -> array: Evaluate an operation over columns of operands.
+        operation_code(operation: str) -> int: Return the small integer code of a registered operation.
+        operation_name(code: int) -> str: Return the operation type registered under a code.
+        operation_names() -> tuple: Return the registered operation types in operation code order.
+        operation_codes() -> Mapping: Return the registered operation types mapped to their codes.
+        calculator_classes() -> Mapping: Return the registered operation types mapped to their classes.
+        is_registered(operation: str) -> bool: Return whether an operation is known, imported or not.
+        enable_result_cache(maxsize: int) -> LRUCache: Turn on the process-wide result cache.
+        disable_result_cache() -> None: Turn off the process-wide result cache.
+        enable_instance_pool(maxsize: int) -> LRUCache: Share one calculation per repeated (operation, a, b).
+        disable_instance_pool() -> None: Stop sharing calculations.
+        stats_for(operation: str) -> OperationStats: Return the counters and latency histogram of an operation.
+        get_stats() -> dict: Return a snapshot of the statistics of every operation.
+        reset_stats() -> None: Clear all statistics.
 
     Why use a factory class?
     -The factory class only deals with object creation, which promotes the Single Responsibility Principle (SRP).
     -It allows for easy extension of the calculator functionality by adding new calculator classes without modifying existing code.
+
+    Why copy-on-write tables?
+    -Lookups happen on every calculation and registrations almost never, so registrations pay for copying
+    a small table, and lookups read a table that no other thread will ever modify, without any lock.
+    -Each table is published with a single assignment, so a lookup sees a table either before or after
+    a registration, never in between.
     """
     
     # Class variable to hold the mapping of operation types to calculator classes.
     _calculation = {}
 
+    # Class variable to hold the registered operation types; the list index is the operation code.
+    _operation_names = []
+    _operation_codes = {}
+
+    # Class variable to hold the function table used by compute (operation type -> function of a and b).
+    _functions: Dict[str, Callable[[float, float], float]] = {}
+
+    # Class variable to hold the optional process-wide result cache (None means disabled).
+    _result_cache = None
+
+    # Class variable to hold the optional pool of interned calculations (None means disabled).
+    _instance_pool = None
+
+    # Class variables to hold the operations that are registered by import path but not imported yet.
+    _lazy: Dict[str, str] = {}
+    _discovered = False
+
+    # Class variable to hold the lock that serializes registrations (reentrant: loading a plugin registers it).
+    _lock = threading.RLock()
+
+    # Class variables to hold the per-operation counters and latency histograms, one shard per thread,
+    # so that threads never update the same counters.
+    _stats_local = threading.local()
+    _stats_shards: List[Dict[str, OperationStats]] = []
+
     # Class method to register a calculator class.
     @classmethod
     def register_calculator(cls, calculation_type: str) -> None:
@@ -115,15 +267,109 @@ class CalculatorFactory:
         
         def decorator(subclass):
             """Decorator to register a calculator class."""
-            # Check if the calculation_type is already registered.
-            if calculation_type in cls._calculation:
-                # If it is, raise a ValueError to prevent overwriting.
-                raise ValueError(f"Calculation type '{calculation_type}' already registered.")
-            # Register the subclass in the _calculation dictionary.
-            cls._calculation[calculation_type] = subclass
+            # The check and the registration happen under the lock, so two threads
+            # cannot both find the type free and both register it.
+            with cls._lock:
+                # Check if the calculation_type is already registered.
+                if calculation_type in cls._calculation:
+                    # If it is, raise a ValueError to prevent overwriting.
+                    raise ValueError(f"Calculation type '{calculation_type}' already registered.")
+                # Remember the operation type on the class.
+                subclass.calculation_type = calculation_type
+                # Publish new copies of the tables, the dependent ones first: a thread that finds the type
+                # in _calculation then also finds its name, its code and its function.
+                # The operation gets the next free code, and compute calls the function derived from the class.
+                cls._operation_names = [*cls._operation_names, calculation_type]
+                cls._operation_codes = {**cls._operation_codes, calculation_type: len(cls._operation_names) - 1}
+                cls._functions = {**cls._functions, calculation_type: _function_of(subclass)}
+                cls._calculation = {**cls._calculation, calculation_type: subclass}
+                # A lazily registered operation is replaced by its class once the class is imported.
+                if calculation_type in cls._lazy:
+                    cls._lazy = {name: target for name, target in cls._lazy.items() if name != calculation_type}
             return subclass #return the subclass for further use.
         return decorator #return the decorator
     
+    # Class method to register a calculator class without importing it.
+    @classmethod
+    def register_lazy(cls, calculation_type: str, target: str) -> None:
+        """
+        Register a calculator class by its import path, without importing it.
+        The module is imported the first time the operation is used (see get_calculator_class).
+
+        Parameters:
+            calculation_type (str): The type of calculation (e.g., "modulus").
+            target (str): The import path of the class, as "package.module:ClassName".
+        """
+        with cls._lock:
+            if calculation_type in cls._calculation or calculation_type in cls._lazy:
+                raise ValueError(f"Calculation type '{calculation_type}' already registered.")
+            cls._lazy = {**cls._lazy, calculation_type: target}
+
+    # Class method to find the operations that installed packages provide.
+    @classmethod
+    def discover_plugins(cls, group: str = ENTRY_POINT_GROUP) -> list:
+        """
+        Register every entry point of group lazily, using the entry point name as the operation type.
+        Names that are already registered are skipped, so built-in operations cannot be replaced.
+        Only the installed package metadata is read; no plugin module is imported here.
+
+        Returns:
+            list: The operation types that were registered.
+        """
+        from importlib.metadata import entry_points
+
+        registered = []
+        with cls._lock:
+            lazy = dict(cls._lazy)
+            for entry_point in entry_points(group=group):
+                if entry_point.name in cls._calculation or entry_point.name in lazy:
+                    continue
+                lazy[entry_point.name] = entry_point.value
+                registered.append(entry_point.name)
+            cls._lazy = lazy
+            cls._discovered = True
+        return registered
+
+    # Class method that every operation lookup goes through when the operation is not imported yet.
+    @classmethod
+    def get_calculator_class(cls, operation: str) -> type:
+        """
+        Return the calculator class registered for an operation.
+
+        If the operation is registered lazily, its module is imported now, and a class that did not
+        register itself with register_calculator is registered under the operation type. The first
+        lookup of an unknown operation also reads the installed entry points (see discover_plugins).
+
+        Raises:
+            ValueError: If the operation is not supported, or its plugin cannot be imported.
+
+        Why import plugins lazily?
+        -Importing every available operation at start-up would make every short run pay for all of them.
+        -Recording only names and import paths costs nothing until an operation is actually used.
+        """
+        calculator_class = cls._calculation.get(operation)
+        if calculator_class is not None:
+            return calculator_class
+        if operation not in cls._lazy and not cls._discovered:
+            cls.discover_plugins()
+        target = cls._lazy.get(operation)
+        if target is None:
+            raise ValueError(f"Operation '{operation}' is not supported.")
+
+        module_name, _, attribute = target.partition(":")
+        try:
+            calculator_class = importlib.import_module(module_name)
+            for name in filter(None, attribute.split(".")):
+                calculator_class = getattr(calculator_class, name)
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"Operation '{operation}' could not be loaded: {e}") from e
+        # The import runs without the lock (a plugin module may register itself while it is imported);
+        # several threads may import the same plugin, but only the first one registers it.
+        with cls._lock:
+            if operation not in cls._calculation:
+                cls.register_calculator(operation)(calculator_class)
+        return cls._calculation[operation]
+
     # Class method to create a calculator instance based on the operation type.
     @classmethod
     def create_calculator(cls, operation: str, a: float, b: float) -> Calculation:
@@ -139,13 +385,301 @@ class CalculatorFactory:
         """
 
         # Check if the operation is registered in the _calculation dictionary.
-        if operation not in cls._calculation:
-            # If not, raise a ValueError to indicate that the operation is not supported.
-            raise ValueError(f"Operation '{operation}' is not supported.") 
+        calculator_class = cls._calculation.get(operation)
+        if calculator_class is None:
+            # If not, import it if it is a plugin, or raise a ValueError to indicate that the operation is not supported.
+            calculator_class = cls.get_calculator_class(operation)
+        # Count the creation in the operation's statistics.
+        cls.stats_for(operation).creations += 1
+        # With the instance pool enabled, a repeated (operation, a, b) returns the calculation created first.
+        # Calculations never change after creation, so sharing them is safe, and the shared instance also
+        # carries its memoized result.
+        pool = cls._instance_pool
+        # Like the result cache, the pool only holds float calculations: a pooled calculation carries its
+        # memoized result, and a Decimal result depends on the context it was computed in.
+        if pool is not None and type(a) is float:
+            key = (operation, _operand_key(a, b))
+            calculation = pool.get(key)
+            if calculation is None:
+                calculation = calculator_class(a, b)
+                pool.put(key, calculation)
+            return calculation
         #create and return an instance of the appropriate subclass of Calculation.
-        return cls._calculation[operation](a, b)
+        return calculator_class(a, b)
+
+    # Class method to compute a result without creating a Calculation object.
+    @classmethod
+    def compute(cls, operation: str, a: float, b: float) -> float:
+        """
+        This method returns the result of an operation on two operands.
+        It gives the same results and raises the same errors as create_calculator(operation, a, b).excute(),
+        but calls the operation's function from a precomputed table instead of creating a calculator.
+
+        Parameters:
+            operation (str): The type of operation to perform (e.g., "add", "subtract", "multiply", "divide").
+            a (float): The first operand.
+            b (float): The second operand.
+        Returns:
+            float: The result of the operation.
+
+        Why a function table?
+        -Callers that only need the number would otherwise create (and soon discard) one object per call,
+        which is most of the cost of a small calculation and most of the garbage collector's work.
+        -The table is derived from the registered classes, so it never disagrees with the factory.
+        """
+        function = cls._functions.get(operation)
+        if function is None:
+            cls.get_calculator_class(operation)  # imports a plugin, or raises ValueError
+            function = cls._functions[operation]
+        # Count executions and errors like evaluate_batch does; no latency is recorded on this path.
+        # The calling thread's shard is read directly, since this runs once per calculation.
+        try:
+            stats = cls._stats_local.shard[operation]
+        except (AttributeError, KeyError):
+            stats = cls.stats_for(operation)
+        try:
+            result = function(a, b)
+        except Exception:
+            stats.errors += 1
+            raise
+        stats.executions += 1
+        return result
+
+    # Class method to evaluate many operand pairs without creating one object per pair.
+    @classmethod
+    def evaluate_batch(cls, operation: str, a_values: Sequence[float], b_values: Sequence[float]) -> array:
+        """
+        This method evaluates an operation over two columns of operands and returns a column of results.
+
+        Parameters:
+            operation (str): The type of operation to perform (e.g., "add", "subtract", "multiply", "divide").
+            a_values (Sequence[float]): The first operands. Any sequence of numbers works, including
+                buffer-protocol objects such as array('d') and memoryview.
+            b_values (Sequence[float]): The second operands. Must have the same length as a_values.
+        Returns:
+            array: An array('d') with one result per operand pair, in input order.
+
+        Why not call create_calculator for every pair?
+        -Creating a Calculation object per row costs much more than the arithmetic itself.
+        -Instead we create one calculator for the whole batch and only swap its operands,
+        so the registered excute method (and its error handling) is still the one that runs.
+        """
+
+        # LBYL: validate the operation and the column lengths before doing any work.
+        calculator_class = cls.get_calculator_class(operation)
+        if len(a_values) != len(b_values):
+            raise ValueError("Operand columns must have the same length.")
+
+        # One calculator instance is reused for every row of the batch.
+        calculation = calculator_class(0.0, 0.0)
+        excute = calculation.excute
+
+        # Preallocate the result buffer so the loop only writes doubles into it.
+        results = array("d", bytes(8 * len(a_values)))
+        stats = cls.stats_for(operation)
+        try:
+            for i, (a, b) in enumerate(zip(a_values, b_values)):
+                calculation.a = a
+                calculation.b = b
+                results[i] = excute()
+        except Exception:
+            stats.errors += 1
+            raise
+        # Rows are counted as executions; the latency histogram only holds single executions.
+        stats.executions += len(results)
+        return results
+
+    # Class method to translate an operation type into its operation code.
+    @classmethod
+    def operation_code(cls, operation: str) -> int:
+        """
+        This method returns the operation code of a registered operation type.
+        Operation codes are small integers assigned in registration order, which lets
+        compact stores (such as the calculation history) keep one number instead of a string per row.
+
+        Parameters:
+            operation (str): The type of operation (e.g., "add").
+        Returns:
+            int: The operation code.
+        """
+        if operation not in cls._operation_codes:
+            cls.get_calculator_class(operation)  # imports a plugin, or raises ValueError
+        return cls._operation_codes[operation]
+
+    # Class method to translate an operation code back into its operation type.
+    @classmethod
+    def operation_name(cls, code: int) -> str:
+        """
+        This method returns the operation type registered under an operation code.
+
+        Parameters:
+            code (int): The operation code returned by operation_code.
+        Returns:
+            str: The operation type (e.g., "add").
+        """
+        if not 0 <= code < len(cls._operation_names):
+            raise ValueError(f"Operation code {code} is not registered.")
+        return cls._operation_names[code]
+
+    # Read-only views of the registry, for modules that need whole tables (such as app.export and app.scanner).
+    # The tables are replaced on registration, never changed in place, so each call returns a consistent snapshot.
+    @classmethod
+    def operation_names(cls) -> Tuple[str, ...]:
+        """
+        Return the registered operation types; the position of a name is its operation code.
+        Plugins that have not been imported yet are not included (see is_registered).
+        """
+        return tuple(cls._operation_names)
+
+    @classmethod
+    def operation_codes(cls) -> Mapping[str, int]:
+        """
+        Return the registered operation types mapped to their operation codes.
+        Unlike operation_code, a lookup in the mapping never imports a plugin or raises.
+        The mapping is shared with the factory and must not be modified.
+        """
+        return cls._operation_codes
+
+    @classmethod
+    def calculator_classes(cls) -> Mapping[str, type]:
+        """
+        Return the registered operation types mapped to their calculator classes.
+        The mapping is shared with the factory and must not be modified.
+        """
+        return cls._calculation
+
+    @classmethod
+    def is_registered(cls, operation: str) -> bool:
+        """
+        Return whether an operation type is registered, including plugins that have not been imported yet.
+        Unlike get_calculator_class, this never imports a plugin or reads the entry points.
+        """
+        return operation in cls._calculation or operation in cls._lazy
+
+    # Class method to turn on the process-wide result cache.
+    @classmethod
+    def enable_result_cache(cls, maxsize: int = 1024) -> LRUCache:
+        """
+        This method turns on an LRU cache of results keyed on (operation, a, b).
+        Once enabled, Calculation.result looks up the cache before running excute (for float operands only).
+
+        Parameters:
+            maxsize (int): The maximum number of results kept before the oldest ones are evicted.
+        Returns:
+            LRUCache: The cache, which exposes hits, misses and evictions counters.
+        """
+        cls._result_cache = LRUCache(maxsize)
+        return cls._result_cache
+
+    # Class method to turn off the process-wide result cache.
+    @classmethod
+    def disable_result_cache(cls) -> None:
+        """
+        This method turns off the result cache and drops all cached results.
+        """
+        cls._result_cache = None
+
+    # Class method to turn on interning of calculations.
+    @classmethod
+    def enable_instance_pool(cls, maxsize: int = 1024) -> LRUCache:
+        """
+        This method turns on an LRU pool of calculations keyed on (operation, a, b).
+        Once enabled, create_calculator returns the pooled calculation for a repeated triple instead of
+        creating a new one, so workloads that repeat the same calculations keep one object per triple.
+        Only float operands are pooled (see the result cache).
+
+        Parameters:
+            maxsize (int): The maximum number of calculations kept before the least recently used ones are dropped.
+        Returns:
+            LRUCache: The pool, which exposes hits, misses and evictions counters.
+        """
+        cls._instance_pool = LRUCache(maxsize)
+        return cls._instance_pool
+
+    # Class method to turn off interning of calculations.
+    @classmethod
+    def disable_instance_pool(cls) -> None:
+        """
+        This method turns off the instance pool; calculations already handed out are not affected.
+        """
+        cls._instance_pool = None
+
+    # Class method to get (or create) the statistics of an operation.
+    @classmethod
+    def stats_for(cls, operation: str) -> OperationStats:
+        """
+        This method returns the calling thread's OperationStats of an operation, creating it on first use.
+        Only the calling thread updates it; get_stats adds up the statistics of every thread.
+
+        Parameters:
+            operation (str): The type of operation (e.g., "divide").
+        Returns:
+            OperationStats: Creation, execution and error counters plus an execution latency histogram.
+
+        Why shard the statistics per thread?
+        -"stats.executions += 1" is a read followed by a write, so threads sharing one counter lose updates,
+        and a lock around every update would make the counters the busiest lock of a worker pool.
+        -A thread only ever writes its own shard, which needs no lock at all.
+        """
+        try:
+            shard = cls._stats_local.shard
+        except AttributeError:
+            # First use by this thread: create its shard and make it visible to get_stats.
+            shard = cls._stats_local.shard = {}
+            with cls._lock:
+                cls._stats_shards = [*cls._stats_shards, shard]
+        stats = shard.get(operation)
+        if stats is None:
+            stats = shard[operation] = OperationStats()
+        return stats
+
+    # Class method to read the statistics of every operation.
+    @classmethod
+    def get_stats(cls) -> Dict[str, dict]:
+        """
+        This method returns a snapshot of the statistics of every operation used so far, by any thread,
+        as a dictionary of operation type to OperationStats.snapshot().
+        """
+        totals: Dict[str, OperationStats] = {}
+        for shard in cls._stats_shards:
+            # dict.copy runs without switching threads, so a shard that is gaining an operation is read safely.
+            for operation, stats in shard.copy().items():
+                total = totals.get(operation)
+                if total is None:
+                    total = totals[operation] = OperationStats()
+                total.merge(stats)
+        return {operation: stats.snapshot() for operation, stats in totals.items()}
+
+    # Class method to clear the statistics.
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        This method clears the statistics of every operation, in every thread.
+        """
+        for shard in cls._stats_shards:
+            shard.clear()
     
 
+# _function_of derives the compute function of a registered calculator class.
+def _function_of(subclass: type) -> Callable[[float, float], float]:
+    """
+    Return the (a, b) -> result function that CalculatorFactory.compute uses for a calculator class:
+    its operation_function if it declares one, otherwise a function that runs excute on a new instance.
+
+    The operation_function is only used if it is declared by the same class as excute, or by a subclass of it.
+    A subclass that overrides excute (say, of AddCalculator) no longer behaves like the inherited function,
+    so it is computed through its own excute.
+    """
+    # Walk the classes from the most derived, and stop at the first one that defines either attribute.
+    for base in subclass.__mro__:
+        attributes = vars(base)
+        if "operation_function" in attributes:
+            return getattr(subclass, "operation_function")
+        if "excute" in attributes:
+            break
+    return lambda a, b: subclass(a, b).excute()
+
+
 """
 Create seperate calculator classes for each operation.
 These classes inherit from the Calculation abstract base class and implement the excute method for each specific operation.
@@ -175,7 +709,10 @@ class AddCalculator(Calculation):
     """
 
     # operator_symbol is a class variable that represents the symbol for the addition operation.
+    __slots__ = ()  # no per-instance __dict__
     operator_symbol = "+"
+    # operation_function lets CalculatorFactory.compute add without creating a calculator.
+    operation_function = staticmethod(Operations.add)
     def excute(self) -> float: 
         return Operations.add(self.a, self.b) #uses the Operations class to perform the addition operation.
 
@@ -188,7 +725,9 @@ class SubtractCalculator(Calculation):
     It inherits from the Calculation abstract base class and implements the excute method for subtraction.
     It specifically handles the subtraction operation, keeping the implementation separate from other operations."""
     
+    __slots__ = ()  # no per-instance __dict__
     operator_symbol = "-" # "-" is the operator symbol for subtraction.
+    operation_function = staticmethod(Operations.subtract)
     def excute(self) -> float:
         return Operations.subtract(self.a, self.b) #uses the Operations class to perform the subtraction operation.
 
@@ -201,7 +740,9 @@ class MultiplyCalculator(Calculation):
     It inherits from the Calculation abstract base class and implements the excute method for multiplication.
     It specifically handles the multiplication operation, keeping the implementation separate from other operations.
     """
+    __slots__ = ()  # no per-instance __dict__
     operator_symbol = "*" # "*" is the operator symbol for multiplication.
+    operation_function = staticmethod(Operations.multiply)
     def excute(self) -> float:
         
         return Operations.multiply(self.a, self.b) #uses the Operations class to perform the multiplication operation.
@@ -215,7 +756,10 @@ class DivideCalculator(Calculation):
     It specifically handles the division operation, keeping the implementation separate from other operations.
     """
 
+    __slots__ = ()  # no per-instance __dict__
     operator_symbol = "/" # "/" is the operator symbol for division.
+    # Operations.divide raises the same ZeroDivisionError as excute for a zero divisor.
+    operation_function = staticmethod(Operations.divide)
     def excute(self) -> float:
         # Check if b is zero.
         if self.b == 0:
@@ -10,10 +10,28 @@ This will ensure the calculatr is user-friendly and handles errors gracefully.
 
 """
 
+import math
 import sys
-from typing import List
-import readline 
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Tuple, Union
 from app.calculation import CalculatorFactory, Calculation
+from app.history import History, HistoryLog, QUERY_FIELDS, Range
+from app.expression import compile_expression
+from app.stats import format_table
+from app.vectors import VectorCommand, evaluate_vector, format_vector, is_vector_command
+from app.reductions import SUM_COMMAND, evaluate_reduction, reduction_command
+from app.variables import Workspace
+
+# The numeric backends, export formats and session snapshots are imported only when a session uses them,
+# so starting a float REPL does not load decimal, fractions, csv or json.
+if TYPE_CHECKING:
+    from app.backends import Backend
+
+# Number of entries shown by 'history tail'.
+TAIL_SIZE = 10
+
+# Number of values shown for a vector result; longer results show their first and last values.
+VECTOR_DISPLAY_LIMIT = 20
 
 
 
@@ -31,10 +49,23 @@ Supported Operations:
 - subtract <num1> <num2>: Subtracts the second number from the first.
 - multiply <num1> <num2>: Multiplies two numbers.
 - divide <num1> <num2>: Divides the first number by the second (cannot divide by zero).
+- <expression>: Evaluates an infix expression such as 3 + 4 * (2 - 1).
+- <operation> <vector> <vector>: Evaluates element-wise, e.g. add 1,2,3 4,5,6 or multiply @values.bin 2 (a file of packed doubles).
+- <operation> <num1> <num2> <num3> ...: Applies the operation from left to right, e.g. add 1 2 3 4.
+- sum <num or @file> ...: Adds all values with compensated summation, e.g. sum @values.bin.
+- <name> = <operation> <operand> <operand> | <name> = <num>: Assigns a variable, e.g. x = add 5 3 then y = multiply x 2.
+  Operands may be numbers or variables; reassigning a variable recomputes the variables that depend on it.
 
 special commands:
 - help: Displays this help message.
 - history: Displays the history of calculations performed during the session.
+- history N | history FROM:TO | history tail: Displays the last N entries, entries FROM to TO, or the last 10 entries.
+- history find <condition> ...: Displays the entries that match every condition, e.g. history find op=divide result>100.
+  Conditions are op=<operation> and a, b or result followed by =, <, <=, > or >= and a number.
+- stats: Displays per-operation counters and p50/p95/p99 execution latencies.
+- vars: Displays the variables and their values.
+- export <path> [--format csv|ndjson|columnar]: Writes the history to a file (csv by default).
+- save <path> | load <path>: Saves the session (history and variables) to a snapshot file, or restores one.
 - exit: Exits the calculator.
 
 Example Usage:
@@ -54,38 +85,409 @@ divide 8 2
 
 
 #history of calculations performed during the session.
-def display_history(history: List[Calculation]) -> None:
+def display_history(history: Sequence[Calculation], entries: Sequence[int] = None) -> None:
     """
     This function displays the history of calculations performed during the session.
     
     Parameters:
-        history (List[Calculation]): A list of Calculation objects representing the history of calculations.
+        history (Sequence[Calculation]): A History (or any sequence of Calculation objects) representing the history of calculations.
+        entries (Sequence[int]): Optional indexes of the entries to display (see history_range and History.find);
+            all entries by default.
     """
     # Check if the history is empty
     if not history:
         print("No calculations performed yet.") #print a message if the history is empty
         return
-    
-    # If history is not empty, print each calculation
-    else:
-        print("Calculation History:")
-        # Enumerate through the history list to display each calculation with its index starting from 1
-        for i, calculation in enumerate(history, start=1):
-            print(f"{i}: {calculation}")
 
+    if entries is None:
+        entries = range(len(history))
+    if not entries:
+        print("No calculations in that range.")
+        return
+
+    # If history is not empty, print each requested calculation.
+    # Only the requested entries are accessed, and each line is printed as soon as it is formatted,
+    # so showing k entries costs O(k) no matter how long the history is.
+    print("Calculation History:")
+    for i in entries:
+        # Entries are numbered from 1, by their position in the whole history
+        print(f"{i + 1}: {history[i]}")
+
+
+# history_range translates the argument of a 'history' command into the indexes to display.
+def history_range(argument: str, length: int) -> range:
+    """
+    Return the range of history indexes selected by the argument of a 'history' command.
+
+    Parameters:
+        argument (str): "" for all entries, "N" for the last N entries, "FROM:TO" for entries FROM to TO
+            (numbered from 1 as displayed, inclusive, either end may be left out) or "tail" for the last TAIL_SIZE entries.
+        length (int): The number of entries in the history.
+    Raises:
+        ValueError: If the argument is not one of these forms.
+    """
+    if argument == "":
+        return range(length)
+    if argument == "tail":
+        return range(max(0, length - TAIL_SIZE), length)
+    try:
+        if ":" in argument:
+            first, last = argument.split(":", 1)
+            start = int(first) if first else 1
+            stop = int(last) if last else length
+            if start < 1:
+                raise ValueError
+            return range(start - 1, min(stop, length))
+        count = int(argument)
+        if count < 0:
+            raise ValueError
+        return range(max(0, length - count), length)
+    except ValueError:
+        raise ValueError("Invalid history range. Use: history, history N, history FROM:TO or history tail.") from None
+
+
+
+# history_query translates the conditions of a 'history find' command into arguments of History.find.
+def history_query(argument: str, parse_number: Callable[[str], float] = float) -> dict:
+    """
+    Return the History.find arguments selected by the conditions of a 'history find' command.
+
+    Parameters:
+        argument (str): Space-separated conditions: "op=<operation>", or a, b or result followed by
+            =, <, <=, > or >= and a number (e.g. "op=divide result>100"). Conditions on the same column are combined.
+        parse_number (Callable): Converts the numbers (float, or the session backend's parse).
+    Raises:
+        ValueError: If a condition is not one of these forms.
+    """
+    query = {}
+    try:
+        terms = argument.split()
+        if not terms:
+            raise ValueError
+        for term in terms:
+            split = min((term.index(symbol) for symbol in "<>=" if symbol in term), default=0)
+            field, condition = term[:split], term[split:]
+            if field == "op" and condition.startswith("="):
+                query["operation"] = condition[1:]
+                continue
+            if field not in QUERY_FIELDS:
+                raise ValueError
+            symbol = condition[:2] if condition[1:2] == "=" else condition[:1]
+            if symbol not in ("=", "<", "<=", ">", ">="):
+                raise ValueError
+            value = parse_number(condition[len(symbol):])
+            #raise a ValueError if the number is NaN (float() of a signaling Decimal NaN raises one too)
+            if math.isnan(value):
+                raise ValueError
+            # Keep the tighter of the existing bound and the new one.
+            bounds = query.get(field, Range())
+            include = symbol in ("=", "<=", ">=")
+            if symbol in ("=", ">", ">=") and (value > bounds.low or (value == bounds.low and not include)):
+                bounds = bounds._replace(low=value, include_low=include)
+            if symbol in ("=", "<", "<=") and (value < bounds.high or (value == bounds.high and not include)):
+                bounds = bounds._replace(high=value, include_high=include)
+            query[field] = bounds
+    except ValueError:
+        raise ValueError("Invalid history query. Use: history find op=<operation> a|b|result(=|<|<=|>|>=)<number> ...") from None
+    return query
+
+
+
+# export writes the history to a file in a format other tools can read.
+def display_export(history: History, source: str) -> None:
+    """
+    This function runs an 'export <path> [--format csv|ndjson|columnar]' command and prints how many
+    calculations were written.
+
+    Parameters:
+        history (History): The history of the session.
+        source (str): The command typed by the user, with its original case (file paths are case-sensitive).
+    """
+    from app.export import FORMATS, export_history
+
+    parts = source.split()[1:]
+    export_format = "csv"
+    if len(parts) == 3 and parts[1] == "--format":
+        export_format = parts[2].lower()
+        del parts[1:]
+    if len(parts) != 1 or export_format not in FORMATS:
+        print(f"Invalid export command. Use: export <path> [--format {'|'.join(FORMATS)}]")
+        return
+
+    # EAFP: try to write the file, and report back if it cannot be written.
+    try:
+        count = export_history(history, parts[0], export_format)
+    except ValueError as ve:
+        print(ve)
+        return
+    except OSError as e:
+        print(f"Cannot write '{parts[0]}': {e.strerror}.")
+        return
+    print(f"Exported {count} calculations to {parts[0]}.")
+
+
+
+# save writes a snapshot of the whole session, which load restores without replaying it.
+def display_save(history: History, workspace: Workspace, source: str) -> None:
+    """
+    This function runs a 'save <path>' command and prints how many calculations were saved.
+
+    Parameters:
+        history (History): The history of the session.
+        workspace (Workspace): The variables of the session.
+        source (str): The command typed by the user, with its original case (file paths are case-sensitive).
+    """
+    parts = source.split()
+    if len(parts) != 2:
+        print("Invalid save command. Use: save <path>")
+        return
+    from app.session import save_session
+    try:
+        count = save_session(parts[1], history, workspace)
+    except OSError as e:
+        print(f"Cannot write '{parts[1]}': {e.strerror}.")
+        return
+    print(f"Saved {count} calculations and {len(workspace)} variables to {parts[1]}.")
+
+
+
+def display_load(history: History, source: str, backend: "Backend" = None) -> Optional[Tuple[History, Workspace]]:
+    """
+    This function runs a 'load <path>' command and prints what was restored.
+
+    Parameters:
+        history (History): The current history of the session (replaced by the snapshot's history).
+        source (str): The command typed by the user, with its original case (file paths are case-sensitive).
+        backend (Backend): The numeric backend of the session.
+    Returns:
+        tuple: The restored (history, workspace), or None if nothing was loaded (the reason is printed).
+    """
+    parts = source.split()
+    if len(parts) != 2:
+        print("Invalid load command. Use: load <path>")
+        return None
+    # LBYL: a durable history cannot be replaced by a snapshot, since its log would no longer match it.
+    if history.log is not None:
+        print("A session with a history file cannot load a snapshot.")
+        return None
+    from app.session import load_session
+    try:
+        restored = load_session(parts[1], backend)
+    except ValueError as ve:
+        print(ve)
+        return None
+    except OSError as e:
+        print(f"Cannot read '{parts[1]}': {e.strerror}.")
+        return None
+    print(f"Loaded {len(restored[0])} calculations and {len(restored[1])} variables from {parts[1]}.")
+    return restored
+
+
+
+# per-operation counters and latency percentiles collected by the CalculatorFactory.
+def display_stats() -> None:
+    """
+    This function displays the statistics collected by the CalculatorFactory for each operation:
+    how many calculations were created, executed and failed, and the p50/p95/p99 execution latencies.
+    """
+    stats = CalculatorFactory.get_stats()
+    # Check if any operation has been used yet
+    if not stats:
+        print("No calculations performed yet.")
+        return
+    print("Operation Statistics:")
+    print(format_table(stats))
+
+
+
+# evaluate and display an infix expression such as "3 + 4 * (2 - 1)".
+def display_expression(source: str, backend: "Backend" = None) -> bool:
+    """
+    This function evaluates an infix expression and prints its result.
+
+    Parameters:
+        source (str): The expression typed by the user.
+        backend (Backend): Optional numeric backend to evaluate with; floats are used without one.
+    Returns:
+        bool: False if source is not a valid expression (nothing is printed), True otherwise.
+    """
+    # EAFP: try to compile the input, and report back if it is not an expression.
+    try:
+        expression = compile_expression(source) if backend is None else compile_expression(source, backend.parse)
+    except ValueError:
+        return False
+
+    try:
+        with nullcontext() if backend is None else backend.context():
+            value = expression()
+        print(f"Result: {source} = {value}\n")
+    except ZeroDivisionError:
+        print("Cannot divide by zero.")
+        print("Please enter a non-zero divisor.")
+    except ArithmeticError as e:
+        # Such as a Decimal overflow; the session goes on.
+        print(e if backend is None else backend.describe(e))
+    return True
+
+
+
+# vector commands are evaluated element-wise in one batch, instead of one REPL line per element.
+def display_vector(source: str, backend: "Backend" = None) -> bool:
+    """
+    This function evaluates a command with vector operands and prints its result.
+
+    Parameters:
+        source (str): The command typed by the user, with its original case (file paths are case-sensitive).
+        backend (Backend): The numeric backend of the session; vectors are evaluated as doubles, so they are
+            rejected when there is one (as in batch mode).
+    Returns:
+        bool: False if source has no vector operand (nothing is printed), True otherwise.
+    """
+    parts = source.split()
+    # LBYL: only '<operation> <operand> <operand>' lines with a vector operand are vector commands.
+    if not is_vector_command(parts):
+        return False
+    if backend is not None:
+        print(f"Vector operands hold doubles and cannot be used with the {backend.name} backend.")
+        return True
+
+    try:
+        values = evaluate_vector(VectorCommand(parts[0].lower(), parts[1], parts[2]))
+    except ValueError as ve:
+        print(ve)
+        return True
+    except ZeroDivisionError:
+        print("Cannot divide by zero.")
+        print("Please enter a non-zero divisor.")
+        return True
+    print(f"Result: {format_vector(values, VECTOR_DISPLAY_LIMIT)}\n")
+    return True
+
+
+
+# n-ary commands such as 'add 1 2 3' or 'sum @values.bin' are reduced in a single pass.
+def display_reduction(source: str, backend: "Backend" = None) -> bool:
+    """
+    This function evaluates an n-ary command and prints its result.
 
+    Parameters:
+        source (str): The command typed by the user, with its original case (file paths are case-sensitive).
+        backend (Backend): Optional numeric backend to parse and reduce the operands with; floats are used without one.
+    Returns:
+        bool: False if source is not an n-ary command (nothing is printed), True otherwise.
+    """
+    command = reduction_command(source.split())
+    if command is None:
+        return False
+
+    try:
+        result = evaluate_reduction(command, backend=backend)
+    except ValueError as ve:
+        print(ve)
+        return True
+    except ZeroDivisionError:
+        print("Cannot divide by zero.")
+        print("Please enter a non-zero divisor.")
+        return True
+    except ArithmeticError as e:
+        print(e if backend is None else backend.describe(e))
+        return True
+    print(f"Result: {result}\n")
+    return True
+
+
+
+# assignments such as 'x = add 5 3' define variables that are recomputed when their inputs change.
+def display_assignment(workspace: Workspace, source: str, history: History) -> bool:
+    """
+    This function assigns a variable, prints its value and the dependents that were recomputed,
+    and adds the variable's calculation to the history.
 
-def calculator():
+    Parameters:
+        workspace (Workspace): The variables of the session.
+        source (str): The line typed by the user.
+        history (History): The history of the session.
+    Returns:
+        bool: False if source is not an assignment (nothing is printed), True otherwise.
+    """
+    # LBYL: only lines with an '=' are assignments.
+    if "=" not in source:
+        return False
+
+    try:
+        variable, recomputed = workspace.define(source)
+    except ValueError as ve:
+        print(ve)
+        return True
+    except ZeroDivisionError:
+        print("Cannot divide by zero.")
+        print("Please enter a non-zero divisor.")
+        return True
+    except ArithmeticError as e:
+        # Decimal signals such as InvalidOperation (x = multiply inf 0); the assignment changes nothing.
+        print(workspace.backend.describe(e))
+        return True
+    print(f"Result: {variable.name} = {variable.value}")
+    if recomputed:
+        print(f"Recomputed: {', '.join(recomputed)}")
+    print()
+    if variable.calculation is not None:
+        history.append(variable.calculation, variable.value)
+    return True
+
+
+
+# list the variables of the session with their definitions and values.
+def display_variables(workspace: Workspace) -> None:
+    """
+    This function displays every variable of the session, in the order they were first assigned.
+    """
+    if not workspace:
+        print("No variables defined yet.")
+        return
+    print("Variables:")
+    for variable in workspace:
+        print(variable)
+
+
+
+def calculator(history_file: Union[str, HistoryLog] = None, resident: int = 1000, backend: "Backend" = None):
     """
     Professional-grade calculator that supports basic arithmetic operations
     and maintains a history of calculations.
 
     This function showcases both LBYL and EAFP principles in error handling.
+
+    Parameters:
+        history_file (str or HistoryLog): Optional path of a HistoryLog, or an opened one; the history is then kept across sessions.
+        resident (int): With a history file, how many recent calculations to keep in memory.
+        backend (Backend): Optional numeric backend (see app.backends); the session uses floats without one.
     """
 
-    # Initialize the history list to store calculations
-    history = []
+    # The backend decides how numbers are read and in which arithmetic context calculations run.
+    parse_number = float if backend is None else backend.parse
+    number_context = nullcontext if backend is None else backend.context
+
+    # Initialize the array-backed history to store calculations.
+    # With a history file, every calculation is also appended to the durable log,
+    # and the calculations of earlier sessions are part of the history.
+    # Sessions with a backend keep their Decimal or Fraction values unrounded (exact=True).
+    if history_file is None:
+        history = History(exact=backend is not None)
+    elif backend is not None:
+        raise ValueError("A history file stores floats and cannot be used with a numeric backend.")
+    else:
+        log = HistoryLog(history_file) if isinstance(history_file, str) else history_file
+        history = History(log, resident=resident)
     
+    # The variables of the session (see app.variables), computed with the same backend.
+    workspace = Workspace(backend)
+
+    # Line editing and input history (arrow keys) only matter when a person is typing,
+    # so readline is only loaded for an interactive terminal, not for piped or scripted input.
+    if sys.stdin.isatty():
+        import readline  # noqa: F401  (importing it is enough to enable line editing in input())
+
     # Set up the command-line interface
     print("Welcome to the Calculator REPL!")
     print("Type 'help' for usage instructions or 'exit' to quit.")
@@ -96,7 +498,8 @@ def calculator():
         #try-except block to handle user input and potential errors
         try:
             #ask the user for input
-            user_input = input(">>" ).strip().lower()  # Read user input, strip whitespace, and convert to lowercase
+            raw_input = input(">>" ).strip()  # Read user input and strip whitespace
+            user_input = raw_input.lower()  # convert to lowercase (raw_input keeps the case of file paths)
 
 
             # Example of Look Before You Leap (LBYL) principle:
@@ -106,12 +509,13 @@ def calculator():
                continue  # pragma: no cover
            
 
-            # LBYL: Check for special commands ('help', 'exit' or 'history) before processing the input
+            # LBYL: Check for special commands ('help', 'exit', 'history' or 'stats') before processing the input
             # ----------------------------------------------------------------
 
             #check if the user wants to exit
             if user_input == "exit":
                print("Exiting calculator. Goodbye!") #print a message when the user wants to exit
+               history.close()  # fsync the last group of log records
                sys.exit(0)  # Exit the program gracefully
             
             #check if the user wants help           
@@ -120,8 +524,49 @@ def calculator():
                continue
            
             #check if the user wants to see the history
-            elif user_input == "history":
-               display_history(history)
+            elif user_input == "history" or user_input.startswith("history "):
+               argument = user_input[len("history"):].strip()
+               try:
+                   if argument == "find" or argument.startswith("find "):
+                       # Queries are answered from the history's indexes, not by scanning every entry.
+                       entries = history.find(**history_query(argument[len("find"):], parse_number))
+                   else:
+                       entries = history_range(argument, len(history))
+               except ValueError as ve:
+                   print(ve)
+                   continue
+               display_history(history, entries)
+               continue
+
+            #check if the user wants to see the statistics
+            elif user_input == "stats":
+               display_stats()
+               continue
+
+            #check if the user wants to export the history
+            elif user_input == "export" or user_input.startswith("export "):
+               display_export(history, raw_input)
+               continue
+
+            #check if the user wants to save or restore the session
+            elif user_input == "save" or user_input.startswith("save "):
+               display_save(history, workspace, raw_input)
+               continue
+            elif user_input == "load" or user_input.startswith("load "):
+               restored = display_load(history, raw_input, backend)
+               if restored is not None:
+                   history, workspace = restored
+               continue
+
+            #check if the user wants to see the variables
+            elif user_input == "vars":
+               display_variables(workspace)
+               continue
+
+            #check if the user wants to sum values ('sum 1 2' has the shape of a binary command, so it is checked first)
+            elif user_input.split()[0] == SUM_COMMAND:
+               if not display_reduction(raw_input, backend):
+                   print("Invalid input. Use: sum <num or @file> ...")
                continue
 
             
@@ -135,12 +580,22 @@ def calculator():
                 # The input should be in the format: <operation> <num1> <num2>
                 operation, num1_str, num2_str = user_input.split() #spliyt the input into operation and two numbers
 
-                num1 = float(num1_str) # Convert the first number to float
-                num2 = float(num2_str) # Convert the second number to float
+                num1 = parse_number(num1_str) # Convert the first number to float (or the backend's number type)
+                num2 = parse_number(num2_str) # Convert the second number to float (or the backend's number type)
 
             # raidse a ValueError if the input is not in the correct format or 
             # if the numbers cannot be converted to float
             except ValueError:
+                # The input may still be an assignment such as "x = add 5 3", an n-ary command such as
+                # "add 1 2 3", a vector command such as "add 1,2,3 4,5,6", or an infix expression such as "3 + 4 * (2 - 1)".
+                if display_assignment(workspace, user_input, history):
+                    continue
+                if display_reduction(raw_input, backend):
+                    continue
+                if display_vector(raw_input, backend):
+                    continue
+                if display_expression(user_input, backend):
+                    continue
                 print("Invalid input. Please follow the format: <operation> <num1> <num2>") 
                 print("Type 'help' for usage instructions.")
                 continue
@@ -159,14 +614,21 @@ def calculator():
             #try to execute the calculation
             try:
             # Execute the calculation and get the result
-            # The excute method will perform the calculation based on the operation
-                result = calculation.excute()
+            # The result property runs excute once and remembers the value on the calculation,
+            # so formatting the calculation below does not compute it a second time.
+                with number_context():
+                    result = calculation.result
 
             #raise a ZeroDivisionError if the operation is division and the second number is zero
             except ZeroDivisionError:
                 print("Cannot divide by zero.")
                 print("Please enter a non-zero divisor.")
                 continue
+
+            # raise an ArithmeticError if the result cannot be represented, e.g. a Decimal overflow
+            except ArithmeticError as e:
+                print(e if backend is None else backend.describe(e))
+                continue
             
             # If any other unexpected error occurs, print a generic error message
             except Exception as e:
@@ -181,7 +643,7 @@ def calculator():
             print(f"Result: {result_str}\n")
 
             # Append the calculation to the history
-            history.append(calculation)  # Store the calculation in history
+            history.append(calculation, result)  # Store the calculation and its result in history
 
         
 
@@ -192,10 +654,12 @@ def calculator():
             # This includes handling keyboard interrupts (Ctrl+C) 
             # Instead of checking for specific errors, we catch all exceptions that may arise
             print("\nKeyboard interrupt detected. Exiting calculator. Goodbye!")
+            history.close()
             sys.exit(0)
         except EOFError:
             # EAFP: Handle EOFError (Ctrl+D) gracefully
             print("\nEOF detected. Exiting calculator. Goodbye!")
+            history.close()
             sys.exit(0)
 
 
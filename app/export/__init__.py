@@ -0,0 +1,199 @@
+"""
+This module exports the calculation history to files for other tools.
+
+    csv         operation,a,b,result with a header line
+    ndjson      one JSON object per line: {"operation": "add", "a": 5.0, "b": 3.0, "result": 8.0}
+    columnar    a binary file with one packed column per field (see write_columnar)
+
+Every format is streamed: rows are read from the history's columns (or its log) one at a time, or one
+chunk at a time for the columnar format, and written through a buffered writer. No Calculation object
+is built and no row goes through Calculation.__str__, so exporting costs the same per row however long
+the history is.
+
+Why a columnar format?
+-The history already keeps its data in columns of packed doubles, so the resident columns are written
+with one memoryview per column and without converting a single value.
+-Analytics tools read a column of doubles in one bulk read (for example, numpy.fromfile).
+"""
+
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO, List, Tuple
+from app.calculation import CalculatorFactory
+from app.history import History
+
+# Names accepted by export_history.
+FORMATS = ("csv", "ndjson", "columnar")
+
+# Size of the write buffer, in bytes.
+BUFFER_SIZE = 1 << 16
+
+# Number of rows read from a history log per chunk by the columnar writer.
+EXPORT_CHUNK = 1 << 14
+
+# Header of the columnar format: magic, then the number of rows.
+COLUMNAR_MAGIC = b"CALCCOL1"
+COLUMNAR_HEADER = struct.Struct("<8sQ")
+# Bytes per row in the columnar format: a code and three doubles.
+COLUMNAR_ROW_SIZE = 2 + 3 * 8
+
+# The columns read back from the columnar format: (names, codes, a, b, results).
+Columns = Tuple[List[str], array, array, array, array]
+
+# Field names, in the order of every format.
+FIELDS = ("operation", "a", "b", "result")
+
+
+def export_history(history: History, path: str, format: str = "csv") -> int:
+    """
+    Write every entry of a history to a file and return the number of rows written.
+
+    Parameters:
+        history (History): The history to export.
+        path (str): The file to write; it is replaced if it exists.
+        format (str): One of FORMATS.
+    Raises:
+        ValueError: If the format is not supported, or the columnar format is used for an exact history.
+        OSError: If the file cannot be written.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Export format '{format}' is not supported.")
+    if format == "columnar":
+        return write_columnar(history, path)
+    with open(path, "w", newline="", buffering=BUFFER_SIZE) as file:
+        if format == "csv":
+            return _write_csv(history, file)
+        return _write_ndjson(history, file)
+
+
+def _write_csv(history: History, file) -> int:
+    writer = csv.writer(file)
+    writer.writerow(FIELDS)
+    count = 0
+    for row in history.entries():
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _write_ndjson(history: History, file) -> int:
+    # Exact values (Decimal, Fraction) have no JSON number form and are written as strings, e.g. "1/3".
+    # Infinite and NaN floats are written as Infinity and NaN, as Python's json module does.
+    encode = json.JSONEncoder(default=str).encode
+    write = file.write
+    count = 0
+    for operation, a, b, result in history.entries():
+        write(encode({"operation": operation, "a": a, "b": b, "result": result}))
+        write("\n")
+        count += 1
+    return count
+
+
+def _little_endian(column: array) -> memoryview:
+    """
+    Return the bytes of a column in little-endian order, without copying on little-endian machines.
+    """
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return memoryview(column)
+
+
+def write_columnar(history: History, path: str) -> int:
+    """
+    Write a history in the columnar format and return the number of rows written.
+
+    File format (little-endian):
+        header:   8-byte magic b"CALCCOL1", <Q row count>
+        columns:  row count x <H code>, then row count x <d a>, <d b> and <d result>
+        names:    <H name count>, then per name <B length> <name bytes>; code N is the N-th name
+
+    The names come last, so that operations first seen while streaming the log still get a code.
+
+    Raises:
+        ValueError: If the history is exact (the columns hold doubles).
+    """
+    with open(path, "wb", buffering=BUFFER_SIZE) as file:
+        return write_columns(history, file)
+
+
+def write_columns(history: History, file: BinaryIO) -> int:
+    """
+    Write a history in the columnar format at the current position of an open binary file,
+    and return the number of rows written. The file is left positioned after the names.
+    app.session uses this to embed the history in a session snapshot.
+
+    Raises:
+        ValueError: If the history is exact (the columns hold doubles).
+    """
+    if history.exact:
+        raise ValueError("The columnar format stores doubles and cannot export exact values.")
+    count = len(history)
+    # Every column starts at a known offset, so each chunk is written straight into its column.
+    offsets = [file.tell() + COLUMNAR_HEADER.size]
+    for itemsize in (2, 8, 8):
+        offsets.append(offsets[-1] + itemsize * count)
+    file.write(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, count))
+    for chunk in history.column_chunks(EXPORT_CHUNK):
+        for column, values in enumerate(chunk):
+            file.seek(offsets[column])
+            file.write(_little_endian(values))
+            offsets[column] += len(values) * values.itemsize
+    file.seek(offsets[-1])
+    names = CalculatorFactory.operation_names()
+    file.write(struct.pack("<H", len(names)))
+    for name in names:
+        encoded = name.encode("utf-8")
+        file.write(struct.pack("<B", len(encoded)) + encoded)
+    return count
+
+
+def read_columnar(path: str) -> Columns:
+    """
+    Read a columnar export back as (names, codes, a, b, results); codes index into names.
+    Each column is filled with one bulk read.
+
+    Raises:
+        ValueError: If the file is not a columnar export, or is truncated.
+    """
+    with open(path, "rb") as file:
+        try:
+            return read_columns(file)
+        except ValueError:
+            raise ValueError(f"'{path}' is not a columnar history export.") from None
+
+
+def read_columns(file: BinaryIO) -> Columns:
+    """
+    Read columns written by write_columns from the current position of an open binary file.
+
+    Raises:
+        ValueError: If the data is not in the columnar format, or is truncated.
+    """
+    try:
+        magic, count = COLUMNAR_HEADER.unpack(file.read(COLUMNAR_HEADER.size))
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError
+        # LBYL: a corrupt row count must not allocate columns larger than the rest of the file.
+        position = file.tell()
+        remaining = file.seek(0, os.SEEK_END) - position
+        file.seek(position)
+        if count * COLUMNAR_ROW_SIZE > remaining:
+            raise ValueError
+        columns = (array("H"), array("d"), array("d"), array("d"))
+        for column in columns:
+            column.fromfile(file, count)
+            if sys.byteorder == "big":
+                column.byteswap()
+        (length,) = struct.unpack("<H", file.read(2))
+        names = []
+        for _ in range(length):
+            size = file.read(1)[0]
+            names.append(file.read(size).decode("utf-8"))
+    except (struct.error, EOFError, IndexError, ValueError):
+        raise ValueError("The data is not in the columnar format.") from None
+    return (names, *columns)
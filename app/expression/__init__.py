@@ -0,0 +1,192 @@
+"""
+This module provides an infix expression language on top of the registered calculators.
+
+Expressions such as "3 + 4 * (2 - 1)" are written with the operator symbols of the registered
+Calculation classes (for example "+" for AddCalculator), numbers, parentheses and unary minus.
+Multiplication and division bind tighter than addition and subtraction, and "^" (if an operation
+with that symbol is registered) binds tightest and groups from the right.
+
+Each expression is compiled once into a tree of closures and kept in an LRU cache keyed by its
+source text, so evaluating the same formula again skips tokenizing and parsing entirely.
+Numbers are converted with float by default; passing a numeric backend's parse function (see app.backends)
+compiles the same expression with Decimal or Fraction constants instead.
+
+Why compile into closures?
+-Parsing is much slower than evaluating, and clients tend to send the same formulas over and over.
+-A closure tree is evaluated with plain function calls, with no token or node inspection at run time.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, List, Tuple
+from app.calculation import CalculatorFactory
+
+# Number of compiled expressions kept in the cache.
+CACHE_SIZE = 1024
+
+# Binding strength of operator symbols; symbols of other registered operations default to DEFAULT_PRECEDENCE.
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "^": 3}
+DEFAULT_PRECEDENCE = 2
+# Operators that group from the right (2 ^ 3 ^ 2 == 2 ^ (3 ^ 2)).
+RIGHT_ASSOCIATIVE = {"^"}
+
+# Deepest closure tree compiled. Parsing and evaluating recurse once per level, so deeper input
+# (such as 400 nested parentheses or 1000 operators in a row) is rejected instead of hitting the recursion limit.
+MAX_DEPTH = 200
+
+# A token is either a number or any other single non-space character.
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|(\S))")
+
+Expression = Callable[[], float]
+
+# A compiled subexpression and the depth of its closure tree.
+Node = Tuple[Expression, int]
+
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    """
+    Split source into ("number", text) and ("symbol", text) tokens.
+    """
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        number, symbol = match.groups()
+        tokens.append(("number", number) if number is not None else ("symbol", symbol))
+        position = match.end()
+    return tokens
+
+
+def _operators() -> dict:
+    """
+    Map the operator symbol of every registered calculator to its operation type.
+    """
+    return {calculator.operator_symbol: operation for operation, calculator in CalculatorFactory.calculator_classes().items()}
+
+
+def _binary(operation: str, left: Expression, right: Expression) -> Expression:
+    """
+    Build the closure for one binary operation node.
+    """
+    compute = CalculatorFactory.compute
+    return lambda: compute(operation, left(), right())
+
+
+class _Parser:
+    """
+    Precedence-climbing parser that turns a token list into a closure tree.
+    Every method returns a Node, so the depth of the tree is checked as it is built.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]], operators: dict, number: Callable[[str], float] = float) -> None:
+        self.tokens = tokens
+        self.operators = operators
+        self.number = number
+        self.position = 0
+        self.nesting = 0
+
+    def peek(self) -> Tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "")
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Expression:
+        expression, _ = self.expression(1)
+        kind, text = self.peek()
+        if kind != "end":
+            raise ValueError(f"Invalid expression: unexpected '{text}'.")
+        return expression
+
+    def nest(self) -> None:
+        """
+        Enter one more level of parsing recursion (parentheses, unary operators or right operands).
+        """
+        self.nesting += 1
+        self.deepen(self.nesting - 1)
+
+    @staticmethod
+    def deepen(depth: int) -> int:
+        """
+        Return the depth of a node built on top of a subtree of the given depth.
+        """
+        if depth >= MAX_DEPTH:
+            raise ValueError(f"Invalid expression: nested more than {MAX_DEPTH} levels deep.")
+        return depth + 1
+
+    def expression(self, min_precedence: int) -> Node:
+        left, depth = self.unary()
+        while True:
+            kind, symbol = self.peek()
+            if kind != "symbol" or symbol not in self.operators:
+                return left, depth
+            precedence = PRECEDENCE.get(symbol, DEFAULT_PRECEDENCE)
+            if precedence < min_precedence:
+                return left, depth
+            self.take()
+            next_precedence = precedence if symbol in RIGHT_ASSOCIATIVE else precedence + 1
+            self.nest()
+            right, right_depth = self.expression(next_precedence)
+            self.nesting -= 1
+            # A chain such as 1 + 1 + ... + 1 is parsed in a loop, but still builds one level per operator.
+            depth = self.deepen(max(depth, right_depth))
+            left = _binary(self.operators[symbol], left, right)
+
+    def unary(self) -> Node:
+        kind, text = self.peek()
+        if kind == "symbol" and text in "+-":
+            self.take()
+            self.nest()
+            operand, depth = self.unary()
+            self.nesting -= 1
+            return (operand, depth) if text == "+" else ((lambda: -operand()), self.deepen(depth))
+        return self.primary()
+
+    def primary(self) -> Node:
+        kind, text = self.take()
+        if kind == "number":
+            value = self.number(text)
+            return (lambda: value), 1
+        if (kind, text) == ("symbol", "("):
+            self.nest()
+            inner = self.expression(1)
+            self.nesting -= 1
+            if self.take() != ("symbol", ")"):
+                raise ValueError("Invalid expression: missing ')'.")
+            return inner
+        if kind == "end":
+            raise ValueError("Invalid expression: unexpected end of input.")
+        raise ValueError(f"Invalid expression: unexpected '{text}'.")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(source: str, number: Callable[[str], float] = float) -> Expression:
+    """
+    Compile an infix expression into a closure that returns its value when called.
+    Compiled expressions are cached by source text (and number conversion).
+
+    Parameters:
+        source (str): The expression, e.g. "3 + 4 * (2 - 1)".
+        number (Callable): Converts number tokens to values; float by default.
+    Returns:
+        Expression: A function with no arguments that evaluates the expression.
+    Raises:
+        ValueError: If source is not a valid expression, or is nested more than MAX_DEPTH levels deep.
+    """
+    tokens = _tokenize(source)
+    if not tokens:
+        raise ValueError("Invalid expression: empty input.")
+    return _Parser(tokens, _operators(), number).parse()
+
+
+def evaluate_expression(source: str) -> float:
+    """
+    Evaluate an infix expression, compiling it (or reusing its compiled form) first.
+    Division by zero raises ZeroDivisionError, like DivideCalculator.
+    """
+    return compile_expression(source)()
@@ -0,0 +1,621 @@
+"""
+This module provides a compact store for the history of calculations performed during a session.
+
+Instead of keeping one Calculation object per entry, the History class keeps its data in columns:
+the operands and results live in array('d') buffers (8 bytes per value) and the operation is stored
+as a small integer operation code. Calculation objects are only rebuilt when an entry is accessed.
+
+Why store the history in columns?
+-A Calculation object carries an instance dictionary and object header on top of its two floats,
+so long sessions spend most of their memory on bookkeeping rather than on the data itself.
+-Columns of plain doubles grow at exactly the size of the data they hold.
+
+Sessions that compute with exact numbers (see app.backends) create the History with exact=True; their
+operand and result columns are plain lists, so Decimal and Fraction values are stored unchanged.
+
+A History can also be backed by a HistoryLog, an append-only file of binary records that survives
+exits and crashes. With a log, only the most recent entries need to stay in memory; older entries are
+read back from the file through the log's offset index when they are accessed.
+
+History.find answers queries such as "every divide with a result over 100" without scanning every entry.
+It uses two kinds of index, each built on its first use and then kept up to date by append:
+-A posting list per operation: the positions of all entries of that operation, in order.
+-A SortedIndex per queried column (a, b or result): the values in sorted order with their positions,
+so a range of values is found with two binary searches.
+Each condition of a query is answered by its index, and the results are intersected, smallest first.
+"""
+
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from app.calculation import CalculatorFactory, Calculation
+
+Entry = Tuple[str, float, float, float]
+
+# Columns that History.find can query by range, and their position in an Entry.
+QUERY_FIELDS = {"a": 1, "b": 2, "result": 3}
+
+
+class Range(NamedTuple):
+    """
+    A range of values for History.find. Range(3.5, 3.5) matches exactly 3.5; Range(low=100, include_low=False)
+    matches every value above 100. The bounds cannot be NaN, which is not ordered with any value.
+    """
+    low: float = -math.inf
+    high: float = math.inf
+    include_low: bool = True
+    include_high: bool = True
+
+    def __contains__(self, value) -> bool:
+        above = self.low < value or (self.include_low and self.low == value)
+        return above and (value < self.high or (self.include_high and value == self.high))
+
+
+class SortedIndex:
+    """
+    The values of one history column in sorted order, each with the position of its entry.
+
+    New values are buffered and merged in on the next search, so appends stay O(1): a few pending values
+    are inserted by binary search, and a large backlog is merged with one sort. NaN values never match a
+    range, so they are not indexed.
+
+    Attributes:
+        _keys (array or list): The sorted values (a list for exact histories, which hold Decimal or Fraction values).
+        _positions (array): The entry position of each value in _keys.
+        _pending (list): (value, position) pairs appended since the last search.
+
+    Methods:
+        add(value, position) -> None: Index the value of a new entry.
+        search(bounds: Range) -> array: Return the positions of the entries whose value is in bounds.
+        count(bounds: Range) -> int: Return how many entries have a value in bounds.
+    """
+
+    def __init__(self, exact: bool = False) -> None:
+        self._keys = [] if exact else array("d")
+        self._positions = array("Q")
+        self._pending: List[tuple] = []
+
+    def add(self, value, position: int) -> None:
+        if value == value:  # skip NaN
+            self._pending.append((value, position))
+
+    def _merge(self) -> None:
+        """
+        Merge the pending values into the sorted arrays.
+        """
+        pending = self._pending
+        if not pending:
+            return
+        keys = self._keys
+        if 8 * len(pending) < len(keys):
+            # A few new values: insert each one (a binary search and one memmove per value).
+            for value, position in sorted(pending):
+                index = bisect_right(keys, value)
+                keys.insert(index, value)
+                self._positions.insert(index, position)
+        else:
+            pairs = sorted([*zip(keys, self._positions), *pending])
+            self._keys = [] if isinstance(keys, list) else array("d")
+            self._keys.extend(value for value, _ in pairs)
+            self._positions = array("Q", (position for _, position in pairs))
+        pending.clear()
+
+    def _bounds(self, bounds: Range) -> Tuple[int, int]:
+        """
+        Return the slice of the sorted arrays that holds the values in bounds.
+        """
+        self._merge()
+        keys = self._keys
+        start = bisect_left(keys, bounds.low) if bounds.include_low else bisect_right(keys, bounds.low)
+        stop = bisect_right(keys, bounds.high) if bounds.include_high else bisect_left(keys, bounds.high)
+        return start, max(start, stop)
+
+    def search(self, bounds: Range) -> array:
+        start, stop = self._bounds(bounds)
+        return self._positions[start:stop]
+
+    def count(self, bounds: Range) -> int:
+        start, stop = self._bounds(bounds)
+        return stop - start
+
+
+class HistoryLog:
+    """
+    Durable append-only log of calculations.
+
+    File format: the 8-byte magic b"CALCLOG1", followed by records of two kinds:
+        define record:  <B kind=0> <H code> <B name length> <name bytes>   (names an operation code)
+        entry record:   <B kind=1> <H code> <d a> <d b> <d result>         (one calculation)
+    Codes are local to the file and defined before their first use, so a log can be read back by a
+    process that registered its operations in a different order.
+
+    Every append is handed to the operating system immediately (so it survives the process crashing),
+    but fsync, which waits for the disk, is only called once per group of appends ("group commit"):
+    after group_size appends or group_interval seconds, whichever comes first, and on close.
+    The interval is measured by a timer started with the first append of each group, so the last appends
+    before an idle period (such as a REPL waiting for input) are still committed on time.
+
+    Attributes:
+        path (str): The log file.
+        group_size (int): Appends per fsync.
+        group_interval (float): Longest time in seconds an append may wait for its fsync.
+        _timer (threading.Timer): Commits the current group when group_interval runs out (None with nothing pending).
+        _lock (threading.Lock): Serializes appends and commits between the caller and the timer thread.
+        _offsets (array): File offset of every entry record (the offset index used for random access).
+
+    Methods:
+        append(operation, a, b, result) -> None: Append one calculation.
+        read(index: int) -> Entry: Read the entry at an index.
+        commit() -> None: fsync every pending append now.
+        clear() -> None: Remove every entry from the file.
+        close() -> None: Commit and close the file.
+    """
+
+    MAGIC = b"CALCLOG1"
+    DEFINE = struct.Struct("<BHB")
+    ENTRY = struct.Struct("<BHddd")
+    KIND_DEFINE = 0
+    KIND_ENTRY = 1
+
+    def __init__(self, path: str, group_size: int = 64, group_interval: float = 1.0) -> None:
+        """
+        Open (or create) the log at path and rebuild its offset index.
+        A partial record at the end of the file (left by a crash in the middle of a write) is cut off.
+        """
+        if group_size < 1:
+            raise ValueError("Group size must be at least 1.")
+        self.path = path
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._names: List[str] = []
+        self._codes: dict = {}
+        self._offsets = array("Q")
+        self._pending = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        try:
+            self._load()
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _load(self) -> None:
+        """
+        Scan the file once to rebuild the operation names and the offset index.
+        """
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            os.write(self._fd, self.MAGIC)
+            os.fsync(self._fd)
+            return
+        with mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(self.MAGIC)] != self.MAGIC:
+                raise ValueError(f"'{self.path}' is not a history log.")
+            position = len(self.MAGIC)
+            while position < size:
+                kind = data[position]
+                if kind == self.KIND_ENTRY and position + self.ENTRY.size <= size:
+                    self._offsets.append(position)
+                    position += self.ENTRY.size
+                elif kind == self.KIND_DEFINE and position + self.DEFINE.size <= size:
+                    _, code, length = self.DEFINE.unpack_from(data, position)
+                    end = position + self.DEFINE.size + length
+                    if end > size:
+                        break
+                    name = data[position + self.DEFINE.size:end].decode("utf-8")
+                    self._codes[name] = code
+                    self._names.append(name)
+                    position = end
+                else:
+                    break
+        if position < size:
+            # Drop the partial (or unreadable) record the previous process left behind.
+            os.ftruncate(self._fd, position)
+
+    def append(self, operation: str, a: float, b: float, result: float) -> None:
+        """
+        Append one calculation to the log.
+        """
+        with self._lock:
+            code = self._codes.get(operation)
+            record = b""
+            if code is None:
+                code = self._codes[operation] = len(self._names)
+                self._names.append(operation)
+                name = operation.encode("utf-8")
+                record = self.DEFINE.pack(self.KIND_DEFINE, code, len(name)) + name
+            record += self.ENTRY.pack(self.KIND_ENTRY, code, a, b, result)
+            end = os.lseek(self._fd, 0, os.SEEK_END)
+            os.write(self._fd, record)
+            self._offsets.append(end + len(record) - self.ENTRY.size)
+
+            # Group commit: one fsync per group of appends instead of one per append.
+            self._pending += 1
+            if self._pending >= self.group_size:
+                self._commit()
+            elif self._timer is None:
+                # The first append of a group starts the clock, so it is committed within group_interval
+                # even if no other append follows.
+                self._timer = threading.Timer(self.group_interval, self._commit_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def read(self, index: int) -> Entry:
+        """
+        Read the entry at index (negative indexes count from the end) with one positioned read.
+        """
+        offset = self._offsets[index]
+        _, code, a, b, result = self.ENTRY.unpack(os.pread(self._fd, self.ENTRY.size, offset))
+        return (self._names[code], a, b, result)
+
+    def commit(self) -> None:
+        """
+        Wait until every append so far is on disk.
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        """
+        fsync the pending appends and stop the group's timer; the caller holds the lock.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            os.fsync(self._fd)
+            self._pending = 0
+
+    def _commit_on_timer(self) -> None:
+        """
+        Commit the current group from the timer thread, unless the log was closed in the meantime.
+        """
+        with self._lock:
+            if self._fd is not None:
+                self._commit()
+
+    def clear(self) -> None:
+        """
+        Remove every entry (and operation definition) from the log.
+        """
+        with self._lock:
+            self._pending = 0  # the pending appends are removed below, so only the timer is stopped
+            self._commit()
+            os.ftruncate(self._fd, len(self.MAGIC))
+            os.fsync(self._fd)
+            self._names.clear()
+            self._codes.clear()
+            del self._offsets[:]
+
+    def close(self) -> None:
+        """
+        Commit pending appends and close the file. Closing twice is allowed.
+        """
+        with self._lock:
+            if self._fd is not None:
+                self._commit()
+                os.close(self._fd)
+                self._fd = None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __enter__(self) -> "HistoryLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class History:
+    """
+    Array-backed history of calculations.
+
+    Attributes:
+        _codes (array): The operation code of each resident entry (see CalculatorFactory.operation_code).
+        _a (array): The first operand of each resident entry.
+        _b (array): The second operand of each resident entry.
+        _results (array): The result of each resident entry.
+        _base (int): The index of the first resident entry; older entries are only in the log.
+        log (HistoryLog): Optional durable log every entry is also written to.
+        resident (int): With a log, how many recent entries to keep in memory (None keeps all).
+        exact (bool): Whether values are stored as given (lists) instead of as doubles (array('d')).
+        _postings (dict): Positions of the entries of each operation (None until the first find).
+        _sorted (dict): A SortedIndex per queried column, created on the first find that uses the column.
+
+    Methods:
+        append(calculation: Calculation, result: float) -> None: Add a calculation to the history.
+        extend(rows: Iterable[tuple]) -> None: Add raw (operation, a, b, result) rows to the history.
+        entry(index: int) -> tuple: Return the raw (operation, a, b, result) row at an index.
+        entries() -> Iterator[tuple]: Iterate over the raw rows of all entries.
+        column_chunks(size: int) -> Iterator[tuple]: Iterate over the (codes, a, b, results) columns in chunks.
+        from_columns(names, codes, a, b, results) -> History: Build a history from whole columns (class method).
+        find(operation, a, b, result) -> list: Return the positions of the entries that match a query.
+        clear() -> None: Remove all entries.
+        close() -> None: Commit and close the log, if there is one.
+        __len__() -> int: Return the number of entries.
+        __getitem__(index) -> Calculation: Return a Calculation view of one entry (or a list for a slice).
+        __iter__() -> Iterator[Calculation]: Iterate over Calculation views of all entries.
+    """
+
+    def __init__(self, log: Optional[HistoryLog] = None, resident: Optional[int] = None, exact: bool = False) -> None:
+        """
+        Initialize the history with one column per field.
+        If a log is given, its existing entries become the start of the history, and the most recent
+        of them (up to resident) are loaded into memory.
+        With exact=True, operands and results are kept as given instead of being converted to doubles.
+        """
+        if resident is not None and log is None:
+            raise ValueError("A resident limit requires a history log.")
+        if resident is not None and resident < 1:
+            raise ValueError("Resident limit must be at least 1.")
+        if exact and log is not None:
+            raise ValueError("A history log stores doubles and cannot keep exact values.")
+        self.log = log
+        self.resident = resident
+        self.exact = exact
+        self._codes = array("H")
+        # Lists keep Decimal and Fraction values unchanged; array('d') would round them to doubles.
+        column = list if exact else (lambda: array("d"))
+        self._a = column()
+        self._b = column()
+        self._results = column()
+        self._base = 0
+        self._postings: Optional[Dict[str, array]] = None
+        self._sorted: Dict[str, SortedIndex] = {}
+        if log is not None:
+            total = len(log)
+            self._base = 0 if resident is None else max(0, total - resident)
+            for index in range(self._base, total):
+                self._append_row(*log.read(index))
+
+    # from_columns restores a history in bulk, e.g. from a session snapshot (see app.session).
+    @classmethod
+    def from_columns(cls, names: List[str], codes: array, a: array, b: array, results: array) -> "History":
+        """
+        Build a history from whole columns, in time proportional to their size in bytes
+        rather than to the number of entries: the arrays become the history's columns as they are.
+
+        Parameters:
+            names (List[str]): Operation names; codes index into this list.
+            codes (array): array('H') of the operation of each entry.
+            a, b, results (array): array('d') columns of the operands and results.
+        Raises:
+            ValueError: If an operation used by the entries is not supported.
+        """
+        # The codes in the columns may have been assigned by another process; translate them
+        # to this process's operation codes, and only copy the column if they differ.
+        used = set(codes)
+        table = [CalculatorFactory.operation_code(name) if code in used else code for code, name in enumerate(names)]
+        if any(code != new_code for code, new_code in enumerate(table)):
+            codes = array("H", map(table.__getitem__, codes))
+        history = cls()
+        history._codes = codes
+        history._a = a
+        history._b = b
+        history._results = results
+        return history
+
+    def _append_row(self, operation: str, a: float, b: float, result: float) -> None:
+        """
+        Add one row to the resident columns.
+        """
+        self._codes.append(CalculatorFactory.operation_code(operation))
+        self._a.append(a)
+        self._b.append(b)
+        self._results.append(result)
+
+    # append method stores the fields of a calculation in the columns (and the log).
+    def append(self, calculation: Calculation, result: float) -> None:
+        """
+        Add a calculation and its result to the history.
+
+        Parameters:
+            calculation (Calculation): A calculation created by the CalculatorFactory.
+            result (float): The result returned by the calculation's excute method.
+        """
+        self._add(calculation.calculation_type, calculation.a, calculation.b, result)
+
+    # extend method adds rows in bulk, e.g. the exact rows of a session snapshot (see app.session).
+    def extend(self, rows: Iterable[Entry]) -> None:
+        """
+        Add raw rows to the history, in order, without creating any Calculation.
+
+        Parameters:
+            rows (Iterable[tuple]): (operation, a, b, result) rows, with values already converted to the
+                history's numbers (doubles, or the exact values of an exact history).
+        Raises:
+            ValueError: If an operation is not supported.
+        """
+        for operation, a, b, result in rows:
+            self._add(operation, a, b, result)
+
+    def _add(self, operation: str, a: float, b: float, result: float) -> None:
+        """
+        Add one row to the columns, the indexes that have been built and the log.
+        """
+        self._append_row(operation, a, b, result)
+        if self._postings is not None or self._sorted:
+            self._index_entry(len(self) - 1, (operation, a, b, result))
+        if self.log is not None:
+            self.log.append(operation, a, b, result)
+            # Keep memory bounded: once twice the resident limit is reached, drop the older half.
+            # Dropping in bulk keeps the cost of trimming the arrays constant per append on average.
+            if self.resident is not None and len(self._codes) >= 2 * self.resident:
+                drop = len(self._codes) - self.resident
+                del self._codes[:drop]
+                del self._a[:drop]
+                del self._b[:drop]
+                del self._results[:drop]
+                self._base += drop
+
+    # entry method returns the raw values of a row without building any Calculation object.
+    def entry(self, index: int) -> tuple:
+        """
+        Return the row at an index as an (operation, a, b, result) tuple.
+        Entries that are no longer resident are read back from the log.
+
+        Parameters:
+            index (int): The position of the entry; negative indexes count from the end.
+        """
+        total = len(self)
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError("history index out of range")
+        if index < self._base:
+            return self.log.read(index)
+        row = index - self._base
+        return (
+            CalculatorFactory.operation_name(self._codes[row]),
+            self._a[row],
+            self._b[row],
+            self._results[row],
+        )
+
+    # entries method streams the raw rows, for callers that read every entry (such as app.export).
+    def entries(self) -> Iterator[Entry]:
+        """
+        Yield every entry as an (operation, a, b, result) tuple, in order, without building Calculation views.
+        Entries that are no longer resident are read back from the log first.
+        """
+        for index in range(self._base):
+            yield self.log.read(index)
+        yield from zip(map(CalculatorFactory.operation_name, self._codes), self._a, self._b, self._results)
+
+    # column_chunks method streams whole columns, for callers that write them in bulk (such as app.export).
+    def column_chunks(self, size: int) -> Iterator[Tuple[array, array, array, array]]:
+        """
+        Yield the (codes, a, b, results) columns of the history in chunks, in history order.
+        Entries that are only in the log are read back in chunks of up to size rows; the resident
+        entries are yielded last, as the history's own columns (lists instead of arrays if it is exact).
+        The chunks must not be modified.
+        """
+        operation_code = CalculatorFactory.operation_code
+        for start in range(0, self._base, size):
+            chunk = (array("H"), array("d"), array("d"), array("d"))
+            for index in range(start, min(start + size, self._base)):
+                operation, a, b, result = self.log.read(index)
+                chunk[0].append(operation_code(operation))
+                chunk[1].append(a)
+                chunk[2].append(b)
+                chunk[3].append(result)
+            yield chunk
+        yield self._codes, self._a, self._b, self._results
+
+    def _index_entry(self, position: int, row: tuple) -> None:
+        """
+        Add one entry to the indexes that have been built.
+        """
+        if self._postings is not None:
+            self._postings.setdefault(row[0], array("Q")).append(position)
+        for field, index in self._sorted.items():
+            index.add(row[QUERY_FIELDS[field]], position)
+
+    def _posting_list(self, operation: str) -> array:
+        """
+        Return the positions of the entries of an operation, building the posting lists on first use.
+        """
+        if self._postings is None:
+            self._postings = {}
+            for position in range(len(self)):
+                self._postings.setdefault(self.entry(position)[0], array("Q")).append(position)
+        return self._postings.get(operation, array("Q"))
+
+    def _sorted_index(self, field: str) -> SortedIndex:
+        """
+        Return the sorted index of a column, building it on first use.
+        """
+        index = self._sorted.get(field)
+        if index is None:
+            index = SortedIndex(self.exact)
+            column = QUERY_FIELDS[field]
+            for position in range(len(self)):
+                index.add(self.entry(position)[column], position)
+            self._sorted[field] = index
+        return index
+
+    # find method answers queries from the indexes instead of scanning every entry.
+    def find(
+        self,
+        operation: Optional[str] = None,
+        a: Optional[Range] = None,
+        b: Optional[Range] = None,
+        result: Optional[Range] = None,
+    ) -> List[int]:
+        """
+        Return the positions of the entries that match every given condition, in history order.
+
+        Parameters:
+            operation (str): Only entries of this operation type.
+            a, b, result (Range): Only entries whose first operand, second operand or result is in the range.
+        Raises:
+            ValueError: If a bound is NaN (the sorted indexes cannot be searched for it).
+        """
+        conditions = [(field, bounds) for field, bounds in (("a", a), ("b", b), ("result", result)) if bounds is not None]
+        for field, bounds in conditions:
+            if math.isnan(bounds.low) or math.isnan(bounds.high):
+                raise ValueError(f"The bounds of '{field}' cannot be NaN.")
+        if operation is None and not conditions:
+            return list(range(len(self)))
+
+        # Every condition has an index that returns its matching positions; intersect them, smallest first.
+        # The intersection runs in C over arrays of positions, so no entry is read to answer the query.
+        matches = [self._sorted_index(field).search(bounds) for field, bounds in conditions]
+        if operation is not None:
+            matches.append(self._posting_list(operation))
+        matches.sort(key=len)
+        positions = set(matches[0])
+        for other in matches[1:]:
+            if not positions:
+                break
+            positions.intersection_update(other)
+        return sorted(positions)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the history (and from its log).
+        """
+        del self._codes[:]
+        del self._a[:]
+        del self._b[:]
+        del self._results[:]
+        self._base = 0
+        self._postings = None
+        self._sorted = {}
+        if self.log is not None:
+            self.log.clear()
+
+    def close(self) -> None:
+        """
+        Commit and close the log, if the history has one.
+        """
+        if self.log is not None:
+            self.log.close()
+
+    def __len__(self) -> int:
+        return self._base + len(self._codes)
+
+    # __getitem__ builds Calculation views only for the entries that are actually accessed.
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        """
+        Return a Calculation view of the entry at an index, or a list of views for a slice.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        operation, a, b, result = self.entry(index)
+        # The view is built from the class directly: it reads back past work, so it is not counted as a creation.
+        calculation = CalculatorFactory.get_calculator_class(operation)(a, b)
+        # The stored result is attached to the view, so displaying it never re-executes the calculation.
+        calculation.result = result
+        return calculation
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,209 @@
+"""
+This module provides a compact binary wire format for bulk calculations.
+
+The text format ('<operation> <num1> <num2>') is convenient for people, but parsing numbers from text
+and formatting results back into text costs far more CPU than the arithmetic. The binary format carries
+the same information as packed little-endian doubles, which can be read and written without any parsing.
+
+Every frame starts with a 4-byte little-endian length, followed by that many bytes of payload:
+
+    Request payload:   <H op code> <I count> <count doubles: a values> <count doubles: b values>
+    Response payload:  <B status=0> <I count> <count doubles: results>
+                       <B status=1> <I length> <length bytes: UTF-8 error message>
+
+Op codes are the CalculatorFactory operation codes (see CalculatorFactory.operation_code).
+The a and b values are stored as two columns, so a request can be handed to
+CalculatorFactory.evaluate_batch as two memoryviews without copying or converting any number.
+
+Op codes are indexes into the registration order of each process. The built-in operations are registered
+when app.calculation is imported and always have the same codes, but a plugin (see register_lazy) gets its
+code when it is first used, so two processes can give the same plugin operation different codes.
+Frames for plugin operations are only safe between a client and a server that load the same plugins in the
+same order (for example, by calling operation_code for each plugin at start-up).
+"""
+
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterator, Optional, Sequence, Tuple
+from app.calculation import CalculatorFactory
+
+# Frame length prefix: payload size in bytes.
+LENGTH = struct.Struct("<I")
+# Request header: op code and number of operand pairs.
+REQUEST_HEADER = struct.Struct("<HI")
+# Response header: status and number of results (or length of the error message).
+RESPONSE_HEADER = struct.Struct("<BI")
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Largest payload accepted from a peer, to protect against corrupt or hostile length prefixes.
+MAX_FRAME_SIZE = 64 << 20
+
+# The format is little-endian; big-endian hosts must swap bytes when converting to native doubles.
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _doubles(payload: memoryview) -> Sequence[float]:
+    """
+    Return the little-endian doubles in payload as a sequence of floats.
+    On little-endian hosts this is a zero-copy memoryview cast.
+    """
+    if _NATIVE_LITTLE_ENDIAN:
+        return payload.cast("B").cast("d")
+    # array("d", payload) would convert every byte to a double of its own, so load the raw bytes instead.
+    values = array("d")
+    values.frombytes(payload)
+    values.byteswap()
+    return values
+
+
+def _le_bytes(values: Sequence[float]) -> memoryview:
+    """
+    Return values as little-endian doubles, without copying when they already are an array('d').
+    """
+    if not isinstance(values, array) or values.typecode != "d":
+        values = array("d", values)
+    if not _NATIVE_LITTLE_ENDIAN:  # pragma: no cover
+        values = array("d", values)
+        values.byteswap()
+    return memoryview(values).cast("B")
+
+
+def _frame(*parts) -> bytes:
+    """
+    Join the parts of a payload and prefix them with the payload length.
+    """
+    payload = b"".join(parts)
+    return LENGTH.pack(len(payload)) + payload
+
+
+def encode_request(operation: str, a_values: Sequence[float], b_values: Sequence[float]) -> bytes:
+    """
+    Encode a bulk request for an operation over two columns of operands.
+    """
+    if len(a_values) != len(b_values):
+        raise ValueError("Operand columns must have the same length.")
+    header = REQUEST_HEADER.pack(CalculatorFactory.operation_code(operation), len(a_values))
+    return _frame(header, _le_bytes(a_values), _le_bytes(b_values))
+
+
+def decode_request(payload: bytes) -> Tuple[str, Sequence[float], Sequence[float]]:
+    """
+    Decode a request payload (without its length prefix) into (operation, a_values, b_values).
+    The operand columns are memoryviews into payload on little-endian hosts.
+    """
+    view = memoryview(payload)
+    if len(view) < REQUEST_HEADER.size:
+        raise ValueError("Truncated request frame.")
+    code, count = REQUEST_HEADER.unpack_from(view)
+    body = view[REQUEST_HEADER.size:]
+    if len(body) != 16 * count:
+        raise ValueError("Request frame size does not match its operand count.")
+    operation = CalculatorFactory.operation_name(code)
+    return operation, _doubles(body[:8 * count]), _doubles(body[8 * count:])
+
+
+def encode_response(results: Sequence[float]) -> bytes:
+    """
+    Encode a successful response carrying the results.
+    """
+    return _frame(RESPONSE_HEADER.pack(STATUS_OK, len(results)), _le_bytes(results))
+
+
+def encode_error(message: str) -> bytes:
+    """
+    Encode an error response carrying a message.
+    """
+    data = message.encode("utf-8")
+    return _frame(RESPONSE_HEADER.pack(STATUS_ERROR, len(data)), data)
+
+
+def decode_response(payload: bytes) -> Sequence[float]:
+    """
+    Decode a response payload (without its length prefix) into its results.
+    An error response raises ValueError with the peer's error message.
+    """
+    view = memoryview(payload)
+    if len(view) < RESPONSE_HEADER.size:
+        raise ValueError("Truncated response frame.")
+    status, count = RESPONSE_HEADER.unpack_from(view)
+    body = view[RESPONSE_HEADER.size:]
+    if status == STATUS_ERROR:
+        raise ValueError(str(body, "utf-8"))
+    if status != STATUS_OK or len(body) != 8 * count:
+        raise ValueError("Malformed response frame.")
+    return _doubles(body)
+
+
+def process_request(payload: bytes) -> bytes:
+    """
+    Evaluate one request payload and return the encoded response frame.
+    Calculation errors (unknown operation, division by zero, malformed frame) become error responses.
+    """
+    try:
+        operation, a_values, b_values = decode_request(payload)
+        return encode_response(CalculatorFactory.evaluate_batch(operation, a_values, b_values))
+    except (ValueError, ZeroDivisionError) as e:
+        return encode_error(str(e))
+
+
+def check_frame_length(length: int) -> None:
+    """
+    Reject payload lengths larger than MAX_FRAME_SIZE.
+    """
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME_SIZE} byte limit.")
+
+
+def read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """
+    Read one frame from a binary stream and return its payload, or None at a clean end of stream.
+    """
+    prefix = stream.read(LENGTH.size)
+    if not prefix:
+        return None
+    if len(prefix) < LENGTH.size:
+        raise ValueError("Truncated frame length.")
+    (length,) = LENGTH.unpack(prefix)
+    check_frame_length(length)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ValueError("Truncated frame payload.")
+    return payload
+
+
+def iter_frames(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Yield the payload of every frame in a binary stream.
+    """
+    while True:
+        payload = read_frame(stream)
+        if payload is None:
+            return
+        yield payload
+
+
+def run_binary_batch(source: str, output: Optional[BinaryIO] = None) -> int:
+    """
+    Run batch mode over a file of binary request frames and return the number of frames processed.
+    One response frame is written per request frame, in the same order.
+
+    Parameters:
+        source (str): The path of the frame file, or "-" to read from standard input.
+        output (BinaryIO): Where to write the response frames. Defaults to standard output.
+    """
+    if output is None:
+        output = sys.stdout.buffer
+    count = 0
+    stream = sys.stdin.buffer if source == "-" else open(source, "rb")
+    try:
+        for payload in iter_frames(stream):
+            output.write(process_request(payload))
+            count += 1
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    output.flush()
+    return count
@@ -0,0 +1,226 @@
+"""
+This module provides n-ary reductions such as "add 1 2 3 4" and "sum @values.bin".
+
+A reduction applies an operation to any number of operands, from left to right. Operands are numbers or
+"@path" files of packed little-endian doubles (see app.vectors), and are streamed: files are read in fixed
+size chunks, so "sum @file" runs in constant memory however long the file is.
+
+Sums (add, subtract and the "sum" command) use Neumaier's compensated summation instead of chained
+Operations.add calls. Every addition also computes the rounding error it made, and the errors are added
+back at the end, so the result stays accurate over millions of values of mixed magnitude.
+Other operations (such as multiply or divide) are folded with CalculatorFactory.compute.
+
+With a numeric backend (see app.backends), number operands are parsed by the backend and every operation,
+sums included, is folded in the backend's context, so "add 0.1 0.2 0.3" is exact in a Decimal or Fraction
+session. File operands hold doubles, so they cannot be used with a backend.
+
+Why compensated summation?
+-Chained floating-point additions lose the low digits of every small value added to a large total,
+and the error grows with the number of values.
+-Neumaier's algorithm keeps that lost part in a second variable, which makes the error independent
+of the number of values for all practical inputs, at the cost of a few extra additions per value.
+"""
+
+import math
+import os
+import sys
+from array import array
+from operator import neg
+from typing import TYPE_CHECKING, Iterable, Iterator, List, NamedTuple, Optional
+from app.calculation import CalculatorFactory
+from app.vectors import FILE_PREFIX
+
+if TYPE_CHECKING:
+    from app.backends import Backend
+
+# Command name for summing all values of all operands ("sum 1 2 3", "sum @values.bin").
+SUM_COMMAND = "sum"
+
+# Number of doubles read from an operand file at a time.
+READ_CHUNK = 1 << 16
+
+
+class ReductionCommand(NamedTuple):
+    """
+    A reduction: an operation type (or SUM_COMMAND) and its operand tokens, kept as text until evaluation.
+    """
+    operation: str
+    operands: tuple
+
+
+class CompensatedSum:
+    """
+    Streaming sum using Neumaier's compensated (improved Kahan) summation.
+
+    Attributes:
+        total (float): The running sum.
+        compensation (float): The accumulated rounding error of the running sum.
+
+    Methods:
+        add(value: float) -> None: Add one value.
+        update(values: Iterable[float]) -> None: Add every value of an iterable.
+        value -> float: The compensated sum.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value: float) -> None:
+        self.update((value,))
+
+    def update(self, values: Iterable[float]) -> None:
+        # Local variables keep the loop free of attribute lookups.
+        total = self.total
+        compensation = self.compensation
+        for value in values:
+            new_total = total + value
+            # Whichever operand is larger in magnitude is exact in new_total; recover what the other one lost.
+            if abs(total) >= abs(value):
+                compensation += (total - new_total) + value
+            else:
+                compensation += (value - new_total) + total
+            total = new_total
+        self.total = total
+        self.compensation = compensation
+
+    @property
+    def value(self) -> float:
+        # With an infinite (or nan) total the compensation is meaningless (inf - inf is nan).
+        if not math.isfinite(self.total):
+            return self.total
+        return self.total + self.compensation
+
+
+def reduction_command(parts: List[str]) -> Optional[ReductionCommand]:
+    """
+    Return the reduction described by the tokens of a line, or None if the line is not a reduction.
+
+    A line is a reduction if it starts with "sum" and has at least one operand, or starts with an operation
+    name followed by three or more operands. Lines with two operands are binary (or vector) commands, and
+    an operation with a single operand stays invalid input, as it always was.
+    """
+    if len(parts) < 2 or not parts[0].isidentifier():
+        return None
+    operation = parts[0].lower()
+    if operation != SUM_COMMAND and len(parts) < 4:
+        return None
+    return ReductionCommand(operation, tuple(parts[1:]))
+
+
+def iter_file_values(path: str) -> Iterator[float]:
+    """
+    Yield the packed little-endian doubles of a file, reading READ_CHUNK values at a time.
+
+    Raises:
+        ValueError: If the file cannot be read or its size is not a multiple of 8 bytes.
+    """
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size % 8:
+                raise ValueError(f"Vector file '{path}' does not contain packed doubles.")
+            while True:
+                data = file.read(8 * READ_CHUNK)
+                if not data:
+                    return
+                chunk = array("d")
+                chunk.frombytes(data)
+                if sys.byteorder == "big":
+                    chunk.byteswap()  # the file is little-endian
+                yield from chunk
+    except OSError as e:
+        raise ValueError(f"Cannot read vector file '{path}': {e.strerror}.") from None
+
+
+def iter_operands(tokens: Iterable[str], allow_files: bool = True) -> Iterator[float]:
+    """
+    Yield the values of operand tokens in order: a number yields itself, "@path" yields every value of the file.
+
+    Raises:
+        ValueError: If a token is not a number, or is a file while files are not allowed.
+    """
+    for token in tokens:
+        if token.startswith(FILE_PREFIX):
+            if not allow_files:
+                raise ValueError("File operands are not allowed here.")
+            yield from iter_file_values(token[len(FILE_PREFIX):])
+            continue
+        try:
+            yield float(token)
+        except ValueError:
+            raise ValueError(f"Invalid operand '{token}'.") from None
+
+
+def reduce_values(operation: str, values: Iterable[float]) -> float:
+    """
+    Reduce values from left to right with an operation, in constant memory.
+
+    Parameters:
+        operation (str): An operation type, or "sum" (the same as "add").
+        values (Iterable[float]): The operands; consumed once.
+    Raises:
+        ValueError: If there are no values, or the operation is not supported.
+        ZeroDivisionError: If a division by zero occurs.
+    """
+    iterator = iter(values)
+    if operation == SUM_COMMAND:
+        operation = "add"
+    compute = CalculatorFactory.compute
+    # LBYL: report an unknown operation before reading (possibly large) operand files.
+    CalculatorFactory.get_calculator_class(operation)
+    for first in iterator:
+        break
+    else:
+        raise ValueError("A reduction needs at least one value.")
+
+    if operation in ("add", "subtract"):
+        # a - b - c - ... is a + (-b) + (-c) + ..., so both use one compensated sum.
+        total = CompensatedSum()
+        total.add(first)
+        total.update(iterator if operation == "add" else map(neg, iterator))
+        return total.value
+
+    result = first
+    for value in iterator:
+        result = compute(operation, result, value)
+    return result
+
+
+def evaluate_reduction(command: ReductionCommand, allow_files: bool = True, backend: Optional["Backend"] = None) -> float:
+    """
+    Evaluate a reduction command, streaming its operands.
+    With a backend, the operands are parsed and reduced with it instead (see reduce_with_backend).
+    """
+    if backend is not None:
+        return reduce_with_backend(command, backend)
+    return reduce_values(command.operation, iter_operands(command.operands, allow_files))
+
+
+def reduce_with_backend(command: ReductionCommand, backend: "Backend"):
+    """
+    Reduce the operands of a command from left to right with the numbers and context of a backend.
+    Decimal and Fraction additions need no compensation: Fraction sums are exact, and Decimal sums are
+    rounded to the backend's precision like every other Decimal calculation.
+
+    Raises:
+        ValueError: If an operand is not a number of the backend (file operands never are), or the operation
+            is not supported.
+        ZeroDivisionError: If a division by zero occurs.
+    """
+    operation = "add" if command.operation == SUM_COMMAND else command.operation
+    CalculatorFactory.get_calculator_class(operation)  # raises ValueError for an unknown operation
+    values = []
+    for token in command.operands:
+        if token.startswith(FILE_PREFIX):
+            raise ValueError(f"File operands hold doubles and cannot be used with the {backend.name} backend.")
+        try:
+            values.append(backend.parse(token))
+        except ValueError:
+            raise ValueError(f"Invalid operand '{token}'.") from None
+
+    compute = CalculatorFactory.compute
+    result = values[0]
+    with backend.context():
+        for value in values[1:]:
+            result = compute(operation, result, value)
+    return result
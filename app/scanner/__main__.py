@@ -0,0 +1,20 @@
+"""
+Parse-throughput benchmark: python -m app.scanner [LINES] [MALFORMED_RATIO]
+
+Prints the lines per second of the exception-driven parser (before) and the scanner (after),
+for all-valid input and for input with MALFORMED_RATIO malformed lines.
+"""
+
+import sys
+from app.scanner import parse_throughput, sample_lines
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+# All-valid input is the common case, so it is always reported.
+for malformed_ratio in sorted({0.0, ratio}):
+    result = parse_throughput(sample_lines(count, malformed_ratio))
+    print(f"malformed:        {malformed_ratio:.0%}")
+    print(f"lines:            {result['lines']}")
+    print(f"before (split):   {result['before_lines_per_second']:,.0f} lines/s")
+    print(f"after (scanner):  {result['after_lines_per_second']:,.0f} lines/s")
+    print(f"speedup:          {result['speedup']:.2f}x")
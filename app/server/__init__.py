@@ -0,0 +1,150 @@
+"""
+This module exposes the registered calculators over a local TCP or Unix socket using asyncio streams.
+
+Clients send the same '<operation> <num1> <num2>' lines as the REPL and batch mode, and get one
+line back per command (a result such as "8.0", or "error: <message>"). Requests may be pipelined:
+a client can send many lines without waiting, and the responses come back in the same order.
+With binary=True the server speaks the length-prefixed frame format of app.protocol instead.
+
+Why use asyncio?
+-One process and one thread can serve thousands of idle or slow connections, because each connection
+is a cheap coroutine instead of an operating-system thread or a REPL subprocess.
+-The arithmetic is fast, so the server spends its time on I/O, which is what asyncio is built for.
+"""
+
+import asyncio
+from typing import Optional
+from app.batch import evaluate_line
+from app.protocol import LENGTH, check_frame_length, encode_error, process_request
+
+# Maximum length of a request line, in bytes.
+LINE_LIMIT = 1 << 16
+
+# Number of pending connections the operating system may queue before accepting them.
+BACKLOG = 1024
+
+# Commands that close the connection instead of being evaluated.
+CLOSE_COMMANDS = ("exit", "quit")
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Serve one connection until the client closes it or sends 'exit'.
+
+    Each line is evaluated with the batch pipeline and answered with one line. Blank lines are ignored.
+    Responses are written as soon as they are ready; drain only waits when the client reads
+    slower than it sends, which keeps pipelined requests flowing without a round-trip per line.
+    """
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # The line was longer than LINE_LIMIT; there is no way to resynchronize, so close.
+                writer.write(b"error: Request line too long.\n")
+                break
+            if not line:
+                break  # the client closed its side of the connection
+
+            text = line.decode("utf-8", "replace")
+            if text.strip().lower() in CLOSE_COMMANDS:
+                break
+
+            result = evaluate_line(text, allow_files=False)  # clients must not read server files
+            if result is None:
+                continue  # blank line, nothing to answer
+            writer.write(result.encode("utf-8") + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass  # the client went away; there is nobody left to answer
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:  # pragma: no cover
+            pass
+
+
+async def handle_binary_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Serve one connection that speaks the binary frame format of app.protocol.
+    Each request frame is answered with one response frame, in order, until the client closes the connection.
+    """
+    try:
+        while True:
+            try:
+                (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                check_frame_length(length)
+                payload = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                break  # the client closed the connection (possibly in the middle of a frame)
+            except ValueError as e:
+                # An oversized frame cannot be skipped safely, so report it and close.
+                writer.write(encode_error(str(e)))
+                break
+            writer.write(process_request(payload))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:  # pragma: no cover
+            pass
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 8765, binary: bool = False) -> asyncio.AbstractServer:
+    """
+    Start a TCP calculation server and return it. Use port 0 to pick any free port.
+    Set binary to serve the frame format of app.protocol instead of text lines.
+    """
+    handler = handle_binary_client if binary else handle_client
+    return await asyncio.start_server(handler, host, port, limit=LINE_LIMIT, backlog=BACKLOG)
+
+
+async def start_unix_server(path: str, binary: bool = False) -> asyncio.AbstractServer:
+    """
+    Start a Unix-socket calculation server listening on path and return it.
+    Set binary to serve the frame format of app.protocol instead of text lines.
+    """
+    handler = handle_binary_client if binary else handle_client
+    return await asyncio.start_unix_server(handler, path, limit=LINE_LIMIT, backlog=BACKLOG)
+
+
+def parse_address(address: str) -> tuple:
+    """
+    Parse a server address into ("unix", path) or ("tcp", host, port).
+
+    Accepted forms:
+        "8765"              TCP on 127.0.0.1, port 8765
+        "0.0.0.0:8765"      TCP on the given host and port
+        "unix:/tmp/calc"    Unix socket at the given path
+    """
+    if address.startswith("unix:"):
+        return ("unix", address[len("unix:"):])
+    host, _, port = address.rpartition(":")
+    try:
+        return ("tcp", host or "127.0.0.1", int(port))
+    except ValueError:
+        raise ValueError(f"Invalid server address '{address}'.") from None
+
+
+async def serve(address: str, ready: Optional[asyncio.Event] = None, binary: bool = False) -> None:
+    """
+    Start a server on address (see parse_address) and serve until cancelled.
+
+    Parameters:
+        address (str): Where to listen.
+        ready (asyncio.Event): Optional event that is set once the server is listening.
+        binary (bool): Serve the binary frame format instead of text lines.
+    """
+    kind, *where = parse_address(address)
+    if kind == "unix":
+        server = await start_unix_server(*where, binary=binary)
+    else:
+        server = await start_server(*where, binary=binary)
+    async with server:
+        if ready is not None:
+            ready.set()
+        await server.serve_forever()
@@ -0,0 +1,124 @@
+"""
+This module saves a whole REPL session to a snapshot file and restores it: the history and the variables.
+
+File format:
+    8-byte magic b"CALCSES1", <Q metadata length>, metadata (UTF-8 JSON), then the history:
+    -for float sessions, the columnar format of app.export (packed code, a, b and result columns)
+    -for exact sessions (see app.backends), the rows are part of the metadata, with numbers as text
+
+Why not replay the calculations?
+-Replaying a million-entry history creates, executes and appends a million calculations.
+-The history already keeps its data in columns of packed doubles, so saving writes each column in one
+block and restoring reads each column back in one bulk read, in time proportional to the size of the
+data rather than to the number of entries. Variables are restored with their stored values, so nothing
+is recomputed either.
+"""
+
+import json
+import struct
+from typing import BinaryIO, List, Optional, Tuple
+from app.calculation import CalculatorFactory
+from app.history import History
+from app.variables import Workspace
+from app.backends import Backend
+from app.export import BUFFER_SIZE, read_columns, write_columns
+
+SNAPSHOT_MAGIC = b"CALCSES1"
+SNAPSHOT_HEADER = struct.Struct("<8sQ")
+
+
+def save_session(path: str, history: History, workspace: Workspace) -> int:
+    """
+    Write a snapshot of a session and return the number of history entries saved.
+
+    Parameters:
+        path (str): The snapshot file; it is replaced if it exists.
+        history (History): The history of the session (it may be backed by a history log).
+        workspace (Workspace): The variables of the session; its backend is recorded in the snapshot.
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    metadata = {
+        "backend": workspace.backend.name,
+        "variables": workspace.to_records(),
+    }
+    if history.exact:
+        metadata["history"] = [[operation, str(a), str(b), str(result)] for operation, a, b, result in history.entries()]
+    encoded = json.dumps(metadata).encode("utf-8")
+    with open(path, "wb", buffering=BUFFER_SIZE) as file:
+        file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(encoded)))
+        file.write(encoded)
+        if not history.exact:
+            write_columns(history, file)
+    return len(history)
+
+
+def load_session(path: str, backend: Optional[Backend] = None) -> Tuple[History, Workspace]:
+    """
+    Read a snapshot written by save_session and return the restored history and workspace.
+
+    Parameters:
+        path (str): The snapshot file.
+        backend (Backend): The numeric backend of the session loading the snapshot (floats by default);
+            it must be the one the snapshot was saved with.
+    Raises:
+        ValueError: If the file is not a snapshot, was saved with another backend, or uses an operation
+            that is not registered in this process.
+        OSError: If the file cannot be read.
+    """
+    if backend is None:
+        backend = Backend()
+    with open(path, "rb", buffering=BUFFER_SIZE) as file:
+        try:
+            magic, length = SNAPSHOT_HEADER.unpack(file.read(SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError
+            metadata = json.loads(file.read(length).decode("utf-8"))
+        except (struct.error, ValueError):
+            raise ValueError(f"'{path}' is not a session snapshot.") from None
+        # Metadata with missing keys or values of the wrong type (e.g. {} or a list) is not a snapshot either.
+        try:
+            return _restore(path, file, metadata, backend)
+        except (KeyError, TypeError, IndexError):
+            raise ValueError(f"'{path}' is not a session snapshot.") from None
+
+
+def _restore(path: str, file: BinaryIO, metadata: dict, backend: Backend) -> Tuple[History, Workspace]:
+    """
+    Restore the history and workspace of a snapshot whose metadata has been read (see load_session).
+    """
+    if metadata["backend"] != backend.name:
+        raise ValueError(
+            f"'{path}' was saved by a session with the {metadata['backend']} backend; "
+            f"start the calculator with --backend {metadata['backend']} to load it."
+        )
+    _check_operations(metadata)
+    if "history" in metadata:
+        history = History(exact=True)
+        parse = backend.parse
+        history.extend(
+            (operation, parse(a), parse(b), parse(result)) for operation, a, b, result in metadata["history"]
+        )
+    else:
+        try:
+            columns = read_columns(file)
+        except ValueError:
+            raise ValueError(f"'{path}' is not a session snapshot.") from None
+        history = History.from_columns(*columns)
+    return history, Workspace.from_records(metadata["variables"], backend)
+
+
+def _check_operations(metadata: dict) -> None:
+    """
+    Raise a ValueError naming the operations of the snapshot's variables that are not registered here.
+    (Operations used by the history are checked when its codes are translated.)
+    """
+    used = {record["operation"] for record in metadata["variables"] if record["operation"] is not None}
+    missing: List[str] = []
+    for operation in sorted(used):
+        try:
+            CalculatorFactory.get_calculator_class(operation)
+        except ValueError:
+            missing.append(operation)
+    if missing:
+        raise ValueError(f"The snapshot uses operations that are not registered: {', '.join(missing)}.")
@@ -0,0 +1,128 @@
+"""
+This module provides lightweight per-operation counters and latency histograms.
+
+The CalculatorFactory keeps one OperationStats object per operation type. It counts how many
+calculations were created, executed and failed (for example ZeroDivisionError from DivideCalculator),
+and records each execution latency in a histogram with fixed bucket bounds.
+
+Why fixed buckets instead of storing every latency?
+-Recording a latency is one bisect and one integer increment, and memory use never grows.
+-Percentiles (p50/p95/p99) can still be estimated from the bucket counts at any time.
+"""
+
+from bisect import bisect_left
+from typing import Dict
+
+# Upper bounds of the latency buckets, in nanoseconds. Latencies above the last bound go to an overflow bucket.
+BUCKET_BOUNDS_NS = (
+    250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000,
+    100_000, 250_000, 500_000, 1_000_000, 10_000_000, 100_000_000,
+)
+
+
+class OperationStats:
+    """
+    Counters and a latency histogram for one operation.
+
+    Attributes:
+        creations (int): Calculations created through the factory.
+        executions (int): Successful executions.
+        errors (int): Executions that raised an exception.
+        buckets (list): Execution counts per latency bucket (see BUCKET_BOUNDS_NS), plus an overflow bucket.
+        total_ns (int): Sum of all recorded latencies.
+        max_ns (int): Largest recorded latency.
+
+    Methods:
+        observe(latency_ns: int) -> None: Record one successful execution.
+        merge(other: OperationStats) -> None: Add the counts of another OperationStats (e.g., another thread's).
+        percentile(p: float) -> int: Estimate a latency percentile from the histogram.
+        snapshot() -> dict: Return the counters and p50/p95/p99 as a plain dictionary.
+    """
+
+    def __init__(self) -> None:
+        self.creations: int = 0
+        self.executions: int = 0
+        self.errors: int = 0
+        self.buckets: list = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+
+    def observe(self, latency_ns: int) -> None:
+        """
+        Record one successful execution that took latency_ns nanoseconds.
+        """
+        self.executions += 1
+        self.total_ns += latency_ns
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+        self.buckets[bisect_left(BUCKET_BOUNDS_NS, latency_ns)] += 1
+
+    def merge(self, other: "OperationStats") -> None:
+        """
+        Add the counters and histogram of other to this one.
+        """
+        self.creations += other.creations
+        self.executions += other.executions
+        self.errors += other.errors
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, p: float) -> int:
+        """
+        Estimate the p-th percentile latency (0 < p <= 100) in nanoseconds.
+        The estimate is the upper bound of the bucket holding that percentile, so it never under-reports;
+        for the overflow bucket the largest recorded latency is used. Returns 0 if nothing was recorded.
+        """
+        recorded = sum(self.buckets)
+        if recorded == 0:
+            return 0
+        rank = p / 100 * recorded
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_NS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ns)
+        return self.max_ns
+
+    def snapshot(self) -> dict:
+        """
+        Return the counters and the p50/p95/p99 latencies (in nanoseconds) as a dictionary.
+        """
+        return {
+            "creations": self.creations,
+            "executions": self.executions,
+            "errors": self.errors,
+            "mean_ns": self.total_ns / self.executions if self.executions else 0,
+            "p50_ns": self.percentile(50),
+            "p95_ns": self.percentile(95),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max_ns,
+        }
+
+
+def format_ns(latency_ns: float) -> str:
+    """
+    Format a latency in the most readable unit (ns, us, ms or s).
+    """
+    if latency_ns < 1_000:
+        return f"{latency_ns:.0f}ns"
+    if latency_ns < 1_000_000:
+        return f"{latency_ns / 1_000:.1f}us"
+    if latency_ns < 1_000_000_000:
+        return f"{latency_ns / 1_000_000:.1f}ms"
+    return f"{latency_ns / 1_000_000_000:.2f}s"
+
+
+def format_table(stats: Dict[str, dict]) -> str:
+    """
+    Format snapshots (operation -> snapshot) as a text table with one row per operation.
+    """
+    header = f"{'operation':<12}{'created':>9}{'executed':>10}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}"
+    rows = [header]
+    for operation, snapshot in sorted(stats.items()):
+        rows.append(
+            f"{operation:<12}{snapshot['creations']:>9}{snapshot['executions']:>10}{snapshot['errors']:>8}"
+            f"{format_ns(snapshot['p50_ns']):>10}{format_ns(snapshot['p95_ns']):>10}{format_ns(snapshot['p99_ns']):>10}"
+        )
+    return "\n".join(rows)
@@ -0,0 +1,286 @@
+"""
+This module provides named variables for the REPL, such as
+
+    x = add 5 3
+    y = multiply x 2
+    z = subtract y 1
+
+Every variable is a node holding the Calculation that defines it, and its operands are numbers or other
+variables. Together the variables form a dependency graph, like the cells of a spreadsheet: when x is
+reassigned, y and z are recomputed from the new value of x.
+
+Why recompute incrementally?
+-Only the transitive dependents of a reassigned variable can change, so every other variable keeps its
+memoized result, and a tweak to one variable costs as much as the chain that actually depends on it.
+-A dependent whose inputs end up with the same values as before is not recomputed either, so a change
+stops spreading as soon as it no longer makes a difference.
+
+An assignment is all or nothing: if any affected calculation fails (for example, a division by zero
+further down the chain), the error is raised and every variable keeps its previous definition and value.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from app.calculation import CalculatorFactory, Calculation
+
+if TYPE_CHECKING:
+    from app.backends import Backend
+
+# REPL commands that cannot be used as variable names.
+RESERVED_NAMES = frozenset({"help", "history", "stats", "vars", "export", "save", "load", "exit", "sum"})
+
+# An operand of a variable: a number, or the name of another variable.
+Operand = Union[str, float]
+
+
+class Variable:
+    """
+    A named node of the dependency graph.
+
+    Attributes:
+        name (str): The variable name.
+        operation (str): The operation type, or None for a constant such as "x = 5".
+        operands (tuple): The operands; numbers, or names (str) of the variables this one depends on.
+        calculation (Calculation): The calculation with the current operand values (None for a constant).
+        value (float): The current value.
+
+    Methods:
+        dependencies() -> list: Return the names of the variables this one depends on.
+        __str__() -> str: Return the definition and value, e.g. "y = multiply x 2 = 16.0".
+    """
+
+    __slots__ = ("name", "operation", "operands", "calculation", "value")
+
+    def __init__(self, name: str, operation: Optional[str], operands: Tuple[Operand, ...]) -> None:
+        self.name = name
+        self.operation = operation
+        self.operands = operands
+        self.calculation: Optional[Calculation] = None
+        self.value = None
+
+    def dependencies(self) -> List[str]:
+        return [operand for operand in self.operands if isinstance(operand, str)]
+
+    def __str__(self) -> str:
+        if self.operation is None:
+            return f"{self.name} = {self.value}"
+        operands = " ".join(map(str, self.operands))
+        return f"{self.name} = {self.operation} {operands} = {self.value}"
+
+    def __repr__(self) -> str:
+        return f"Variable({self.name!r}, {self.operation!r}, {self.operands!r})"
+
+
+class Workspace:
+    """
+    The variables of a session and the dependency graph between them.
+
+    Attributes:
+        backend (Backend): Optional numeric backend used to parse numbers and run calculations (floats by default).
+        _variables (dict): Every variable, by name.
+        _dependents (dict): For each name, the variables that use it directly (kept in assignment order).
+
+    Methods:
+        assign(name, operation, operands) -> list: Define a variable and return the names of the recomputed dependents.
+        define(source: str) -> tuple: Parse and assign a line such as "x = add 5 3".
+        to_records() -> list: Return the variables as plain data (numbers as text), e.g. for a session snapshot.
+        from_records(records, backend) -> Workspace: Rebuild a workspace without recomputing it (class method).
+        __getitem__(name) -> Variable: Return a variable.
+        __contains__(name) -> bool, __len__() -> int, __iter__() -> Iterator[Variable].
+    """
+
+    def __init__(self, backend: Optional["Backend"] = None) -> None:
+        if backend is None:
+            # Imported here so that importing this module does not load decimal and fractions.
+            from app.backends import Backend
+            backend = Backend()
+        self.backend = backend
+        self._variables: Dict[str, Variable] = {}
+        self._dependents: Dict[str, Dict[str, None]] = {}
+
+    def assign(self, name: str, operation: Optional[str], operands: Sequence[Operand]) -> List[str]:
+        """
+        Define (or redefine) a variable and recompute what depends on it.
+
+        Parameters:
+            name (str): The variable name.
+            operation (str): The operation type, or None to assign the single operand as a constant.
+            operands (Sequence): Two operands (one for a constant); numbers or names of defined variables.
+        Returns:
+            list: The names of the dependents that were recomputed, in the order they were recomputed.
+        Raises:
+            ValueError: If the name is invalid, an operand is undefined, the assignment would create a cycle,
+                or the operation is not supported.
+            ZeroDivisionError: If the variable or one of its dependents divides by zero.
+        """
+        # LBYL: validate the whole assignment before anything is computed or changed.
+        if not name.isidentifier():
+            raise ValueError(f"Invalid variable name '{name}'.")
+        if name in RESERVED_NAMES or CalculatorFactory.is_registered(name):
+            raise ValueError(f"'{name}' is a command or operation and cannot be a variable name.")
+        variable = Variable(name, operation, tuple(operands))
+        for dependency in variable.dependencies():
+            if dependency not in self._variables:
+                raise ValueError(f"Variable '{dependency}' is not defined.")
+        affected = self._affected(name) if name in self._variables else []
+        if name in variable.dependencies() or not set(affected).isdisjoint(variable.dependencies()):
+            raise ValueError(f"Variable '{name}' cannot depend on itself.")
+
+        # Compute every new value first, and only then store them, so a failure changes nothing.
+        updates = {name: variable}
+        self._evaluate(variable, updates)
+        previous = self._variables.get(name)
+        changed = {name} if previous is None or previous.value != variable.value else set()
+        recomputed = []
+        for dependent_name in affected:
+            dependent = self._variables[dependent_name]
+            if changed.isdisjoint(dependent.dependencies()):
+                continue  # its inputs have the same values as before: keep the memoized result
+            copy = Variable(dependent.name, dependent.operation, dependent.operands)
+            self._evaluate(copy, updates)
+            updates[dependent_name] = copy
+            recomputed.append(dependent_name)
+            if copy.value != dependent.value:
+                changed.add(dependent_name)
+
+        if previous is not None:
+            for dependency in previous.dependencies():
+                self._dependents[dependency].pop(name, None)
+        for dependency in variable.dependencies():
+            self._dependents.setdefault(dependency, {})[name] = None
+        self._variables.update(updates)
+        return recomputed
+
+    def define(self, source: str) -> Tuple[Variable, List[str]]:
+        """
+        Parse and assign a line of the form "<name> = <operation> <operand> <operand>" or "<name> = <number>".
+        Operands that are not numbers are variable names.
+
+        Returns:
+            tuple: The assigned variable and the names of the recomputed dependents.
+        Raises:
+            ValueError: If the line is not a valid assignment, or see assign.
+        """
+        name, _, expression = source.partition("=")
+        tokens = expression.split()
+        if len(tokens) == 1:
+            operation, operand_tokens = None, tokens
+        elif len(tokens) == 3:
+            operation, operand_tokens = tokens[0], tokens[1:]
+        else:
+            raise ValueError("Invalid assignment. Use: <name> = <operation> <operand> <operand> or <name> = <number>.")
+        operands = [self._parse_operand(token) for token in operand_tokens]
+        name = name.strip()
+        recomputed = self.assign(name, operation, operands)
+        return self._variables[name], recomputed
+
+    def to_records(self) -> List[dict]:
+        """
+        Return every variable as a dict of plain data: its name, operation, operands and value.
+        Numbers are kept as text (str of the number), so Decimal and Fraction values are not rounded;
+        operands that are variables are written as {"variable": name}.
+        """
+        return [
+            {
+                "name": variable.name,
+                "operation": variable.operation,
+                "operands": [
+                    {"variable": operand} if isinstance(operand, str) else {"number": str(operand)}
+                    for operand in variable.operands
+                ],
+                "value": str(variable.value),
+            }
+            for variable in self
+        ]
+
+    @classmethod
+    def from_records(cls, records: List[dict], backend: Optional["Backend"] = None) -> "Workspace":
+        """
+        Rebuild a workspace from the output of to_records. The stored values are attached to the
+        rebuilt calculations, so nothing is recomputed.
+
+        Raises:
+            ValueError: If a number is invalid or an operation is not supported.
+        """
+        workspace = cls(backend)
+        parse = workspace.backend.parse
+        for record in records:
+            operands = tuple(
+                operand["variable"] if "variable" in operand else parse(operand["number"])
+                for operand in record["operands"]
+            )
+            variable = Variable(record["name"], record["operation"], operands)
+            variable.value = parse(record["value"])
+            workspace._variables[variable.name] = variable
+            for dependency in variable.dependencies():
+                workspace._dependents.setdefault(dependency, {})[variable.name] = None
+        # A variable may depend on one defined after it, so operand values are resolved once all are known.
+        for variable in workspace:
+            if variable.operation is not None:
+                values = [workspace._variables[operand].value if isinstance(operand, str) else operand
+                          for operand in variable.operands]
+                # Restoring is not new work, so the calculation is not counted as a creation in the statistics.
+                variable.calculation = CalculatorFactory.get_calculator_class(variable.operation)(*values)
+                variable.calculation.result = variable.value
+        return workspace
+
+    def _parse_operand(self, token: str) -> Operand:
+        """
+        Convert an operand token into a number, or keep it as a variable name.
+        """
+        try:
+            return self.backend.parse(token)
+        except ValueError:
+            if token.isidentifier():
+                return token
+            raise ValueError(f"Invalid operand '{token}'.") from None
+
+    def _evaluate(self, variable: Variable, updates: Dict[str, Variable]) -> None:
+        """
+        Set the calculation and value of a variable, reading its operands from updates first.
+        """
+        values = [
+            (updates.get(operand) or self._variables[operand]).value if isinstance(operand, str) else operand
+            for operand in variable.operands
+        ]
+        if variable.operation is None:
+            variable.value = values[0]
+            return
+        calculation = CalculatorFactory.create_calculator(variable.operation, *values)
+        with self.backend.context():
+            variable.value = calculation.result
+        variable.calculation = calculation
+
+    def _affected(self, name: str) -> List[str]:
+        """
+        Return the transitive dependents of a variable in topological order, so that every variable
+        comes after all the variables it depends on. The graph is walked iteratively, so long chains
+        do not hit the recursion limit.
+        """
+        order = []
+        visited = {name}
+        stack = [(name, iter(self._dependents.get(name, ())))]
+        while stack:
+            current, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(self._dependents.get(child, ()))))
+                    break
+            else:
+                # Every dependent of current is finished: current goes before all of them.
+                stack.pop()
+                order.append(current)
+        order.reverse()
+        return order[1:]
+
+    def __getitem__(self, name: str) -> Variable:
+        return self._variables[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._variables
+
+    def __len__(self) -> int:
+        return len(self._variables)
+
+    def __iter__(self) -> Iterator[Variable]:
+        return iter(self._variables.values())
@@ -0,0 +1,110 @@
+"""
+This module provides element-wise vector operands for the REPL and batch mode.
+
+A vector operand is written either inline as comma-separated numbers ("1,2,3") or as "@path", a file
+of packed little-endian doubles (the same number encoding as app.protocol). A command such as
+
+    add 1,2,3 4,5,6        ->  5.0,7.0,9.0
+    multiply @a.bin 2      ->  every value of a.bin doubled
+
+is evaluated element-wise in one CalculatorFactory.evaluate_batch call over array('d') buffers, instead
+of one REPL line (with its parsing, dispatch and printing) per element. A single value, on either side,
+is broadcast to the length of the other operand.
+"""
+
+import sys
+from array import array
+from typing import List, NamedTuple, Optional
+from app.calculation import CalculatorFactory
+
+# Prefix of an operand that names a file of packed doubles.
+FILE_PREFIX = "@"
+
+# Separator of inline vector values.
+SEPARATOR = ","
+
+
+class VectorCommand(NamedTuple):
+    """
+    A command with at least one vector operand. The operands are kept as text until evaluation,
+    so that files are only read (and errors only reported) when the command is evaluated.
+    """
+    operation: str
+    a: str
+    b: str
+
+
+def is_vector_command(parts: List[str]) -> bool:
+    """
+    Return True if the tokens of a line form '<operation> <operand> <operand>' with at least one vector operand.
+    """
+    return len(parts) == 3 and any(SEPARATOR in token or token.startswith(FILE_PREFIX) for token in parts[1:])
+
+
+def parse_operand(token: str, allow_files: bool = True) -> array:
+    """
+    Convert an operand into an array('d').
+
+    Parameters:
+        token (str): "@path", comma-separated numbers, or a single number.
+        allow_files (bool): Whether "@path" operands may be read (servers turn this off for remote input).
+    Raises:
+        ValueError: If a number is invalid, or the file cannot be read or does not hold packed doubles.
+    """
+    if not token.startswith(FILE_PREFIX):
+        try:
+            return array("d", map(float, token.split(SEPARATOR)))
+        except ValueError:
+            raise ValueError(f"Invalid vector operand '{token}'.") from None
+
+    path = token[len(FILE_PREFIX):]
+    if not allow_files:
+        raise ValueError("File operands are not allowed here.")
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError as e:
+        raise ValueError(f"Cannot read vector file '{path}': {e.strerror}.") from None
+    if len(data) % 8:
+        raise ValueError(f"Vector file '{path}' does not contain packed doubles.")
+    values = array("d")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()  # the file is little-endian
+    return values
+
+
+def evaluate_vector(command: VectorCommand, allow_files: bool = True) -> array:
+    """
+    Evaluate a vector command element-wise and return the results.
+
+    Raises:
+        ValueError: If an operand is invalid, the operation is not supported, or the operands have
+            different lengths and neither is a single value.
+        ZeroDivisionError: If any element divides by zero.
+    """
+    a_values = parse_operand(command.a, allow_files)
+    b_values = parse_operand(command.b, allow_files)
+
+    # Broadcasting: a single value is repeated to the length of the other operand.
+    # Repeating an array is one C-level copy, so the batch loop stays the same for every shape.
+    if len(a_values) == 1 and len(b_values) > 1:
+        a_values = a_values * len(b_values)
+    elif len(b_values) == 1 and len(a_values) > 1:
+        b_values = b_values * len(a_values)
+    elif len(a_values) != len(b_values):
+        raise ValueError("Vector operands must have the same length, or one of them a single value.")
+    return CalculatorFactory.evaluate_batch(command.operation, a_values, b_values)
+
+
+def format_vector(values: array, limit: Optional[int] = None) -> str:
+    """
+    Format results as comma-separated numbers, the same syntax as inline vector operands.
+    With a limit, longer vectors show only their first and last values and their length.
+    """
+    if limit is not None and len(values) > limit:
+        half = limit // 2
+        head = SEPARATOR.join(map(str, values[:half]))
+        tail = SEPARATOR.join(map(str, values[-half:]))
+        return f"{head},...,{tail} ({len(values)} values)"
+    return SEPARATOR.join(map(str, values))
@@ -1,11 +1,156 @@
 """Main entry point for the calculator application.
-This script initializes the calculator REPL and starts the application.
+This script starts the calculator REPL, or runs batch mode when --batch is given.
+
+Usage:
+    python main.py                  # interactive REPL
+    python main.py --batch FILE     # evaluate '<operation> <num1> <num2>' lines from FILE
+    python main.py --batch -        # same, reading from standard input
+    python main.py --batch FILE --workers 8   # split FILE into chunks and evaluate them in 8 processes
+    python main.py --serve 8765     # serve the same line protocol over TCP (or --serve unix:/path)
+    python main.py --batch FILE --binary      # read request frames of app.protocol instead of text lines
+    python main.py --history-file FILE        # keep the REPL history in a durable log across sessions
+    python main.py --batch FILE --startup-profile   # report which imports the command spends its start-up time on
+    python main.py --backend decimal --precision 50  # compute with Decimal (or --backend fraction) instead of floats
+
+Each mode imports its modules only when it is selected, so a short batch run never pays for
+asyncio (server), concurrent.futures (parallel batch) or readline (interactive REPL).
 """
 
-from app.calculator import calculator
+import argparse
+import sys
+
+
+def main(argv=None) -> None:
+    """
+    Parse the command-line arguments and start the requested mode.
+    """
+    parser = argparse.ArgumentParser(description="Command-line calculator.")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="evaluate '<operation> <num1> <num2>' lines from FILE ('-' for stdin) without prompts",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="with --batch FILE, memory-map FILE and evaluate it in N worker processes",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help="serve the '<operation> <num1> <num2>' line protocol on PORT, HOST:PORT or unix:PATH",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="with --batch or --serve, use the length-prefixed binary frame format instead of text lines",
+    )
+    parser.add_argument(
+        "--history-file",
+        metavar="PATH",
+        help="append REPL calculations to a durable log at PATH and reload it on start",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("float", "decimal", "fraction"),
+        default="float",
+        help="number type of the REPL or --batch run (default: float)",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        metavar="DIGITS",
+        help="with --backend decimal, the number of significant digits (default: 28)",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="run the command under 'python -X importtime' and report the slowest imports instead of its output",
+    )
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and (args.batch is None or args.batch == "-"):
+        parser.error("--workers requires --batch with a file path")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers is not None and args.binary:
+        parser.error("--workers cannot be combined with --binary")
+    if args.startup_profile and args.serve is not None:
+        parser.error("--startup-profile cannot be combined with --serve")
+    if args.precision is not None and args.backend != "decimal":
+        parser.error("--precision requires --backend decimal")
+    exact = args.backend != "float"
+    if exact and (args.serve is not None or args.binary or args.workers is not None):
+        parser.error("--backend decimal/fraction only applies to the REPL and --batch")
+    if exact and args.history_file is not None:
+        parser.error("--history-file stores floats and cannot be combined with --backend decimal/fraction")
+
+    # Float runs pass no backend at all, so they keep the plain float code paths.
+    backend = None
+    if exact and not args.startup_profile:
+        from app.backends import get_backend
+        try:
+            backend = get_backend(args.backend, args.precision)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.startup_profile:
+        # Profile mode: run the same command again in a child interpreter and report its imports.
+        from app.bench import startup_profile
+        command = [arg for arg in (sys.argv[1:] if argv is None else argv) if arg != "--startup-profile"]
+        print(startup_profile(command))
+    elif args.serve is not None:
+        # Server mode: run until interrupted.
+        import asyncio
+        from app.server import serve
+        try:
+            asyncio.run(serve(args.serve, binary=args.binary))
+        except KeyboardInterrupt:
+            pass
+    elif args.batch is not None:
+        # EAFP: open the command file in the batch mode itself, and report it if it cannot be read.
+        try:
+            run_batch_mode(args, backend)
+        except OSError as e:
+            parser.error(f"cannot read '{e.filename or args.batch}': {e.strerror}")
+        except ValueError as e:
+            # A truncated or oversized frame in --binary mode ends the run.
+            parser.error(f"'{args.batch}': {e}")
+    else:
+        # Start the calculator REPL
+        from app.calculator import calculator
+        history_file = args.history_file
+        if history_file is not None:
+            # EAFP: open the log here, so a path that is not a history log is reported like a bad argument.
+            from app.history import HistoryLog
+            try:
+                history_file = HistoryLog(history_file)
+            except OSError as e:
+                parser.error(f"cannot open '{e.filename or history_file}': {e.strerror}")
+            except ValueError as e:
+                parser.error(str(e))
+        calculator(history_file=history_file, backend=backend)
+
+
+def run_batch_mode(args: argparse.Namespace, backend) -> None:
+    """
+    Run the batch mode selected by --batch, --binary and --workers.
+    """
+    if args.binary:
+        # Binary batch mode: one response frame per request frame.
+        from app.protocol import run_binary_batch
+        run_binary_batch(args.batch)
+    elif args.workers is not None:
+        # Parallel batch mode: the output order still matches the input order.
+        from app.batch import run_batch_parallel
+        run_batch_parallel(args.batch, sys.stdout, workers=args.workers)
+    else:
+        # Batch mode: no prompts, one result line per command.
+        from app.batch import run_batch
+        run_batch(args.batch, sys.stdout, backend)
+
 
 # This is the main entry point for the calculator application.
 if __name__ == "__main__":
-    # Start the calculator REPL
-    calculator()
-
+    main()
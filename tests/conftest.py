@@ -0,0 +1,17 @@
+"""
+Fixtures shared by the test modules.
+"""
+
+import pytest
+from app.calculation import CalculatorFactory
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    """
+    Fixture that gives each test its own copy of the CalculatorFactory registry,
+    so the operations a test registers are gone when it ends.
+    """
+    for name in ("_calculation", "_operation_codes", "_functions", "_lazy"):
+        monkeypatch.setattr(CalculatorFactory, name, dict(getattr(CalculatorFactory, name)))
+    monkeypatch.setattr(CalculatorFactory, "_operation_names", list(CalculatorFactory._operation_names))
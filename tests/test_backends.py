@@ -0,0 +1,198 @@
+"""
+Tests for the numeric backends module.
+
+These tests check that each backend parses operands into its own number type and
+computes with the registered calculators, raising the same errors as the float path.
+"""
+
+import decimal
+import pytest
+from decimal import Decimal
+from fractions import Fraction
+from app.backends import Backend, DecimalBackend, FractionBackend, get_backend
+from app.calculation import CalculatorFactory
+
+
+@pytest.mark.parametrize("name, expected_type", [
+    ("float", Backend),
+    ("decimal", DecimalBackend),
+    ("fraction", FractionBackend),
+])
+def test_get_backend(name, expected_type):
+    """
+    Test that get_backend returns the backend with the given name.
+    """
+    # Act
+    backend = get_backend(name)
+
+    # Assert
+    assert type(backend) is expected_type
+    assert backend.name == name
+
+
+@pytest.mark.parametrize("name, precision, message", [
+    ("complex", None, "Backend 'complex' is not supported."),
+    ("fraction", 10, "Precision only applies to the decimal backend."),
+    ("decimal", 0, "Precision must be at least 1."),
+])
+def test_get_backend_invalid(name, precision, message):
+    """
+    Test that unknown backends and invalid precisions raise ValueError.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        get_backend(name, precision)
+    assert message in str(e.value)
+
+
+@pytest.mark.parametrize("name, text, expected", [
+    ("float", "0.1", 0.1),
+    ("decimal", "0.1", Decimal("0.1")),
+    ("fraction", "0.1", Fraction(1, 10)),
+    ("fraction", "1/3", Fraction(1, 3)),
+])
+def test_backend_parse(name, text, expected):
+    """
+    Test that each backend parses operands into its own number type.
+    """
+    # Act
+    value = get_backend(name).parse(text)
+
+    # Assert
+    assert value == expected
+    assert type(value) is type(expected)
+
+
+@pytest.mark.parametrize("name, text", [
+    ("float", "abc"),
+    ("decimal", "abc"),
+    ("fraction", "abc"),
+    ("fraction", "1/0"),
+])
+def test_backend_parse_invalid(name, text):
+    """
+    Test that invalid operands raise ValueError for every backend.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError):
+        get_backend(name).parse(text)
+
+
+def test_decimal_backend_precision():
+    """
+    Test that the decimal backend rounds results to its precision without changing the global context.
+    """
+    # Arrange
+    backend = get_backend("decimal", precision=5)
+    one, three = backend.parse("1"), backend.parse("3")
+
+    # Act
+    result = backend.compute("divide", one, three)
+
+    # Assert
+    assert result == Decimal("0.33333")
+    assert one / three == Decimal("0.3333333333333333333333333333")  # default context untouched
+
+
+@pytest.mark.parametrize("name, operation, a, b, expected", [
+    ("float", "add", "0.1", "0.2", 0.30000000000000004),
+    ("decimal", "add", "0.1", "0.2", Decimal("0.3")),
+    ("fraction", "add", "0.1", "0.2", Fraction(3, 10)),
+    ("fraction", "divide", "1", "3", Fraction(1, 3)),
+    ("fraction", "multiply", "2/3", "3", Fraction(2)),
+])
+def test_backend_compute(name, operation, a, b, expected):
+    """
+    Test that each backend computes exactly with the registered calculators.
+    """
+    # Arrange
+    backend = get_backend(name)
+
+    # Act
+    result = backend.compute(operation, backend.parse(a), backend.parse(b))
+
+    # Assert
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+@pytest.mark.parametrize("name", ["float", "decimal", "fraction"])
+def test_backend_compute_errors(name):
+    """
+    Test that backends raise the same errors as the float path.
+    """
+    # Arrange
+    backend = get_backend(name)
+    one, zero = backend.parse("1"), backend.parse("0")
+
+    # Act & Assert
+    with pytest.raises(ZeroDivisionError) as e:
+        backend.compute("divide", one, zero)
+    assert str(e.value) == "Cannot divide by zero."
+    with pytest.raises(ValueError) as e:
+        backend.compute("modulus", one, one)
+    assert "Operation 'modulus' is not supported." in str(e.value)
+
+
+@pytest.mark.parametrize("operation, a, b, message", [
+    ("multiply", "inf", "0", "The result is undefined for these operands (for example, inf * 0)."),
+    ("add", "1e999999999", "1e999999999", "The result is too large for the decimal backend (precision 5)."),
+])
+def test_decimal_backend_describes_signals(operation, a, b, message):
+    """
+    Test that Decimal signals raised by a calculation are ArithmeticErrors with a readable description.
+    """
+    # Arrange
+    backend = get_backend("decimal", 5)
+
+    # Act
+    with pytest.raises(ArithmeticError) as e:
+        backend.compute(operation, backend.parse(a), backend.parse(b))
+
+    # Assert
+    assert backend.describe(e.value) == message
+    assert backend.describe(decimal.Clamped()) == "Decimal arithmetic signalled Clamped."
+    assert backend.describe(OverflowError("too large")) == "too large"
+    assert get_backend("float").describe(OverflowError("too large")) == "too large"
+
+
+def test_result_cache_keeps_backends_apart():
+    """
+    Test that equal operands of different number types do not share cached results.
+    """
+    # Arrange
+    CalculatorFactory.enable_result_cache(maxsize=8)
+    try:
+        # Act
+        as_float = CalculatorFactory.create_calculator("divide", 1.0, 2.0).result
+        as_fraction = CalculatorFactory.create_calculator("divide", Fraction(1), Fraction(2)).result
+    finally:
+        CalculatorFactory.disable_result_cache()
+
+    # Assert
+    assert type(as_float) is float
+    assert type(as_fraction) is Fraction
+
+
+def test_result_cache_and_pool_keep_decimal_precisions_apart():
+    """
+    Test that Decimal results computed with different precisions are never shared through the cache or the pool.
+    """
+    # Arrange
+    short, long = get_backend("decimal", 5), get_backend("decimal", 10)
+    one, three = Decimal(1), Decimal(3)
+    CalculatorFactory.enable_result_cache(maxsize=8)
+    CalculatorFactory.enable_instance_pool(maxsize=8)
+    try:
+        # Act
+        with short.context():
+            rounded_short = CalculatorFactory.create_calculator("divide", one, three).result
+        with long.context():
+            rounded_long = CalculatorFactory.create_calculator("divide", one, three).result
+    finally:
+        CalculatorFactory.disable_result_cache()
+        CalculatorFactory.disable_instance_pool()
+
+    # Assert
+    assert rounded_short == Decimal("0.33333")
+    assert rounded_long == Decimal("0.3333333333")
@@ -0,0 +1,402 @@
+"""
+Tests for the batch module of the application.
+
+These tests check each stage of the batch pipeline and the run_batch entry point.
+"""
+
+import mmap
+import pytest
+from io import StringIO
+import app.batch
+from app.backends import get_backend
+from app.batch import (
+    INVALID_INPUT,
+    _evaluate_chunk,
+    _init_worker,
+    evaluate_commands,
+    evaluate_line,
+    parse_commands,
+    run_batch,
+    run_batch_parallel,
+    split_chunks,
+    write_results,
+)
+
+
+def test_parse_commands_valid_and_invalid():
+    """
+    Test that parse_commands converts valid lines, skips blank lines and marks malformed ones.
+    """
+    # Arrange
+    lines = ["add 5 3\n", "\n", "  DIVIDE 8 2  \n", "add 5\n", "add five three\n", "Modulus 5 3\n"]
+
+    # Act
+    commands = list(parse_commands(lines))
+
+    # Assert
+    assert commands == [("add", 5.0, 3.0), ("divide", 8.0, 2.0), INVALID_INPUT, INVALID_INPUT, ("modulus", 5.0, 3.0)]
+
+
+def test_evaluate_commands():
+    """
+    Test that evaluate_commands yields results and error lines in input order.
+    """
+    # Arrange
+    commands = [("add", 5.0, 3.0), INVALID_INPUT, ("divide", 8.0, 0.0), ("modulus", 5.0, 3.0), ("multiply", 2.0, 3.0)]
+
+    # Act
+    results = list(evaluate_commands(commands))
+
+    # Assert
+    assert results == [
+        "8.0",
+        "error: Invalid input. Please follow the format: <operation> <num1> <num2>",
+        "error: Cannot divide by zero.",
+        "error: Operation 'modulus' is not supported.",
+        "6.0",
+    ]
+
+
+def test_write_results():
+    """
+    Test that write_results writes one line per result and returns the count.
+    """
+    # Arrange
+    output = StringIO()
+
+    # Act
+    count = write_results(iter(["8.0", "6.0"]), output)
+
+    # Assert
+    assert count == 2
+    assert output.getvalue() == "8.0\n6.0\n"
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("add 5 3", "8.0"),
+    ("subtract 10 4", "6.0"),
+    ("", None),
+    ("divide 1 0", "error: Cannot divide by zero."),
+])
+def test_evaluate_line(line, expected):
+    """
+    Parameterized test for evaluating a single line.
+    """
+    assert evaluate_line(line) == expected
+
+
+def test_run_batch_file(tmp_path):
+    """
+    Test run_batch reading commands from a file.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_text("add 5 3\nmultiply 2 3\n\ndivide 8 2\n")
+    output = StringIO()
+
+    # Act
+    count = run_batch(str(path), output)
+
+    # Assert
+    assert count == 3
+    assert output.getvalue() == "8.0\n6.0\n4.0\n"
+
+
+@pytest.mark.parametrize("backend_name, expected", [
+    ("decimal", "0.3\n0.3333333333\nerror: Cannot divide by zero.\nerror: Invalid input. Please follow the format: <operation> <num1> <num2>\n"),
+    ("fraction", "3/10\n1/3\nerror: Cannot divide by zero.\nerror: Invalid input. Please follow the format: <operation> <num1> <num2>\n"),
+])
+def test_run_batch_with_backend(tmp_path, backend_name, expected):
+    """
+    Test run_batch computing with a Decimal or Fraction backend instead of floats.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_text("add 0.1 0.2\n\nDIVIDE 1 3\ndivide 1 0\nadd 1\n")
+    output = StringIO()
+    backend = get_backend(backend_name, 10 if backend_name == "decimal" else None)
+
+    # Act
+    count = run_batch(str(path), output, backend)
+
+    # Assert
+    assert count == 4
+    assert output.getvalue() == expected
+
+
+def test_run_batch_decimal_signals(tmp_path):
+    """
+    Test that Decimal signals such as InvalidOperation and Overflow fail their own line, not the whole run.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_text("add 1 2\nmultiply inf 0\nadd 1e999999999 1e999999999\nadd 3 4\n")
+    output = StringIO()
+
+    # Act
+    count = run_batch(str(path), output, get_backend("decimal", 5))
+
+    # Assert
+    assert count == 4
+    assert output.getvalue().splitlines() == [
+        "3",
+        "error: The result is undefined for these operands (for example, inf * 0).",
+        "error: The result is too large for the decimal backend (precision 5).",
+        "7",
+    ]
+
+
+def test_parse_commands_with_backend_invalid_number():
+    """
+    Test that numbers the backend cannot parse are reported as invalid input.
+    """
+    # Act
+    commands = list(parse_commands(["add x 1\n", "add 1/2 1\n"], get_backend("fraction")))
+
+    # Assert
+    assert commands[0] is INVALID_INPUT
+    assert commands[1][0] == "add"
+
+
+def test_run_batch_vector_commands(tmp_path):
+    """
+    Test that batch mode evaluates vector operands element-wise, between ordinary commands.
+    """
+    # Arrange
+    import struct
+    (tmp_path / "values.bin").write_bytes(struct.pack("<3d", 1.0, 2.0, 3.0))
+    path = tmp_path / "commands.txt"
+    path.write_text(f"add 1,2,3 4,5,6\nadd 5 3\nMULTIPLY @{tmp_path}/values.bin 2\nadd 1,2 1,2,3\nadd 1,x 1\n")
+    output = StringIO()
+
+    # Act
+    count = run_batch(str(path), output)
+
+    # Assert
+    assert count == 5
+    assert output.getvalue().splitlines() == [
+        "5.0,7.0,9.0",
+        "8.0",
+        "2.0,4.0,6.0",
+        "error: Vector operands must have the same length, or one of them a single value.",
+        "error: Invalid vector operand '1,x'.",
+    ]
+
+
+def test_run_batch_reduction_commands(tmp_path):
+    """
+    Test that batch mode reduces n-ary lines, between ordinary commands.
+    """
+    # Arrange
+    import struct
+    (tmp_path / "values.bin").write_bytes(struct.pack("<10d", *[0.1] * 10))
+    path = tmp_path / "commands.txt"
+    path.write_text(f"add 1 2 3 4\nadd 5 3\nsum @{tmp_path}/values.bin\ndivide 1 2 0\nadd 1 2 x\n")
+    output = StringIO()
+
+    # Act
+    count = run_batch(str(path), output)
+
+    # Assert
+    assert count == 5
+    assert output.getvalue().splitlines() == [
+        "10.0",
+        "8.0",
+        "1.0",
+        "error: Cannot divide by zero.",
+        "error: Invalid operand 'x'.",
+    ]
+
+
+def test_run_batch_sum_of_two_operands(tmp_path):
+    """
+    Test that "sum a b", which has the shape of a binary command, is reduced instead of rejected.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_text("sum 1 2\nSUM 0.5 0.25\nsum 1 x\n")
+    output = StringIO()
+
+    # Act
+    count = run_batch(str(path), output)
+
+    # Assert
+    assert count == 3
+    assert output.getvalue().splitlines() == ["3.0", "0.75", "error: Invalid operand 'x'."]
+
+
+@pytest.mark.parametrize("backend_name, expected", [
+    ("decimal", ["0.6", "3", "24", "error: Cannot divide by zero."]),
+    ("fraction", ["3/5", "3", "24", "error: Cannot divide by zero."]),
+])
+def test_run_batch_reduction_commands_with_backend(tmp_path, backend_name, expected):
+    """
+    Test that n-ary lines, and sums of two operands, are reduced with the numbers of the backend.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_text("add 0.1 0.2 0.3\nsum 1 2\nmultiply 2 3 4\ndivide 1 2 0\n")
+    output = StringIO()
+
+    # Act
+    count = run_batch(str(path), output, get_backend(backend_name))
+
+    # Assert
+    assert count == 4
+    assert output.getvalue().splitlines() == expected
+
+
+def test_evaluate_line_without_files(tmp_path):
+    """
+    Test that evaluate_line can refuse "@path" operands, as the server does for remote input.
+    """
+    # Arrange
+    path = tmp_path / "values.bin"
+    path.write_bytes(b"\x00" * 8)
+
+    # Act & Assert
+    assert evaluate_line(f"add @{path} 1") == "1.0"
+    assert evaluate_line(f"add @{path} 1", allow_files=False) == "error: File operands are not allowed here."
+
+
+def test_run_batch_stdin(monkeypatch, capsys):
+    """
+    Test run_batch reading commands from standard input and writing to standard output.
+    """
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO("add 1 2\nsubtract 5 3\n"))
+
+    # Act
+    count = run_batch("-")
+
+    # Assert
+    captured = capsys.readouterr()
+    assert count == 2
+    assert captured.out == "3.0\n2.0\n"
+    assert ">>" not in captured.out  # no prompts in batch mode
+
+
+#========== Tests for memory-mapped parallel batch mode ===========
+
+def map_bytes(tmp_path, data):
+    """Helper that writes data to a file and returns a read-only memory map of it."""
+    path = tmp_path / "commands.txt"
+    path.write_bytes(data)
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def test_split_chunks_on_line_boundaries(tmp_path):
+    """
+    Test that every chunk ends after a newline (or at the end of the file).
+    """
+    # Arrange
+    data = b"add 1 2\nsubtract 10 4\nmultiply 2 3\ndivide 8 2"
+    buffer = map_bytes(tmp_path, data)
+
+    # Act
+    chunks = split_chunks(buffer, chunk_size=10)
+
+    # Assert
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == len(data)
+    for (start, end), (next_start, _) in zip(chunks, chunks[1:]):
+        assert end == next_start
+        assert data[end - 1:end] == b"\n"
+    assert b"".join(data[start:end] for start, end in chunks) == data
+
+
+def test_split_chunks_exact_boundary(tmp_path):
+    """
+    Test that a chunk which already ends on a newline is not extended.
+    """
+    # Arrange
+    buffer = map_bytes(tmp_path, b"add 1 2\nadd 3 4\n")
+
+    # Act & Assert
+    assert split_chunks(buffer, chunk_size=8) == [(0, 8), (8, 16)]
+
+
+def test_split_chunks_invalid_size(tmp_path):
+    """
+    Test that a chunk size below one is rejected.
+    """
+    buffer = map_bytes(tmp_path, b"add 1 2\n")
+    with pytest.raises(ValueError) as e:
+        split_chunks(buffer, chunk_size=0)
+    assert "Chunk size must be at least 1." in str(e.value)
+
+
+def test_evaluate_chunk_in_process(tmp_path, monkeypatch):
+    """
+    Test the worker functions directly, in the current process.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_bytes(b"add 1 2\n\ndivide 1 0\nmultiply 2 3")
+    monkeypatch.setattr(app.batch, "_worker_buffer", None)
+    _init_worker(str(path))
+
+    # Act
+    text, count = _evaluate_chunk((0, path.stat().st_size))
+    empty = _evaluate_chunk((8, 9))
+
+    # Assert
+    assert text == "3.0\nerror: Cannot divide by zero.\n6.0\n"
+    assert count == 3
+    assert empty == ("", 0)
+
+
+def test_run_batch_invalid_utf8(tmp_path, monkeypatch):
+    """
+    Test that a line with bytes that are not UTF-8 fails on its own, in run_batch and in the worker functions.
+    """
+    # Arrange
+    path = tmp_path / "commands.txt"
+    path.write_bytes(b"add 1 2\nadd \xff\xfe 2\nadd 3 \xc3\nmultiply 2 3\n")
+    output = StringIO()
+    monkeypatch.setattr(app.batch, "_worker_buffer", None)
+    _init_worker(str(path))
+
+    # Act
+    count = run_batch(str(path), output)
+    text, chunk_count = _evaluate_chunk((0, path.stat().st_size))
+
+    # Assert
+    invalid = "error: Invalid input. Please follow the format: <operation> <num1> <num2>"
+    assert count == chunk_count == 4
+    assert output.getvalue().splitlines() == text.splitlines() == ["3.0", invalid, invalid, "6.0"]
+
+
+def test_run_batch_parallel_matches_run_batch(tmp_path):
+    """
+    Test that parallel batch mode produces the same output, in the same order, as run_batch.
+    """
+    # Arrange
+    lines = [f"{op} {i} {i % 7}" for i in range(200) for op in ("add", "divide", "multiply")]
+    path = tmp_path / "commands.txt"
+    path.write_text("\n".join(lines) + "\n")
+    serial = StringIO()
+    parallel = StringIO()
+    run_batch(str(path), serial)
+
+    # Act
+    count = run_batch_parallel(str(path), parallel, workers=2, chunk_size=256)
+
+    # Assert
+    assert count == len(lines)
+    assert parallel.getvalue() == serial.getvalue()
+
+
+def test_run_batch_parallel_empty_file(tmp_path):
+    """
+    Test that an empty file produces no output.
+    """
+    # Arrange
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    output = StringIO()
+
+    # Act & Assert
+    assert run_batch_parallel(str(path), output) == 0
+    assert output.getvalue() == ""
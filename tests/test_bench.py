@@ -0,0 +1,147 @@
+"""
+Tests for the benchmark suite.
+
+The benchmarks are run with tiny iteration counts; these tests check the plumbing, not the timings.
+"""
+
+import json
+import runpy
+import pytest
+from app.calculation import CalculatorFactory
+from app.bench import compare, main, measure_memory, parse_importtime, report, run_benchmarks, startup_profile
+
+LAYERS = {"operations", "dispatch", "compute", "excute", "str", "parse", "repl_session", "cold_start"}
+
+
+def test_run_benchmarks_covers_every_layer():
+    """
+    Test that every layer is timed and reported as a positive number of nanoseconds.
+    """
+    results = run_benchmarks(number=10, repeat=1)
+    assert set(results) == LAYERS
+    assert all(value > 0 for value in results.values())
+
+
+def test_measure_memory_slots_are_smaller():
+    """
+    Test that slotted and pooled calculations hold less memory than calculations with a __dict__.
+    """
+    # Act
+    memory = measure_memory(count=2_000)
+
+    # Assert
+    assert set(memory) == {"slots", "dict", "pooled"}
+    assert memory["slots"] < memory["dict"]
+    assert memory["pooled"] < memory["slots"]
+    assert CalculatorFactory._instance_pool is None  # the pool is switched off again
+
+
+def test_compare_reports_only_regressions():
+    """
+    Test that only layers slower than the threshold are reported.
+    """
+    # Arrange
+    baseline = {"operations": 100.0, "dispatch": 100.0, "excute": 0.0}
+    results = {"operations": 130.0, "dispatch": 110.0, "excute": 50.0, "str": 10.0}
+
+    # Act
+    regressions = compare(results, baseline, threshold=0.25)
+
+    # Assert
+    assert len(regressions) == 1
+    assert regressions[0]["layer"] == "operations"
+    assert regressions[0]["change"] == pytest.approx(0.3)
+
+
+def test_report_document():
+    """
+    Test the JSON report layout.
+    """
+    document = report({"operations": 1.0}, [])
+    assert document["unit"] == "ns/op"
+    assert document["results"] == {"operations": 1.0}
+    assert document["regressions"] == []
+    assert "regressions" not in report({"operations": 1.0})
+    assert report({"operations": 1.0}, memory={"slots": 56.0})["memory_bytes_per_calculation"] == {"slots": 56.0}
+
+
+def test_main_saves_and_compares_baseline(tmp_path, capsys):
+    """
+    Test saving a baseline and comparing a later run against it.
+    """
+    # Arrange
+    path = tmp_path / "baseline.json"
+
+    # Act
+    first = main(["--number", "10", "--repeat", "1", "--save-baseline", str(path)])
+    saved = json.loads(path.read_text())
+    capsys.readouterr()
+    # A baseline that is impossibly fast makes every layer a regression.
+    path.write_text(json.dumps({"results": {layer: 1e-9 for layer in LAYERS}}))
+    second = main(["--number", "10", "--repeat", "1", "--baseline", str(path)])
+    output = json.loads(capsys.readouterr().out)
+
+    # Assert
+    assert first == 0
+    assert set(saved["results"]) == LAYERS
+    assert second == 1
+    assert {entry["layer"] for entry in output["regressions"]} == LAYERS
+
+
+def test_bench_module_entry_point(monkeypatch, capsys):
+    """
+    Test running the suite as "python -m app.bench".
+    """
+    monkeypatch.setattr("sys.argv", ["app.bench", "--number", "10", "--repeat", "1"])
+    with pytest.raises(SystemExit) as exc_info:
+        runpy.run_module("app.bench", run_name="__main__")
+    assert exc_info.value.code == 0
+    assert set(json.loads(capsys.readouterr().out)["results"]) == LAYERS
+
+
+def test_parse_importtime():
+    """
+    Test parsing "python -X importtime" output into (module, self_us, cumulative_us) rows.
+    """
+    # Arrange
+    text = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     app.operations\n"
+        "import time:       300 |        420 |   app.calculation\n"
+        "Traceback (most recent call last):\n"
+    )
+
+    # Act
+    rows = parse_importtime(text)
+
+    # Assert
+    assert rows == [("app.operations", 120, 120), ("app.calculation", 300, 420)]
+
+
+def test_startup_profile_reports_imports():
+    """
+    Test that the start-up profile of a batch run lists its imports, and that batch mode skips the server stack.
+    """
+    # Act
+    text = startup_profile(["--batch", "-"], top=200)
+
+    # Assert
+    assert text.startswith("Start-up imports of: main.py --batch -")
+    assert "app.batch" in text
+    assert "asyncio" not in text
+    assert "readline" not in text
+    assert "app.backends" not in text and "fractions" not in text  # float runs never load the exact backends
+    assert text.splitlines()[-1].startswith("Total import time:")
+
+
+def test_startup_profile_of_float_repl_skips_unused_modules():
+    """
+    Test that a float REPL does not import the exact number types, export formats or session snapshots at start-up.
+    """
+    # Act
+    text = startup_profile([], top=500)
+
+    # Assert
+    modules = {line.split()[-1] for line in text.splitlines()[2:-1]}
+    assert "app.calculator" in modules
+    assert modules.isdisjoint({"decimal", "fractions", "csv", "json", "app.export", "app.session"})
@@ -0,0 +1,307 @@
+"""
+Tests for the LRU cache module and the factory's optional result cache and instance pool.
+"""
+
+import pytest
+from unittest.mock import patch
+from app.cache import LRUCache
+from app.calculation import CalculatorFactory, AddCalculator
+from app.operations import Operations
+
+
+@pytest.fixture
+def result_cache():
+    """Fixture that enables a small result cache and always disables it afterwards."""
+    cache = CalculatorFactory.enable_result_cache(maxsize=2)
+    yield cache
+    CalculatorFactory.disable_result_cache()
+
+
+@pytest.fixture
+def instance_pool():
+    """Fixture that enables a small instance pool and always disables it afterwards."""
+    pool = CalculatorFactory.enable_instance_pool(maxsize=2)
+    yield pool
+    CalculatorFactory.disable_instance_pool()
+
+
+def test_lru_cache_hit_and_miss():
+    """
+    Test that get counts hits and misses.
+    """
+    # Arrange
+    cache = LRUCache(maxsize=4)
+    cache.put("a", 1.0)
+
+    # Act
+    hit = cache.get("a")
+    miss = cache.get("b")
+
+    # Assert
+    assert hit == 1.0
+    assert miss is None
+    assert cache.info() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "maxsize": 4}
+
+
+def test_lru_cache_shared_by_threads():
+    """
+    Test that concurrent lookups and insertions with constant evictions never fail and keep exact counters.
+    """
+    # Arrange
+    import threading
+    cache = LRUCache(maxsize=8)
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(2_000):
+                if cache.get((offset + i) % 16) is None:
+                    cache.put((offset + i) % 16, i)
+        except Exception as e:  # pragma: no cover - only reached if the cache is not thread-safe
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert errors == []
+    assert cache.hits + cache.misses == 8 * 2_000
+    assert len(cache) <= 8
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    # Arrange
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    cache.get("a")  # "a" is now the most recently used entry
+
+    # Act
+    cache.put("c", 3.0)
+
+    # Assert
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_lru_cache_clear():
+    """
+    Test that clear removes entries and resets counters.
+    """
+    # Arrange
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1.0)
+    cache.get("a")
+
+    # Act
+    cache.clear()
+
+    # Assert
+    assert cache.info() == {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 2}
+
+
+def test_lru_cache_invalid_size():
+    """
+    Test that a cache size below one is rejected.
+    """
+    with pytest.raises(ValueError) as e:
+        LRUCache(maxsize=0)
+    assert "Cache size must be at least 1." in str(e.value)
+
+
+@patch.object(Operations, 'add', return_value=8.0)
+def test_result_is_memoized(mock_add):
+    """
+    Test that the result property runs excute only once per calculation.
+    """
+    # Arrange
+    calc = AddCalculator(5.0, 3.0)
+
+    # Act
+    first = calc.result
+    text = str(calc)
+
+    # Assert
+    assert first == 8.0
+    assert text == "AddCalculator: 5.0 + 3.0 = 8.0"
+    mock_add.assert_called_once_with(5.0, 3.0)
+
+
+@patch.object(Operations, 'add', return_value=8.0)
+def test_result_setter_skips_execution(mock_add):
+    """
+    Test that a recorded result is used instead of executing the calculation.
+    """
+    # Arrange
+    calc = AddCalculator(5.0, 3.0)
+
+    # Act
+    calc.result = 8.0
+    text = str(calc)
+
+    # Assert
+    assert text == "AddCalculator: 5.0 + 3.0 = 8.0"
+    mock_add.assert_not_called()
+
+
+@patch.object(Operations, 'add', return_value=8.0)
+def test_result_cache_shared_between_calculations(mock_add, result_cache):
+    """
+    Test that the result cache is shared by calculations with the same (operation, a, b).
+    """
+    # Act
+    first = CalculatorFactory.create_calculator("add", 5.0, 3.0).result
+    second = CalculatorFactory.create_calculator("add", 5.0, 3.0).result
+
+    # Assert
+    assert first == second == 8.0
+    mock_add.assert_called_once_with(5.0, 3.0)
+    assert result_cache.hits == 1
+    assert result_cache.misses == 1
+
+
+def test_result_cache_keeps_signed_zeros_apart(result_cache):
+    """
+    Test that -0.0 and 0.0, which compare equal, do not share cached results.
+    """
+    # Act
+    negative = CalculatorFactory.create_calculator("add", -0.0, -0.0).result
+    positive = CalculatorFactory.create_calculator("add", 0.0, 0.0).result
+
+    # Assert
+    assert str(negative) == "-0.0"
+    assert str(positive) == "0.0"
+    assert result_cache.hits == 0
+
+
+def test_result_cache_eviction(result_cache):
+    """
+    Test that the result cache respects its size bound.
+    """
+    # Act
+    for a in (1.0, 2.0, 3.0):
+        CalculatorFactory.create_calculator("multiply", a, 2.0).result
+
+    # Assert
+    assert len(result_cache) == 2
+    assert result_cache.evictions == 1
+
+
+def test_result_cache_does_not_store_errors(result_cache):
+    """
+    Test that failing calculations are not cached.
+    """
+    # Act & Assert
+    with pytest.raises(ZeroDivisionError):
+        CalculatorFactory.create_calculator("divide", 1.0, 0.0).result
+    assert len(result_cache) == 0
+
+
+def test_disable_result_cache():
+    """
+    Test that disabling the cache removes it from the factory.
+    """
+    # Arrange
+    CalculatorFactory.enable_result_cache(maxsize=8)
+
+    # Act
+    CalculatorFactory.disable_result_cache()
+
+    # Assert
+    assert CalculatorFactory._result_cache is None
+
+
+def test_calculations_have_no_instance_dict():
+    """
+    Test that the built-in calculators use __slots__ instead of a per-instance __dict__.
+    """
+    # Arrange
+    calculation = CalculatorFactory.create_calculator("add", 5.0, 3.0)
+
+    # Act & Assert
+    assert not hasattr(calculation, "__dict__")
+    with pytest.raises(AttributeError):
+        calculation.note = "not a slot"
+
+
+def test_instance_pool_interns_repeated_triples(instance_pool):
+    """
+    Test that a repeated (operation, a, b) returns the pooled calculation.
+    """
+    # Act
+    first = CalculatorFactory.create_calculator("add", 5.0, 3.0)
+    second = CalculatorFactory.create_calculator("add", 5.0, 3.0)
+    other = CalculatorFactory.create_calculator("subtract", 5.0, 3.0)
+
+    # Assert
+    assert first is second
+    assert other is not first
+    assert (instance_pool.hits, instance_pool.misses) == (1, 2)
+
+
+def test_instance_pool_keeps_signed_zeros_apart(instance_pool):
+    """
+    Test that -0.0 and 0.0, which compare equal, are pooled as different calculations.
+    """
+    # Act
+    negative = CalculatorFactory.create_calculator("add", -0.0, -0.0)
+    positive = CalculatorFactory.create_calculator("add", 0.0, 0.0)
+
+    # Assert
+    assert positive is not negative
+    assert str(positive.a) == "0.0"
+    assert str(positive.result) == "0.0"
+    assert str(negative.result) == "-0.0"
+
+
+@patch.object(Operations, 'add', return_value=8.0)
+def test_instance_pool_shares_memoized_result(mock_add, instance_pool):
+    """
+    Test that pooled calculations compute their result only once.
+    """
+    # Act
+    results = [CalculatorFactory.create_calculator("add", 5.0, 3.0).result for _ in range(3)]
+
+    # Assert
+    assert results == [8.0, 8.0, 8.0]
+    mock_add.assert_called_once_with(5.0, 3.0)
+
+
+def test_instance_pool_evicts_least_recently_used(instance_pool):
+    """
+    Test that the pool keeps at most maxsize calculations.
+    """
+    # Act
+    first = CalculatorFactory.create_calculator("add", 1.0, 1.0)
+    CalculatorFactory.create_calculator("add", 2.0, 2.0)
+    CalculatorFactory.create_calculator("add", 3.0, 3.0)
+
+    # Assert
+    assert len(instance_pool) == 2
+    assert CalculatorFactory.create_calculator("add", 1.0, 1.0) is not first
+
+
+def test_disable_instance_pool():
+    """
+    Test that disabling the pool makes create_calculator return new calculations again.
+    """
+    # Arrange
+    CalculatorFactory.enable_instance_pool(maxsize=8)
+
+    # Act
+    CalculatorFactory.disable_instance_pool()
+
+    # Assert
+    assert CalculatorFactory._instance_pool is None
+    assert CalculatorFactory.create_calculator("add", 1.0, 1.0) is not CalculatorFactory.create_calculator("add", 1.0, 1.0)
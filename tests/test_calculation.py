@@ -5,9 +5,11 @@ we will use unit tests and parameterized tests to ensure the calculator's functi
 
 """
 
+import sys
 import pytest
 from app.operations import Operations
 from unittest.mock import patch
+from array import array
 from app.calculation import (
     CalculatorFactory,
     Calculation,
@@ -624,5 +626,427 @@ def test_calculation_repr_parameterized(
     assert result_repr == expected_repr
 
 
+
+
+#========== Test Cases for CalculatorFactory.evaluate_batch ===========
+
+@pytest.mark.parametrize("calculator_type, a_values, b_values, expected", [
+    ("add", [1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [5.0, 7.0, 9.0]),
+    ("subtract", [10.0, 8.0], [4.0, 5.0], [6.0, 3.0]),
+    ("multiply", [2.0, 4.0], [3.0, 2.5], [6.0, 10.0]),
+    ("divide", [8.0, 10.0], [2.0, 4.0], [4.0, 2.5]),
+])
+def test_evaluate_batch_parameterized(calculator_type, a_values, b_values, expected):
+    """
+    Parameterized test for evaluate_batch with list operands.
+
+    This test checks that every registered operation is applied row by row and the results come back in order.
+    """
+    # Act
+    results = CalculatorFactory.evaluate_batch(calculator_type, a_values, b_values)
+
+    # Assert
+    assert isinstance(results, array)
+    assert results.typecode == "d"
+    assert list(results) == expected
+
+
+def test_evaluate_batch_buffer_inputs():
+    """
+    Test evaluate_batch with buffer-protocol inputs.
+
+    This test checks that array('d') and memoryview operands are accepted without conversion.
+    """
+    # Arrange
+    a_values = array("d", [1.5, 2.5, 3.5])
+    b_values = memoryview(array("d", [0.5, 0.5, 0.5]))
+
+    # Act
+    results = CalculatorFactory.evaluate_batch("add", a_values, b_values)
+
+    # Assert
+    assert list(results) == [2.0, 3.0, 4.0]
+
+
+def test_evaluate_batch_empty():
+    """
+    Test evaluate_batch with empty operand columns.
+
+    This test checks that an empty batch returns an empty result buffer.
+    """
+    # Act
+    results = CalculatorFactory.evaluate_batch("multiply", [], [])
+
+    # Assert
+    assert len(results) == 0
+
+
+def test_evaluate_batch_invalid_operation():
+    """
+    Test evaluate_batch with an unsupported operation.
+
+    This test checks that a ValueError is raised, matching create_calculator.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.evaluate_batch("modulus", [1.0], [2.0])
+    assert "Operation 'modulus' is not supported." in str(e.value)
+
+
+def test_evaluate_batch_length_mismatch():
+    """
+    Test evaluate_batch with operand columns of different lengths.
+
+    This test checks that a ValueError is raised before any work is done.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.evaluate_batch("add", [1.0, 2.0], [3.0])
+    assert "Operand columns must have the same length." in str(e.value)
+
+
+def test_evaluate_batch_divide_by_zero():
+    """
+    Test evaluate_batch when one row divides by zero.
+
+    This test checks that the same ZeroDivisionError as DivideCalculator.excute is raised.
+    """
+    # Act & Assert
+    with pytest.raises(ZeroDivisionError) as e:
+        CalculatorFactory.evaluate_batch("divide", [1.0, 2.0], [1.0, 0.0])
+    assert str(e.value) == "Cannot divide by zero."
+
+
+#========== Test Cases for CalculatorFactory.compute ===========
+
+@pytest.mark.parametrize("calculator_type, a, b", [
+    ("add", 10.0, 5.0),
+    ("subtract", 10.0, 5.0),
+    ("multiply", -2.5, 4.0),
+    ("divide", 7.0, 2.0),
+])
+def test_compute_matches_calculator(calculator_type, a, b):
+    """
+    Test that compute returns the same result as the calculator classes.
+    """
+    # Arrange
+    expected = CalculatorFactory.create_calculator(calculator_type, a, b).excute()
+
+    # Act & Assert
+    assert CalculatorFactory.compute(calculator_type, a, b) == expected
+
+
+def test_compute_errors():
+    """
+    Test that compute raises the same errors as the class path.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.compute("modulus", 1.0, 2.0)
+    assert "Operation 'modulus' is not supported." in str(e.value)
+
+    with pytest.raises(ZeroDivisionError) as e:
+        CalculatorFactory.compute("divide", 1.0, 0.0)
+    assert str(e.value) == "Cannot divide by zero."
+
+
+def test_compute_does_not_create_calculators(monkeypatch):
+    """
+    Test that compute calls the operation function without creating a Calculation object.
+    """
+    # Arrange
+    def fail(self, a, b):
+        raise AssertionError("compute should not create a calculator")
+    monkeypatch.setattr(MultiplyCalculator, "__init__", fail)
+
+    # Act & Assert
+    assert CalculatorFactory.compute("multiply", 6.0, 7.0) == 42.0
+
+
+def test_compute_derives_function_from_excute(isolated_registry):
+    """
+    Test that a registered class without operation_function is computed through its excute method.
+    """
+    # Arrange
+    @CalculatorFactory.register_calculator("modulus")
+    class ModulusCalculator(Calculation):
+        operator_symbol = "%"
+        def excute(self) -> float:
+            return self.a % self.b
+
+    # Act & Assert
+    assert CalculatorFactory.compute("modulus", 7.0, 4.0) == 3.0
+
+
+def test_compute_uses_overridden_excute_of_subclass(isolated_registry):
+    """
+    Test that a subclass overriding excute is computed through it, not through the inherited operation_function.
+    """
+    # Arrange
+    @CalculatorFactory.register_calculator("addone")
+    class AddOneCalculator(AddCalculator):
+        def excute(self) -> float:
+            return self.a + self.b + 1
+
+    # Act & Assert
+    assert CalculatorFactory.create_calculator("addone", 1.0, 2.0).excute() == 4.0
+    assert CalculatorFactory.compute("addone", 1.0, 2.0) == 4.0
+
+
+def test_compute_counts_executions_and_errors(monkeypatch):
+    """
+    Test that compute records executions and errors in the operation statistics.
+    """
+    # Arrange
+    CalculatorFactory.reset_stats()
+
+    # Act
+    CalculatorFactory.compute("divide", 8.0, 2.0)
+    with pytest.raises(ZeroDivisionError):
+        CalculatorFactory.compute("divide", 8.0, 0.0)
+
+    # Assert
+    snapshot = CalculatorFactory.get_stats()["divide"]
+    assert snapshot["executions"] == 1
+    assert snapshot["errors"] == 1
+    assert snapshot["creations"] == 0
+
+
+#========== Test Cases for Lazily Imported Plugin Operations ===========
+
+PLUGIN_SOURCE = """
+from app.calculation import Calculation
+
+class ModulusCalculator(Calculation):
+    operator_symbol = "%"
+    def excute(self) -> float:
+        return self.a % self.b
+"""
+
+
+@pytest.fixture
+def plugin_registry(isolated_registry, monkeypatch, tmp_path):
+    """
+    Fixture that gives each test its own copy of the registry (see isolated_registry) and an importable plugin module.
+    The module name is unique per test, so every test starts with the plugin not imported.
+    """
+    monkeypatch.setattr(CalculatorFactory, "_discovered", False)
+    module_name = f"calc_plugin_{tmp_path.name}"
+    (tmp_path / f"{module_name}.py").write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield module_name
+    sys.modules.pop(module_name, None)
+
+
+def test_register_lazy_imports_on_first_use(plugin_registry):
+    """
+    Test that a lazily registered operation is imported only when it is first used.
+    """
+    # Arrange
+    CalculatorFactory.register_lazy("modulus", f"{plugin_registry}:ModulusCalculator")
+    imported_before_use = plugin_registry in sys.modules
+
+    # Act
+    calculation = CalculatorFactory.create_calculator("modulus", 7.0, 4.0)
+
+    # Assert
+    assert not imported_before_use
+    assert plugin_registry in sys.modules
+    assert calculation.excute() == 3.0
+    assert calculation.calculation_type == "modulus"
+    assert CalculatorFactory.compute("modulus", 9.0, 5.0) == 4.0
+    assert "modulus" not in CalculatorFactory._lazy
+
+
+@pytest.mark.parametrize("use", [
+    lambda: CalculatorFactory.compute("modulus", 7.0, 4.0),
+    lambda: CalculatorFactory.operation_code("modulus"),
+    lambda: CalculatorFactory.evaluate_batch("modulus", [7.0], [4.0]),
+])
+def test_every_lookup_loads_lazy_operations(plugin_registry, use):
+    """
+    Test that compute, operation_code and evaluate_batch also import lazily registered operations.
+    """
+    # Arrange
+    CalculatorFactory.register_lazy("modulus", f"{plugin_registry}:ModulusCalculator")
+
+    # Act
+    use()
+
+    # Assert
+    assert CalculatorFactory._calculation["modulus"].__name__ == "ModulusCalculator"
+
+
+def test_register_lazy_duplicate(plugin_registry):
+    """
+    Test that lazily registering a registered operation raises ValueError.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.register_lazy("add", f"{plugin_registry}:ModulusCalculator")
+    assert "Calculation type 'add' already registered." in str(e.value)
+
+
+@pytest.mark.parametrize("target", ["calc_plugin_missing:ModulusCalculator", "{module}:MissingCalculator"])
+def test_lazy_operation_load_failure(plugin_registry, target):
+    """
+    Test that a plugin that cannot be imported raises ValueError when its operation is used.
+    """
+    # Arrange
+    CalculatorFactory.register_lazy("modulus", target.format(module=plugin_registry))
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.create_calculator("modulus", 7.0, 4.0)
+    assert "Operation 'modulus' could not be loaded:" in str(e.value)
+
+
+def test_discover_plugins_from_entry_points(plugin_registry, tmp_path):
+    """
+    Test that operations listed as entry points are registered by name and imported on first use.
+    """
+    # Arrange
+    dist_info = tmp_path / "calc_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: calc-plugin\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        "[calculator.operations]\n"
+        f"modulus = {plugin_registry}:ModulusCalculator\n"
+        f"add = {plugin_registry}:ModulusCalculator\n"
+    )
+
+    # Act
+    result = CalculatorFactory.create_calculator("modulus", 7.0, 4.0).excute()
+
+    # Assert
+    assert result == 3.0
+    assert CalculatorFactory._discovered
+    assert CalculatorFactory._calculation["add"] is AddCalculator  # built-in operations are not replaced
+
+
+def test_unknown_operation_after_discovery(plugin_registry):
+    """
+    Test that an operation that is neither registered nor an entry point is still not supported.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.create_calculator("modulus", 7.0, 4.0)
+    assert "Operation 'modulus' is not supported." in str(e.value)
+    assert CalculatorFactory._discovered
+
+
+def test_registry_accessors(plugin_registry):
+    """
+    Test the read-only views of the registry, before and after a lazy operation is imported.
+    """
+    # Arrange
+    CalculatorFactory.register_lazy("modulus", f"{plugin_registry}:ModulusCalculator")
+
+    # Act & Assert: the lazy operation is known, but has no code or class yet, and nothing is imported
+    assert CalculatorFactory.is_registered("add") and CalculatorFactory.is_registered("modulus")
+    assert not CalculatorFactory.is_registered("power")
+    assert "modulus" not in CalculatorFactory.operation_names()
+    assert "modulus" not in CalculatorFactory.operation_codes()
+    assert plugin_registry not in sys.modules
+
+    # Act & Assert: once imported, it is in every table
+    code = CalculatorFactory.operation_code("modulus")
+    assert CalculatorFactory.operation_names()[code] == "modulus"
+    assert CalculatorFactory.operation_codes()["modulus"] == code
+    assert CalculatorFactory.calculator_classes()["modulus"].__name__ == "ModulusCalculator"
+    assert CalculatorFactory.calculator_classes()["add"] is AddCalculator
+
+
+#========== Test Cases for Concurrent Use of the Registry ===========
+
+def test_concurrent_registration(plugin_registry):
+    """
+    Test that threads registering at the same time get distinct codes, and only one of them gets a duplicate type.
+    """
+    # Arrange
+    import threading
+    threads_count = 64
+    barrier = threading.Barrier(threads_count)
+    outcomes = []
+
+    def register(i):
+        class Calculator(Calculation):
+            operator_symbol = "?"
+            def excute(self) -> float:
+                return self.a
+        barrier.wait()
+        CalculatorFactory.register_calculator(f"operation_{i}")(Calculator)
+        try:
+            CalculatorFactory.register_calculator("shared")(Calculator)
+            outcomes.append("registered")
+        except ValueError:
+            outcomes.append("duplicate")
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(threads_count)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert outcomes.count("registered") == 1
+    codes = [CalculatorFactory.operation_code(f"operation_{i}") for i in range(threads_count)]
+    assert len(set(codes)) == threads_count
+    assert all(CalculatorFactory.operation_name(code) == f"operation_{i}" for i, code in enumerate(codes))
+    assert all(CalculatorFactory.compute(f"operation_{i}", 5.0, 1.0) == 5.0 for i in range(threads_count))
+
+
+def test_concurrent_lazy_loading(plugin_registry):
+    """
+    Test that many threads using a lazy operation for the first time at once load it exactly once.
+    """
+    # Arrange
+    import threading
+    threads_count = 32
+    CalculatorFactory.register_lazy("modulus", f"{plugin_registry}:ModulusCalculator")
+    barrier = threading.Barrier(threads_count)
+    results, classes = [], []
+
+    def use():
+        barrier.wait()
+        results.append(CalculatorFactory.compute("modulus", 7.0, 4.0))
+        classes.append(CalculatorFactory.get_calculator_class("modulus"))
+
+    threads = [threading.Thread(target=use) for _ in range(threads_count)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert results == [3.0] * threads_count
+    assert len(set(classes)) == 1
+    assert CalculatorFactory._operation_names.count("modulus") == 1
+    assert "modulus" not in CalculatorFactory._lazy
+
+
+def test_registration_copies_tables(plugin_registry):
+    """
+    Test that registering publishes new tables, so a table read before the registration never changes.
+    """
+    # Arrange
+    before = CalculatorFactory._calculation
+
+    # Act
+    @CalculatorFactory.register_calculator("modulus")
+    class ModulusCalculator(Calculation):
+        operator_symbol = "%"
+        def excute(self) -> float:
+            return self.a % self.b
+
+    # Assert
+    assert "modulus" not in before
+    assert CalculatorFactory._calculation["modulus"] is ModulusCalculator
+
+
 #========== End of Test Cases for Calculation Module ===========
 
@@ -2,7 +2,10 @@
 import sys
 import pytest
 from io import StringIO
-from app.calculator import calculator, display_help, display_history
+from app.calculator import calculator, display_help, display_history, display_stats, history_query, history_range
+from app.history import Range
+from app.calculation import CalculatorFactory
+from app.backends import get_backend
 
 def test_display_help(capsys):
     """    
@@ -35,10 +38,23 @@ Supported Operations:
 - subtract <num1> <num2>: Subtracts the second number from the first.
 - multiply <num1> <num2>: Multiplies two numbers.
 - divide <num1> <num2>: Divides the first number by the second (cannot divide by zero).
+- <expression>: Evaluates an infix expression such as 3 + 4 * (2 - 1).
+- <operation> <vector> <vector>: Evaluates element-wise, e.g. add 1,2,3 4,5,6 or multiply @values.bin 2 (a file of packed doubles).
+- <operation> <num1> <num2> <num3> ...: Applies the operation from left to right, e.g. add 1 2 3 4.
+- sum <num or @file> ...: Adds all values with compensated summation, e.g. sum @values.bin.
+- <name> = <operation> <operand> <operand> | <name> = <num>: Assigns a variable, e.g. x = add 5 3 then y = multiply x 2.
+  Operands may be numbers or variables; reassigning a variable recomputes the variables that depend on it.
 
 special commands:
 - help: Displays this help message.
 - history: Displays the history of calculations performed during the session.
+- history N | history FROM:TO | history tail: Displays the last N entries, entries FROM to TO, or the last 10 entries.
+- history find <condition> ...: Displays the entries that match every condition, e.g. history find op=divide result>100.
+  Conditions are op=<operation> and a, b or result followed by =, <, <=, > or >= and a number.
+- stats: Displays per-operation counters and p50/p95/p99 execution latencies.
+- vars: Displays the variables and their values.
+- export <path> [--format csv|ndjson|columnar]: Writes the history to a file (csv by default).
+- save <path> | load <path>: Saves the session (history and variables) to a snapshot file, or restores one.
 - exit: Exits the calculator.
 
 Example Usage:
@@ -425,6 +441,10 @@ def test_calculator_unexpected_error(monkeypatch, capsys):
     class MockCalculator:
         def excute(self):
             raise Exception("Unexpected error")
+
+        @property
+        def result(self):
+            return self.excute()
         
         def __str__(self):
             return "MockCalculation"
@@ -446,10 +466,599 @@ def test_calculator_unexpected_error(monkeypatch, capsys):
     
 
 
+def test_calculator_expression(monkeypatch, capsys):
+    """
+    Test the calculator function with infix expressions.
+
+    AAA pattern:
+    -Arrange: Prepare an expression, an expression dividing by zero, and then exit.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure the expression result and the division error are printed.
+    """
+
+    # Arrange
+    user_input = "3 + 4 * (2 - 1)\n1 / (2 - 2)\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: 3 + 4 * (2 - 1) = 7.0" in captured.out  # Ensure the expression result is printed
+    assert "Cannot divide by zero." in captured.out  # Ensure the division error is printed
+
+
+def test_display_stats_empty(capsys):
+    """
+    Test the display_stats function before any calculation.
+
+    AAA pattern:
+    -Arrange: Clear the factory statistics.
+    -Act: Call the display_stats function.
+    -Assert: Ensure it reports that no calculations were performed.
+    """
+    # Arrange
+    CalculatorFactory.reset_stats()
+
+    # Act
+    display_stats()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert captured.out.strip() == "No calculations performed yet."
+
 
+def test_calculator_stats_command(monkeypatch, capsys):
+    """
+    Test the 'stats' command of the calculator.
 
+    AAA pattern:
+    -Arrange: Clear the statistics and prepare two additions, one division by zero and 'stats'.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure the counters of each operation are printed.
+    """
+    # Arrange
+    CalculatorFactory.reset_stats()
+    user_input = "add 5 3\nadd 1 1\ndivide 1 0\nstats\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
 
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
 
+    # Assert
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert "Operation Statistics:" in captured.out
+    add_row = next(line for line in lines if line.startswith("add "))
+    divide_row = next(line for line in lines if line.startswith("divide "))
+    assert add_row.split()[1:4] == ["2", "2", "0"]  # created, executed, errors
+    assert divide_row.split()[1:4] == ["1", "0", "1"]
+
+
+def test_calculator_history_file(monkeypatch, capsys, tmp_path):
+    """
+    Test that calculations are kept across sessions when a history file is given.
+
+    AAA pattern:
+    -Arrange: Run one session that performs a calculation with a history file.
+    -Act: Run a second session with the same file that asks for the history.
+    -Assert: Ensure the calculation of the first session is listed.
+    """
+    # Arrange
+    path = str(tmp_path / "history.log")
+    monkeypatch.setattr('sys.stdin', StringIO("add 5 3\nexit\n"))
+    with pytest.raises(SystemExit):
+        calculator(history_file=path)
+    capsys.readouterr()
+
+    # Act
+    monkeypatch.setattr('sys.stdin', StringIO("history\n"))
+    with pytest.raises(SystemExit):
+        calculator(history_file=path)
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "1: AddCalculator: 5.0 + 3.0 = 8.0" in captured.out
+
+
+@pytest.mark.parametrize("argument, length, expected", [
+    ("", 5, range(0, 5)),
+    ("2", 5, range(3, 5)),
+    ("10", 5, range(0, 5)),
+    ("0", 5, range(5, 5)),
+    ("2:4", 5, range(1, 4)),
+    ("3:", 5, range(2, 5)),
+    (":2", 5, range(0, 2)),
+    ("4:99", 5, range(3, 5)),
+    ("tail", 25, range(15, 25)),
+    ("tail", 3, range(0, 3)),
+])
+def test_history_range(argument, length, expected):
+    """
+    Test that each form of the history command selects the expected entries.
+    """
+    # Act & Assert
+    assert history_range(argument, length) == expected
+
+
+@pytest.mark.parametrize("argument", ["abc", "-2", "0:3", "1:x", "tail 5"])
+def test_history_range_invalid(argument):
+    """
+    Test that malformed history arguments raise ValueError with a usage message.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        history_range(argument, 5)
+    assert "Invalid history range." in str(e.value)
+
+
+@pytest.mark.parametrize("argument, expected", [
+    ("op=divide result>100", {"operation": "divide", "result": Range(low=100.0, include_low=False)}),
+    ("a=3.5", {"a": Range(3.5, 3.5)}),
+    ("b<=2 b<2", {"b": Range(high=2.0, include_high=False)}),
+    ("result>=1 result<5 result>2", {"result": Range(2.0, 5.0, include_low=False, include_high=False)}),
+])
+def test_history_query(argument, expected):
+    """
+    Test that the conditions of 'history find' become History.find arguments, keeping the tighter bounds.
+    """
+    # Act & Assert
+    assert history_query(argument) == expected
+
+
+@pytest.mark.parametrize("argument", ["", "x>1", "a==1", "a>", "op<divide", "result>abc", "a=nan", "result<-NaN", "b>=nan"])
+def test_history_query_invalid(argument):
+    """
+    Test that malformed 'history find' conditions raise ValueError with a usage message.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        history_query(argument)
+    assert "Invalid history query." in str(e.value)
+
+
+@pytest.mark.parametrize("argument", ["a=nan", "a=snan"])
+def test_history_query_decimal_nan(argument):
+    """
+    Test that NaN bounds are rejected with the session backend's numbers too.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        history_query(argument, get_backend("decimal").parse)
+    assert "Invalid history query." in str(e.value)
+
+
+def test_display_history_only_formats_requested_entries(capsys):
+    """
+    Test that displaying a range only accesses the requested entries.
+
+    AAA pattern:
+    Arrange: Prepare a long history that records which entries are accessed.
+    Act: Display a range of two entries.
+    Assert: Ensure only those entries were accessed and are numbered by their position.
+    """
+    # Arrange
+    accessed = []
 
+    class Recording(list):
+        def __getitem__(self, index):
+            accessed.append(index)
+            return list.__getitem__(self, index)
 
+    history = Recording(f"entry {i}" for i in range(100_000))
+
+    # Act
+    display_history(history, history_range("50:51", len(history)))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert captured.out == "Calculation History:\n50: entry 49\n51: entry 50\n"
+    assert accessed == [49, 50]
+
+
+def test_display_history_empty_range(capsys):
+    """
+    Test that an empty range prints a message instead of an empty table.
+    """
+    # Act
+    display_history(["AddCalculator: 5.0 + 3.0 = 8.0"], range(0))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert captured.out.strip() == "No calculations in that range."
+
+
+def test_calculator_history_forms(monkeypatch, capsys):
+    """
+    Test the 'history N', 'history FROM:TO' and 'history tail' commands in the REPL.
+
+    AAA pattern:
+    -Arrange: Prepare three calculations followed by each history form and an invalid one.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure each form prints the expected entries.
+    """
+    # Arrange
+    user_input = "add 1 1\nadd 2 2\nadd 3 3\nhistory 1\nhistory 1:2\nhistory tail\nhistory x\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert captured.out.count("3: AddCalculator: 3.0 + 3.0 = 6.0") == 2  # 'history 1' and 'history tail'
+    assert captured.out.count("1: AddCalculator: 1.0 + 1.0 = 2.0") == 2  # 'history 1:2' and 'history tail'
+    assert "Invalid history range." in captured.out
+
+
+def test_calculator_loads_readline_for_terminals(monkeypatch, capsys):
+    """
+    Test that readline is only imported when standard input is an interactive terminal.
+
+    AAA pattern:
+    -Arrange: Remove readline from the loaded modules and make stdin look like a terminal.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure readline was imported.
+    """
+    # Arrange
+    class Terminal(StringIO):
+        def isatty(self):
+            return True
+    monkeypatch.delitem(sys.modules, "readline", raising=False)
+    monkeypatch.setattr('sys.stdin', Terminal("exit\n"))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    assert "readline" in sys.modules
+
+
+def test_calculator_decimal_backend(monkeypatch, capsys):
+    """
+    Test a REPL session that computes with the decimal backend.
+
+    AAA pattern:
+    -Arrange: Prepare a calculation, an expression and a history command for a decimal session.
+    -Act: Call the calculator function with a decimal backend of 5 significant digits.
+    -Assert: Ensure results are Decimals rounded to 5 digits, also in the history.
+    """
+    # Arrange
+    user_input = "add 0.1 0.2\ndivide 1 3\n2 / 3\nhistory\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(backend=get_backend("decimal", 5))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: AddCalculator: 0.1 + 0.2 = 0.3" in captured.out
+    assert "Result: 2 / 3 = 0.66667" in captured.out
+    assert "2: DivideCalculator: 1 / 3 = 0.33333" in captured.out
+
+
+def test_calculator_decimal_signals(monkeypatch, capsys):
+    """
+    Test that Decimal signals in a command or an expression are reported and the session goes on.
+    """
+    # Arrange
+    user_input = "1e999999999 * 1e999999999\nmultiply inf 0\nadd 1 1\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(backend=get_backend("decimal", 5))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "The result is too large for the decimal backend (precision 5)." in captured.out
+    assert "The result is undefined for these operands (for example, inf * 0)." in captured.out
+    assert "Result: AddCalculator: 1 + 1 = 2" in captured.out
+
+
+def test_calculator_sum_of_two_operands(monkeypatch, capsys):
+    """
+    Test that "sum a b" is reduced in the REPL instead of being read as an unknown binary operation.
+    """
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO("sum 1 2\nsum\nexit\n"))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
 
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: 3.0" in captured.out
+    assert "Invalid input. Use: sum <num or @file> ..." in captured.out
+    assert "not supported" not in captured.out
+
+
+def test_calculator_reduction_commands_with_backend(monkeypatch, capsys):
+    """
+    Test that n-ary commands in the REPL use the session backend, like batch mode does.
+    """
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO("add 0.1 0.2 0.3\nsum 0.1 0.2\nsum @values.bin 1\nexit\n"))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(backend=get_backend("decimal"))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: 0.6\n" in captured.out
+    assert "Result: 0.3\n" in captured.out
+    assert "File operands hold doubles and cannot be used with the decimal backend." in captured.out
+
+
+def test_calculator_assignment_decimal_signals(monkeypatch, capsys):
+    """
+    Test that a Decimal signal in an assignment is reported, leaves the variable unchanged and the session goes on.
+    """
+    # Arrange
+    user_input = "x = 2\nx = multiply inf 0\ny = multiply 1e999999999 1e999999999\nvars\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(backend=get_backend("decimal", 5))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "The result is undefined for these operands (for example, inf * 0)." in captured.out
+    assert "The result is too large for the decimal backend (precision 5)." in captured.out
+    assert "x = 2" in captured.out.split("Variables:")[1]
+    assert "y =" not in captured.out.split("Variables:")[1]
+
+
+@pytest.mark.parametrize("backend_name", ["decimal", "fraction"])
+def test_calculator_backend_rejects_vectors(monkeypatch, capsys, backend_name):
+    """
+    Test that vector commands, which are evaluated as doubles, are rejected in a session with a backend.
+    """
+    # Arrange
+    monkeypatch.setattr('sys.stdin', StringIO("add 1,2 3,4\nadd 1 2\nexit\n"))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(backend=get_backend(backend_name))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert f"Vector operands hold doubles and cannot be used with the {backend_name} backend." in captured.out
+    assert "4.0,6.0" not in captured.out
+    assert "Result: AddCalculator: 1 + 2 = 3" in captured.out
+
+
+def test_calculator_backend_rejects_history_file(tmp_path):
+    """
+    Test that a numeric backend cannot be combined with a history file, which stores floats.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        calculator(history_file=str(tmp_path / "history.log"), backend=get_backend("fraction"))
+    assert "cannot be used with a numeric backend" in str(e.value)
+
+
+def test_calculator_vector_commands(monkeypatch, capsys, tmp_path):
+    """
+    Test element-wise vector commands in the REPL.
+
+    AAA pattern:
+    -Arrange: Prepare inline and file vector commands (with an upper-case path) and two failing ones.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure results, errors and a shortened long result are printed, and the history stays scalar.
+    """
+    # Arrange
+    import struct
+    path = tmp_path / "Values.bin"
+    path.write_bytes(struct.pack("<100d", *range(100)))
+    user_input = f"add 1,2,3 4,5,6\nMULTIPLY @{path} 2\nadd 1,2 1,2,3\ndivide 1,2 0\nhistory\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: 5.0,7.0,9.0" in captured.out
+    assert "(100 values)" in captured.out and "196.0,198.0" in captured.out
+    assert "Vector operands must have the same length" in captured.out
+    assert "Cannot divide by zero." in captured.out
+    assert "No calculations performed yet." in captured.out
+
+
+def test_calculator_reduction_commands(monkeypatch, capsys, tmp_path):
+    """
+    Test n-ary commands in the REPL.
+
+    AAA pattern:
+    -Arrange: Prepare an n-ary command, a sum over a file (with an upper-case path) and two failing ones.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure results and errors are printed.
+    """
+    # Arrange
+    import struct
+    path = tmp_path / "Values.bin"
+    path.write_bytes(struct.pack("<10d", *[0.1] * 10))
+    user_input = f"add 1 2 3 4\nSUM @{path}\ndivide 1 2 0\nsum 1 x\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Result: 10.0" in captured.out
+    assert "Result: 1.0" in captured.out
+    assert "Cannot divide by zero." in captured.out
+    assert "Invalid operand 'x'." in captured.out
+
+
+def test_calculator_variables(monkeypatch, capsys):
+    """
+    Test variable assignments in the REPL.
+
+    AAA pattern:
+    -Arrange: Prepare a chain of assignments, a reassignment, a failing one and the 'vars' and 'history' commands.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure values, recomputed dependents, errors and the variables are printed.
+    """
+    # Arrange
+    user_input = "vars\nx = add 5 3\ny = multiply x 2\nx = 10\nz = divide y 0\nq = add nope 1\nvars\nhistory\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "No variables defined yet." in captured.out
+    assert "Result: x = 8.0" in captured.out
+    assert "Result: y = 16.0" in captured.out
+    assert "Result: x = 10.0\nRecomputed: y" in captured.out
+    assert "Cannot divide by zero." in captured.out
+    assert "Variable 'nope' is not defined." in captured.out
+    assert "Variables:\nx = 10.0\ny = multiply x 2.0 = 20.0" in captured.out
+    assert "2: MultiplyCalculator: 8.0 * 2.0 = 16.0" in captured.out
+
+
+def test_calculator_history_find(monkeypatch, capsys):
+    """
+    Test the 'history find' command in the REPL.
+
+    AAA pattern:
+    -Arrange: Prepare a few calculations followed by valid, empty and invalid queries.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure only the matching entries are printed, numbered by their position in the history.
+    """
+    # Arrange
+    user_input = "add 5 3\ndivide 500 2\ndivide 6 3\nhistory find op=divide result>100\nhistory find a=7\nhistory find x=1\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert "Calculation History:\n2: DivideCalculator: 500.0 / 2.0 = 250.0\n>>" in captured.out
+    assert "No calculations in that range." in captured.out
+    assert "Invalid history query." in captured.out
+
+
+def test_calculator_export(monkeypatch, capsys, tmp_path):
+    """
+    Test the 'export' command in the REPL.
+
+    AAA pattern:
+    -Arrange: Prepare a calculation followed by exports in two formats (one to an upper-case path) and failing ones.
+    -Act: Call the calculator function with the input.
+    -Assert: Ensure the files are written and errors are reported.
+    """
+    # Arrange
+    csv_path = tmp_path / "History.csv"
+    json_path = tmp_path / "history.ndjson"
+    user_input = (
+        f"add 5 3\nexport {csv_path}\nEXPORT {json_path} --format NDJSON\nexport {tmp_path} --format csv\n"
+        "export a.csv --format xml\nexport\nexit\n"
+    )
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert f"Exported 1 calculations to {csv_path}." in captured.out
+    assert csv_path.read_text().splitlines()[1] == "add,5.0,3.0,8.0"
+    assert json_path.read_text() == '{"operation": "add", "a": 5.0, "b": 3.0, "result": 8.0}\n'
+    assert f"Cannot write '{tmp_path}'" in captured.out
+    assert captured.out.count("Invalid export command. Use: export <path> [--format csv|ndjson|columnar]") == 2
+
+
+def test_calculator_export_exact_columnar(monkeypatch, capsys, tmp_path):
+    """
+    Test that the REPL reports that an exact session cannot be exported in the columnar format.
+    """
+    # Arrange
+    from app.backends import get_backend
+    user_input = f"add 1 2\nexport {tmp_path / 'h.col'} --format columnar\nexit\n"
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+
+    # Act
+    with pytest.raises(SystemExit):
+        calculator(backend=get_backend("fraction"))
+
+    # Assert
+    assert "cannot export exact values" in capsys.readouterr().out
+
+
+def test_calculator_save_and_load(monkeypatch, capsys, tmp_path):
+    """
+    Test the 'save' and 'load' commands in the REPL.
+
+    AAA pattern:
+    -Arrange: Save a session with a calculation and a variable (to an upper-case path), then load it in a new session.
+    -Act: Call the calculator function twice.
+    -Assert: Ensure the history and variables are restored and errors are reported.
+    """
+    # Arrange
+    path = tmp_path / "Session.snap"
+    first = f"add 5 3\nx = multiply 2 4\nsave {path}\nsave\nsave {tmp_path}\nexit\n"
+    second = f"load {path}\nhistory\nvars\nload {tmp_path / 'missing'}\nload {tmp_path / 'Session.snap'} x\nexit\n"
+
+    # Act
+    monkeypatch.setattr('sys.stdin', StringIO(first))
+    with pytest.raises(SystemExit):
+        calculator()
+    monkeypatch.setattr('sys.stdin', StringIO(second))
+    with pytest.raises(SystemExit):
+        calculator()
+
+    # Assert
+    captured = capsys.readouterr()
+    assert f"Saved 2 calculations and 1 variables to {path}." in captured.out
+    assert "Invalid save command. Use: save <path>" in captured.out
+    assert f"Cannot write '{tmp_path}'" in captured.out
+    assert f"Loaded 2 calculations and 1 variables from {path}." in captured.out
+    assert "2: MultiplyCalculator: 2.0 * 4.0 = 8.0" in captured.out
+    assert "x = multiply 2.0 4.0 = 8.0" in captured.out
+    assert "Cannot read" in captured.out
+    assert "Invalid load command. Use: load <path>" in captured.out
+
+
+def test_calculator_load_errors(monkeypatch, capsys, tmp_path):
+    """
+    Test that a session with a history file refuses snapshots, and invalid snapshots are reported.
+    """
+    # Arrange
+    from app.session import SNAPSHOT_HEADER, SNAPSHOT_MAGIC
+    (tmp_path / "other.bin").write_bytes(b"not a snapshot")
+    (tmp_path / "bad.snap").write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 2) + b"{}")
+    user_input = f"load {tmp_path / 'other.bin'}\nload {tmp_path / 'bad.snap'}\nexit\n"
+
+    # Act
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+    with pytest.raises(SystemExit):
+        calculator()
+    monkeypatch.setattr('sys.stdin', StringIO(user_input))
+    with pytest.raises(SystemExit):
+        calculator(history_file=str(tmp_path / "history.log"))
+
+    # Assert
+    captured = capsys.readouterr()
+    assert f"'{tmp_path / 'other.bin'}' is not a session snapshot." in captured.out
+    assert f"'{tmp_path / 'bad.snap'}' is not a session snapshot." in captured.out
+    assert "A session with a history file cannot load a snapshot." in captured.out
@@ -0,0 +1,160 @@
+"""
+Tests for the export module of the application.
+
+These tests check the csv, ndjson and columnar exports of the history, including
+entries that are only in the history log and histories with exact values.
+"""
+
+import csv
+import json
+import pytest
+from fractions import Fraction
+from app.calculation import CalculatorFactory
+from app.history import History, HistoryLog
+from app.export import export_history, read_columnar
+import app.export
+
+
+def append_rows(history, *rows):
+    """Helper that appends (operation, a, b) rows to a History."""
+    for operation, a, b in rows:
+        calculation = CalculatorFactory.create_calculator(operation, a, b)
+        history.append(calculation, calculation.excute())
+    return history
+
+
+ROWS = [("add", 5.0, 3.0), ("divide", 500.0, 2.0), ("multiply", 2.5, 4.0)]
+
+
+def test_export_csv(tmp_path):
+    """
+    Test that the csv export has a header and one line per entry.
+    """
+    # Arrange
+    history = append_rows(History(), *ROWS)
+    path = tmp_path / "history.csv"
+
+    # Act
+    count = export_history(history, str(path))
+
+    # Assert
+    assert count == 3
+    with open(path, newline="") as file:
+        assert list(csv.reader(file)) == [
+            ["operation", "a", "b", "result"],
+            ["add", "5.0", "3.0", "8.0"],
+            ["divide", "500.0", "2.0", "250.0"],
+            ["multiply", "2.5", "4.0", "10.0"],
+        ]
+
+
+def test_export_ndjson(tmp_path):
+    """
+    Test that the ndjson export has one JSON object per entry, and exact values become strings.
+    """
+    # Arrange
+    history = append_rows(History(exact=True), ("divide", Fraction(1), Fraction(3)))
+    append_rows(history, ("add", 1.5, 2.0))
+    path = tmp_path / "history.ndjson"
+
+    # Act
+    count = export_history(history, str(path), "ndjson")
+
+    # Assert
+    assert count == 2
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [
+        {"operation": "divide", "a": "1", "b": "3", "result": "1/3"},
+        {"operation": "add", "a": 1.5, "b": 2.0, "result": 3.5},
+    ]
+
+
+def test_export_columnar_round_trip(tmp_path):
+    """
+    Test that the columnar export reads back as the same columns.
+    """
+    # Arrange
+    history = append_rows(History(), *ROWS)
+    path = str(tmp_path / "history.col")
+
+    # Act
+    count = export_history(history, path, "columnar")
+    names, codes, a, b, results = read_columnar(path)
+
+    # Assert
+    assert count == 3
+    assert [names[code] for code in codes] == ["add", "divide", "multiply"]
+    assert a.tolist() == [5.0, 500.0, 2.5]
+    assert b.tolist() == [3.0, 2.0, 4.0]
+    assert results.tolist() == [8.0, 250.0, 10.0]
+
+
+def test_export_includes_log_entries(tmp_path, monkeypatch):
+    """
+    Test that entries that are only in the history log are exported, in order, in every format.
+    """
+    # Arrange
+    monkeypatch.setattr(app.export, "EXPORT_CHUNK", 4)
+    history = History(HistoryLog(str(tmp_path / "history.log")), resident=3)
+    append_rows(history, *[("add", float(i), 1.0) for i in range(12)])
+
+    # Act
+    export_history(history, str(tmp_path / "history.col"), "columnar")
+    export_history(history, str(tmp_path / "history.csv"), "csv")
+    history.close()
+
+    # Assert
+    names, codes, a, b, results = read_columnar(str(tmp_path / "history.col"))
+    assert a.tolist() == [float(i) for i in range(12)]
+    assert results.tolist() == [i + 1.0 for i in range(12)]
+    assert len((tmp_path / "history.csv").read_text().splitlines()) == 13
+
+
+def test_export_empty_history(tmp_path):
+    """
+    Test that an empty history exports a header (csv) or an empty file (ndjson), and no columnar rows.
+    """
+    # Arrange
+    history = History()
+
+    # Act & Assert
+    assert export_history(history, str(tmp_path / "h.csv")) == 0
+    assert (tmp_path / "h.csv").read_bytes() == b"operation,a,b,result\r\n"
+    assert export_history(history, str(tmp_path / "h.ndjson"), "ndjson") == 0
+    assert export_history(history, str(tmp_path / "h.col"), "columnar") == 0
+    assert read_columnar(str(tmp_path / "h.col"))[1].tolist() == []
+
+
+def test_export_errors(tmp_path):
+    """
+    Test that unknown formats, exact columnar exports and unreadable columnar files raise ValueError.
+    """
+    # Arrange
+    (tmp_path / "other.bin").write_bytes(b"not a columnar export")
+    exact = History(exact=True)
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        export_history(History(), str(tmp_path / "h.xml"), "xml")
+    assert "Export format 'xml' is not supported." in str(e.value)
+    with pytest.raises(ValueError) as e:
+        export_history(exact, str(tmp_path / "h.col"), "columnar")
+    assert "cannot export exact values" in str(e.value)
+    with pytest.raises(ValueError) as e:
+        read_columnar(str(tmp_path / "other.bin"))
+    assert "is not a columnar history export." in str(e.value)
+
+
+@pytest.mark.parametrize("count", [1, 2 ** 62, 2 ** 64 - 1])
+def test_read_columnar_rejects_oversized_row_count(tmp_path, count):
+    """
+    Test that a row count larger than the rest of the file is rejected before any column is allocated.
+    """
+    # Arrange
+    from app.export import COLUMNAR_HEADER, COLUMNAR_MAGIC
+    path = tmp_path / "h.col"
+    path.write_bytes(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, count) + b"\x00" * 20)
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        read_columnar(str(path))
+    assert "is not a columnar history export." in str(e.value)
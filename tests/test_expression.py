@@ -0,0 +1,107 @@
+"""
+Tests for the infix expression module.
+"""
+
+import pytest
+from app.calculation import CalculatorFactory, Calculation
+from app.expression import MAX_DEPTH, compile_expression, evaluate_expression
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("3 + 4 * (2 - 1)", 7.0),
+    ("2 - 3 - 4", -5.0),
+    ("8 / 2 / 2", 2.0),
+    ("-2 * -3", 6.0),
+    ("+5", 5.0),
+    ("-(1 + 2)", -3.0),
+    ("((1.5))", 1.5),
+    (".5e1 + 1", 6.0),
+    ("10/4", 2.5),
+])
+def test_evaluate_expression(source, expected):
+    """
+    Parameterized test for precedence, associativity, unary signs and number formats.
+    """
+    assert evaluate_expression(source) == expected
+
+
+@pytest.mark.parametrize("source, message", [
+    ("", "Invalid expression: empty input."),
+    ("(1 + 2", "Invalid expression: missing ')'."),
+    ("1 +", "Invalid expression: unexpected end of input."),
+    ("1 2", "Invalid expression: unexpected '2'."),
+    ("1 % 2", "Invalid expression: unexpected '%'."),
+    ("* 2", "Invalid expression: unexpected '*'."),
+])
+def test_invalid_expression(source, message):
+    """
+    Parameterized test for malformed expressions.
+    """
+    with pytest.raises(ValueError) as e:
+        compile_expression(source)
+    assert str(e.value) == message
+
+
+@pytest.mark.parametrize("source", [
+    "(" * 400 + "1" + ")" * 400,
+    "-" * 2000 + "1",
+    " + ".join(["1"] * 5000),
+])
+def test_deeply_nested_expression(source):
+    """
+    Parameterized test that input nested deeper than MAX_DEPTH is a ValueError, not a RecursionError.
+    """
+    with pytest.raises(ValueError) as e:
+        compile_expression(source)
+    assert str(e.value) == f"Invalid expression: nested more than {MAX_DEPTH} levels deep."
+
+
+def test_expression_at_max_depth():
+    """
+    Test that expressions exactly MAX_DEPTH levels deep still compile and evaluate.
+    """
+    assert evaluate_expression("(" * MAX_DEPTH + "1" + ")" * MAX_DEPTH) == 1.0
+    assert evaluate_expression(" + ".join(["1"] * MAX_DEPTH)) == MAX_DEPTH
+
+
+def test_expression_divide_by_zero():
+    """
+    Test that division by zero raises ZeroDivisionError when the expression is evaluated.
+    """
+    expression = compile_expression("1 / (2 - 2)")
+    with pytest.raises(ZeroDivisionError):
+        expression()
+
+
+def test_compiled_expressions_are_cached():
+    """
+    Test that compiling the same source twice returns the cached closure.
+    """
+    # Arrange
+    compile_expression.cache_clear()
+
+    # Act
+    first = compile_expression("1 + 2 * 3")
+    second = compile_expression("1 + 2 * 3")
+
+    # Assert
+    assert first is second
+    assert compile_expression.cache_info().hits == 1
+
+
+def test_expression_uses_registered_operations(isolated_registry):
+    """
+    Test that operator symbols map onto registered calculators, including new ones.
+
+    This test registers a temporary power operation with the "^" symbol, which groups from the right.
+    """
+    # Arrange
+    @CalculatorFactory.register_calculator("power")
+    class PowerCalculator(Calculation):
+        operator_symbol = "^"
+        def excute(self) -> float:
+            return self.a ** self.b
+
+    # Act & Assert
+    assert evaluate_expression("2 ^ 3 ^ 2") == 512.0
+    assert evaluate_expression("2 * 3 ^ 2") == 18.0
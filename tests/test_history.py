@@ -0,0 +1,648 @@
+"""
+Tests for the history module of the application.
+
+These tests check that the array-backed History stores calculations in columns
+and rebuilds Calculation views only when entries are accessed, and that the
+HistoryLog keeps calculations on disk across sessions.
+"""
+
+import math
+import threading
+import pytest
+from array import array
+from app.calculation import CalculatorFactory, AddCalculator, DivideCalculator
+from app.history import History, HistoryLog, Range, SortedIndex
+
+
+def make_history(*rows):
+    """Helper that builds a History from (operation, a, b) rows."""
+    history = History()
+    for operation, a, b in rows:
+        calculation = CalculatorFactory.create_calculator(operation, a, b)
+        history.append(calculation, calculation.excute())
+    return history
+
+
+def test_history_empty():
+    """
+    Test that a new History is empty and falsy.
+    """
+    # Arrange & Act
+    history = History()
+
+    # Assert
+    assert len(history) == 0
+    assert not history
+    assert list(history) == []
+
+
+def test_history_append_and_entry():
+    """
+    Test that appended calculations are stored as raw rows.
+
+    This test checks the operation, operands and result returned by entry.
+    """
+    # Arrange
+    history = make_history(("add", 5.0, 3.0), ("divide", 8.0, 2.0))
+
+    # Act & Assert
+    assert len(history) == 2
+    assert history.entry(0) == ("add", 5.0, 3.0, 8.0)
+    assert history.entry(-1) == ("divide", 8.0, 2.0, 4.0)
+
+
+def test_history_uses_compact_columns():
+    """
+    Test that the history keeps its data in array columns.
+
+    This test checks that operands and results are doubles and operations are integer codes.
+    """
+    # Arrange
+    history = make_history(("multiply", 2.0, 3.0))
+
+    # Assert
+    assert isinstance(history._a, array) and history._a.typecode == "d"
+    assert isinstance(history._results, array) and history._results.typecode == "d"
+    assert list(history._codes) == [CalculatorFactory.operation_code("multiply")]
+
+
+def test_history_getitem_returns_calculation_view():
+    """
+    Test that indexing returns a Calculation of the original type.
+    """
+    # Arrange
+    history = make_history(("add", 5.0, 3.0), ("divide", 8.0, 2.0))
+
+    # Act
+    first = history[0]
+    last = history[-1]
+
+    # Assert
+    assert isinstance(first, AddCalculator)
+    assert isinstance(last, DivideCalculator)
+    assert str(first) == "AddCalculator: 5.0 + 3.0 = 8.0"
+    assert repr(last) == "DivideCalculator(a = 8.0, b = 2.0)"
+
+
+def test_history_slice_and_iteration():
+    """
+    Test slicing and iterating over the history.
+    """
+    # Arrange
+    history = make_history(("add", 1.0, 1.0), ("subtract", 5.0, 2.0), ("multiply", 2.0, 2.0))
+
+    # Act
+    sliced = history[1:]
+    iterated = [str(calculation) for calculation in history]
+
+    # Assert
+    assert [repr(calculation) for calculation in sliced] == [
+        "SubtractCalculator(a = 5.0, b = 2.0)",
+        "MultiplyCalculator(a = 2.0, b = 2.0)",
+    ]
+    assert iterated == [
+        "AddCalculator: 1.0 + 1.0 = 2.0",
+        "SubtractCalculator: 5.0 - 2.0 = 3.0",
+        "MultiplyCalculator: 2.0 * 2.0 = 4.0",
+    ]
+
+
+def test_history_index_error():
+    """
+    Test that indexing past the end raises IndexError like a list.
+    """
+    # Arrange
+    history = make_history(("add", 1.0, 1.0))
+
+    # Act & Assert
+    with pytest.raises(IndexError):
+        history[5]
+
+
+def test_history_clear():
+    """
+    Test that clear removes every entry.
+    """
+    # Arrange
+    history = make_history(("add", 1.0, 1.0), ("add", 2.0, 2.0))
+
+    # Act
+    history.clear()
+
+    # Assert
+    assert len(history) == 0
+
+
+def test_operation_code_round_trip():
+    """
+    Test that operation codes translate back to their operation types.
+    """
+    # Act & Assert
+    for operation in ("add", "subtract", "multiply", "divide"):
+        assert CalculatorFactory.operation_name(CalculatorFactory.operation_code(operation)) == operation
+
+
+def test_operation_code_invalid():
+    """
+    Test that unknown operation types and codes raise ValueError.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.operation_code("modulus")
+    assert "Operation 'modulus' is not supported." in str(e.value)
+
+    with pytest.raises(ValueError) as e:
+        CalculatorFactory.operation_name(999)
+    assert "Operation code 999 is not registered." in str(e.value)
+
+
+def test_history_view_does_not_reexecute(monkeypatch):
+    """
+    Test that Calculation views carry the stored result.
+
+    This test checks that formatting a history entry does not run the operation again.
+    """
+    # Arrange
+    history = make_history(("add", 5.0, 3.0))
+
+    def fail(a, b):
+        raise AssertionError("add should not be called again")
+    monkeypatch.setattr("app.operations.Operations.add", fail)
+
+    # Act
+    text = str(history[0])
+
+    # Assert
+    assert text == "AddCalculator: 5.0 + 3.0 = 8.0"
+
+
+def test_history_views_are_not_counted_as_creations():
+    """
+    Test that listing the history does not add to the creation counters of the statistics.
+    """
+    # Arrange
+    history = make_history(("add", 5.0, 3.0))
+    created = CalculatorFactory.stats_for("add").creations
+
+    # Act
+    for _ in range(5):
+        list(history)
+
+    # Assert
+    assert CalculatorFactory.stats_for("add").creations == created
+
+
+def append_rows(history, *rows):
+    """Helper that appends (operation, a, b) rows to an existing History."""
+    for operation, a, b in rows:
+        calculation = CalculatorFactory.create_calculator(operation, a, b)
+        history.append(calculation, calculation.excute())
+
+
+def test_history_log_roundtrip(tmp_path):
+    """
+    Test that a HistoryLog reopened from disk returns the same entries.
+    """
+    # Arrange
+    path = str(tmp_path / "history.log")
+    with HistoryLog(path) as log:
+        log.append("add", 5.0, 3.0, 8.0)
+        log.append("divide", 8.0, 2.0, 4.0)
+        log.append("add", 1.5, 1.5, 3.0)
+
+    # Act
+    with HistoryLog(path) as log:
+        entries = [log.read(i) for i in range(len(log))]
+
+    # Assert
+    assert entries == [("add", 5.0, 3.0, 8.0), ("divide", 8.0, 2.0, 4.0), ("add", 1.5, 1.5, 3.0)]
+
+
+def test_history_log_group_commit(tmp_path, monkeypatch):
+    """
+    Test that fsync is called once per group of appends rather than once per append.
+    """
+    # Arrange
+    calls = []
+    real_fsync = __import__("os").fsync
+    log = HistoryLog(str(tmp_path / "history.log"), group_size=4, group_interval=3600)
+    monkeypatch.setattr("app.history.os.fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+
+    # Act
+    for i in range(10):
+        log.append("add", float(i), 1.0, i + 1.0)
+    after_appends = len(calls)
+    log.close()
+
+    # Assert
+    assert after_appends == 2  # after the 4th and the 8th append
+    assert len(calls) == 3  # the last two appends are committed on close
+
+
+def test_history_log_commits_idle_group_after_interval(tmp_path, monkeypatch):
+    """
+    Test that the last appends of a group are committed within group_interval even if no append follows.
+    """
+    # Arrange
+    calls = []
+    committed = threading.Event()
+    real_fsync = __import__("os").fsync
+    log = HistoryLog(str(tmp_path / "history.log"), group_size=64, group_interval=0.05)
+    monkeypatch.setattr("app.history.os.fsync", lambda fd: (calls.append(fd), committed.set(), real_fsync(fd)))
+
+    # Act
+    log.append("add", 5.0, 3.0, 8.0)
+    on_time = committed.wait(timeout=5)
+    log.close()
+
+    # Assert
+    assert on_time
+    assert len(calls) == 1  # the timer committed the append, so close had nothing left to commit
+
+
+def test_history_log_truncates_torn_record(tmp_path):
+    """
+    Test that a partial record left by a crash is dropped when the log is reopened.
+    """
+    # Arrange
+    path = tmp_path / "history.log"
+    with HistoryLog(str(path)) as log:
+        log.append("add", 5.0, 3.0, 8.0)
+    complete_size = path.stat().st_size
+    with open(path, "ab") as file:
+        file.write(b"\x01\x00\x00\x12\x34")  # the first bytes of an entry record
+
+    # Act
+    with HistoryLog(str(path)) as log:
+        count = len(log)
+        log.append("multiply", 2.0, 3.0, 6.0)
+        last = log.read(-1)
+
+    # Assert
+    assert count == 1
+    assert last == ("multiply", 2.0, 3.0, 6.0)
+    assert path.stat().st_size > complete_size
+
+
+def test_history_log_rejects_other_files(tmp_path):
+    """
+    Test that opening a file that is not a history log raises ValueError.
+    """
+    # Arrange
+    path = tmp_path / "notes.txt"
+    path.write_text("add 5 3\n")
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        HistoryLog(str(path))
+    assert "is not a history log." in str(e.value)
+
+
+def test_history_log_invalid_group_size(tmp_path):
+    """
+    Test that a group size below 1 raises ValueError.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        HistoryLog(str(tmp_path / "history.log"), group_size=0)
+    assert "Group size must be at least 1." in str(e.value)
+
+
+def test_history_with_log_persists_across_sessions(tmp_path):
+    """
+    Test that a History backed by a log starts with the entries of earlier sessions.
+    """
+    # Arrange
+    path = str(tmp_path / "history.log")
+    first = History(HistoryLog(path))
+    append_rows(first, ("add", 5.0, 3.0), ("subtract", 10.0, 4.0))
+    first.close()
+
+    # Act
+    second = History(HistoryLog(path))
+    append_rows(second, ("multiply", 2.0, 3.0))
+
+    # Assert
+    assert len(second) == 3
+    assert [str(calculation) for calculation in second] == [
+        "AddCalculator: 5.0 + 3.0 = 8.0",
+        "SubtractCalculator: 10.0 - 4.0 = 6.0",
+        "MultiplyCalculator: 2.0 * 3.0 = 6.0",
+    ]
+    second.close()
+
+
+def test_history_resident_limit(tmp_path):
+    """
+    Test that only recent entries stay in memory and older ones are read back from the log.
+    """
+    # Arrange
+    history = History(HistoryLog(str(tmp_path / "history.log")), resident=3)
+
+    # Act
+    append_rows(history, *[("add", float(i), 1.0) for i in range(10)])
+
+    # Assert
+    assert len(history) == 10
+    assert len(history._codes) < 6  # never more than twice the resident limit
+    assert history.entry(0) == ("add", 0.0, 1.0, 1.0)  # read from the log
+    assert history.entry(-1) == ("add", 9.0, 1.0, 10.0)  # resident
+    assert [calculation.a for calculation in history[2:5]] == [2.0, 3.0, 4.0]
+    history.close()
+
+
+def test_history_reload_keeps_only_resident_rows(tmp_path):
+    """
+    Test that reopening a long log loads only the most recent entries into memory.
+    """
+    # Arrange
+    path = str(tmp_path / "history.log")
+    with HistoryLog(path) as log:
+        for i in range(20):
+            log.append("add", float(i), 1.0, i + 1.0)
+
+    # Act
+    history = History(HistoryLog(path), resident=5)
+
+    # Assert
+    assert len(history) == 20
+    assert len(history._codes) == 5
+    assert history.entry(3) == ("add", 3.0, 1.0, 4.0)
+    history.close()
+
+
+def test_history_clear_with_log(tmp_path):
+    """
+    Test that clearing a logged history also empties the log.
+    """
+    # Arrange
+    path = str(tmp_path / "history.log")
+    history = History(HistoryLog(path))
+    append_rows(history, ("add", 5.0, 3.0))
+
+    # Act
+    history.clear()
+    history.close()
+
+    # Assert
+    assert len(history) == 0
+    with HistoryLog(path) as log:
+        assert len(log) == 0
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"resident": 5}, "A resident limit requires a history log."),
+])
+def test_history_resident_requires_log(kwargs, message):
+    """
+    Test that a resident limit without a log raises ValueError.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        History(**kwargs)
+    assert message in str(e.value)
+
+
+def test_history_invalid_resident(tmp_path):
+    """
+    Test that a resident limit below 1 raises ValueError.
+    """
+    # Arrange
+    log = HistoryLog(str(tmp_path / "history.log"))
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        History(log, resident=0)
+    assert "Resident limit must be at least 1." in str(e.value)
+    log.close()
+
+
+def test_history_exact_keeps_values():
+    """
+    Test that an exact history stores Decimal and Fraction values without rounding them.
+    """
+    # Arrange
+    from fractions import Fraction
+    history = History(exact=True)
+    calculation = CalculatorFactory.create_calculator("divide", Fraction(1), Fraction(3))
+
+    # Act
+    history.append(calculation, calculation.excute())
+
+    # Assert
+    assert history.entry(0) == ("divide", Fraction(1), Fraction(3), Fraction(1, 3))
+    assert str(history[0]) == "DivideCalculator: 1 / 3 = 1/3"
+
+
+def test_history_exact_rejects_log(tmp_path):
+    """
+    Test that an exact history cannot be backed by a history log.
+    """
+    # Arrange
+    log = HistoryLog(str(tmp_path / "history.log"))
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        History(log, exact=True)
+    assert "A history log stores doubles and cannot keep exact values." in str(e.value)
+    log.close()
+
+
+@pytest.mark.parametrize("bounds, value, expected", [
+    (Range(3.5, 3.5), 3.5, True),
+    (Range(low=100, include_low=False), 100.0, False),
+    (Range(low=100, include_low=False), 100.5, True),
+    (Range(high=2), 2.0, True),
+    (Range(high=2, include_high=False), 2.0, False),
+    (Range(), float("nan"), False),
+])
+def test_range_contains(bounds, value, expected):
+    """
+    Test that ranges include or exclude their ends as requested.
+    """
+    # Act & Assert
+    assert (value in bounds) is expected
+
+
+def test_sorted_index_merges_pending_values():
+    """
+    Test that values added after a search are merged in, one by one or in bulk.
+    """
+    # Arrange
+    index = SortedIndex()
+    for position, value in enumerate([5.0, 1.0, 3.0, float("nan")] + [10.0] * 40):
+        index.add(value, position)
+
+    # Act
+    first = index.search(Range(2, 5)).tolist()
+    index.add(4.0, 100)  # a single pending value is inserted by binary search
+    second = sorted(index.search(Range(2, 5)))
+
+    # Assert
+    assert first == [2, 0]
+    assert second == [0, 2, 100]
+    assert index.count(Range()) == 44  # the NaN is not indexed
+
+
+def test_history_find():
+    """
+    Test queries by operation, operand and result, alone and combined.
+    """
+    # Arrange
+    history = make_history(("add", 5, 3), ("divide", 500, 2), ("divide", 6, 3), ("add", 3.5, 1), ("multiply", 3.5, 40))
+
+    # Act & Assert
+    assert history.find() == [0, 1, 2, 3, 4]
+    assert history.find("divide") == [1, 2]
+    assert history.find("divide", result=Range(low=100, include_low=False)) == [1]
+    assert history.find(a=Range(3.5, 3.5)) == [3, 4]
+    assert history.find("add", a=Range(3.5, 3.5), b=Range(high=2)) == [3]
+    assert history.find(result=Range(low=100)) == [1, 4]
+    assert history.find("power") == []
+    assert history.find("add", result=Range(low=1000)) == []
+
+
+@pytest.mark.parametrize("field, bounds", [
+    ("a", Range(math.nan, math.nan)),
+    ("b", Range(low=math.nan)),
+    ("result", Range(high=math.nan)),
+])
+def test_history_find_rejects_nan_bounds(field, bounds):
+    """
+    Test that NaN bounds raise ValueError instead of matching every entry.
+    """
+    # Arrange
+    history = make_history(("add", 5, 3), ("divide", 6, 3), ("add", 1, 1))
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        history.find(**{field: bounds})
+    assert f"The bounds of '{field}' cannot be NaN." in str(e.value)
+
+
+def test_history_find_indexes_new_entries():
+    """
+    Test that indexes built by a query are kept up to date by later appends, and reset by clear.
+    """
+    # Arrange
+    history = make_history(("add", 1, 1), ("divide", 8, 2))
+    assert history.find("divide", result=Range(low=3)) == [1]
+
+    # Act
+    append_rows(history, ("divide", 10, 2), ("add", 9, 9))
+
+    # Assert
+    assert history.find("divide", result=Range(low=3)) == [1, 2]
+    assert history.find("add") == [0, 3]
+    history.clear()
+    append_rows(history, ("add", 2, 2))
+    assert history.find("add", result=Range(low=3)) == [0]
+
+
+def test_history_find_reads_entries_from_log(tmp_path):
+    """
+    Test that queries cover entries that are only in the log.
+    """
+    # Arrange
+    history = History(HistoryLog(str(tmp_path / "history.log")), resident=2)
+    append_rows(history, *[("add", float(i), 1.0) for i in range(10)])
+
+    # Act & Assert
+    assert history.find(result=Range(high=3)) == [0, 1, 2]
+    assert history.find("add", a=Range(8, 8)) == [8]
+    history.close()
+
+
+def test_history_find_exact():
+    """
+    Test that an exact history is queried with its own number type.
+    """
+    # Arrange
+    from fractions import Fraction
+    history = History(exact=True)
+    for a in (Fraction(1, 3), Fraction(1, 2)):
+        calculation = CalculatorFactory.create_calculator("add", a, Fraction(0))
+        history.append(calculation, calculation.excute())
+
+    # Act & Assert
+    assert history.find(result=Range(Fraction(1, 3), Fraction(1, 3))) == [0]
+    assert history.find(result=Range(low=0.4)) == [1]
+
+
+def test_history_entries(tmp_path):
+    """
+    Test that entries yields the raw rows of log-only and resident entries, in order.
+    """
+    # Arrange
+    history = History(HistoryLog(str(tmp_path / "history.log")), resident=2)
+    append_rows(history, *[("add", float(i), 1.0) for i in range(5)])
+
+    # Act
+    rows = list(history.entries())
+
+    # Assert
+    assert rows == [("add", float(i), 1.0, i + 1.0) for i in range(5)]
+    history.close()
+
+
+def test_history_from_columns():
+    """
+    Test that a history built from columns uses the arrays as they are, translating foreign operation codes.
+    """
+    # Arrange
+    a = array("d", [5.0, 9.0])
+    names = [CalculatorFactory.operation_name(code) for code in range(2)]
+
+    # Act
+    same_codes = History.from_columns(names, array("H", [0, 1]), a, array("d", [3.0, 2.0]), array("d", [8.0, 7.0]))
+    reordered = History.from_columns(["divide", "unused"], array("H", [0]), array("d", [9.0]), array("d", [2.0]), array("d", [4.5]))
+
+    # Assert
+    assert same_codes._a is a
+    assert list(same_codes.entries()) == [(names[0], 5.0, 3.0, 8.0), (names[1], 9.0, 2.0, 7.0)]
+    assert reordered.entry(0) == ("divide", 9.0, 2.0, 4.5)
+
+
+def test_history_extend(tmp_path):
+    """
+    Test that extend adds raw rows like append does: to the columns, the built indexes and the log.
+    """
+    # Arrange
+    from fractions import Fraction
+    history = History(HistoryLog(str(tmp_path / "history.log")))
+    history.find("add")  # build the posting lists before extending
+    exact = History(exact=True)
+
+    # Act
+    history.extend([("add", 1.0, 2.0, 3.0), ("divide", 9.0, 2.0, 4.5), ("add", 4.0, 4.0, 8.0)])
+    exact.extend([("add", Fraction(1, 3), Fraction(1, 3), Fraction(2, 3))])
+
+    # Assert
+    assert list(history.entries()) == [("add", 1.0, 2.0, 3.0), ("divide", 9.0, 2.0, 4.5), ("add", 4.0, 4.0, 8.0)]
+    assert history.find("add") == [0, 2]
+    assert len(history.log) == 3
+    assert exact.entry(0) == ("add", Fraction(1, 3), Fraction(1, 3), Fraction(2, 3))
+    with pytest.raises(ValueError):
+        exact.extend([("modulus", 1, 2, 1)])
+    history.close()
+
+
+def test_history_column_chunks(tmp_path):
+    """
+    Test that column_chunks yields log-only entries in chunks of the given size, then the resident columns.
+    """
+    # Arrange
+    history = History(HistoryLog(str(tmp_path / "history.log")), resident=2)
+    append_rows(history, *[("add", float(i), 1.0) for i in range(7)])
+    code = CalculatorFactory.operation_code("add")
+
+    # Act
+    chunks = list(history.column_chunks(3))
+
+    # Assert: entries 0-3 are only in the log, 4-6 are resident
+    assert [len(chunk[0]) for chunk in chunks] == [3, 1, 3]
+    assert chunks[-1][1] is history._a
+    assert [list(chunk[1]) for chunk in chunks] == [[0.0, 1.0, 2.0], [3.0], [4.0, 5.0, 6.0]]
+    assert all(set(chunk[0]) == {code} for chunk in chunks)
+    assert [value for chunk in chunks for value in chunk[3]] == [i + 1.0 for i in range(7)]
+    history.close()
@@ -0,0 +1,217 @@
+"""
+Tests for the binary wire protocol module.
+"""
+
+import struct
+import pytest
+from array import array
+from io import BytesIO
+import app.protocol
+from app.calculation import CalculatorFactory
+from app.protocol import (
+    LENGTH,
+    MAX_FRAME_SIZE,
+    decode_request,
+    decode_response,
+    encode_error,
+    encode_request,
+    encode_response,
+    iter_frames,
+    process_request,
+    read_frame,
+    run_binary_batch,
+)
+
+
+def payload_of(frame: bytes) -> bytes:
+    """Helper that strips and checks the length prefix of a frame."""
+    (length,) = LENGTH.unpack_from(frame)
+    assert length == len(frame) - LENGTH.size
+    return frame[LENGTH.size:]
+
+
+def test_request_round_trip():
+    """
+    Test that a request decodes back into its operation and operand columns.
+    """
+    # Arrange
+    frame = encode_request("multiply", [1.0, 2.0, 3.0], array("d", [4.0, 5.0, 6.0]))
+
+    # Act
+    operation, a_values, b_values = decode_request(payload_of(frame))
+
+    # Assert
+    assert operation == "multiply"
+    assert list(a_values) == [1.0, 2.0, 3.0]
+    assert list(b_values) == [4.0, 5.0, 6.0]
+
+
+def test_request_layout_is_little_endian():
+    """
+    Test the exact byte layout of a request frame.
+    """
+    # Act
+    frame = encode_request("add", [1.5], [2.5])
+
+    # Assert
+    code = CalculatorFactory.operation_code("add")
+    assert frame == struct.pack("<IHIdd", 22, code, 1, 1.5, 2.5)
+
+
+def test_doubles_swapped_host(monkeypatch):
+    """
+    Test that a host whose byte order differs from the wire's reads 8 bytes per double and swaps them.
+    """
+    # Arrange: on this host, opposite-order doubles are what little-endian wire data is on the other kind of host.
+    monkeypatch.setattr(app.protocol, "_NATIVE_LITTLE_ENDIAN", False)
+    opposite = ">dd" if struct.pack("=d", 1.0) == struct.pack("<d", 1.0) else "<dd"
+    payload = memoryview(struct.pack(opposite, 1.5, -2.25))
+
+    # Act
+    values = app.protocol._doubles(payload)
+
+    # Assert
+    assert list(values) == [1.5, -2.25]
+
+
+def test_encode_request_length_mismatch():
+    """
+    Test that operand columns of different lengths are rejected.
+    """
+    with pytest.raises(ValueError) as e:
+        encode_request("add", [1.0], [])
+    assert "Operand columns must have the same length." in str(e.value)
+
+
+@pytest.mark.parametrize("payload, message", [
+    (b"\x00", "Truncated request frame."),
+    (struct.pack("<HI", 0, 2) + b"\x00" * 8, "Request frame size does not match its operand count."),
+])
+def test_decode_request_malformed(payload, message):
+    """
+    Parameterized test for malformed request payloads.
+    """
+    with pytest.raises(ValueError) as e:
+        decode_request(payload)
+    assert message in str(e.value)
+
+
+def test_response_round_trip():
+    """
+    Test that a successful response decodes into its results.
+    """
+    assert list(decode_response(payload_of(encode_response(array("d", [8.0, 6.0]))))) == [8.0, 6.0]
+
+
+def test_error_response_raises():
+    """
+    Test that an error response raises ValueError with the peer's message.
+    """
+    with pytest.raises(ValueError) as e:
+        decode_response(payload_of(encode_error("Cannot divide by zero.")))
+    assert str(e.value) == "Cannot divide by zero."
+
+
+@pytest.mark.parametrize("payload", [b"\x00", struct.pack("<BI", 7, 0), struct.pack("<BI", 0, 2)])
+def test_decode_response_malformed(payload):
+    """
+    Parameterized test for malformed response payloads.
+    """
+    with pytest.raises(ValueError):
+        decode_response(payload)
+
+
+def test_process_request_success():
+    """
+    Test that process_request evaluates every operand pair.
+    """
+    # Act
+    response = process_request(payload_of(encode_request("divide", [8.0, 9.0], [2.0, 3.0])))
+
+    # Assert
+    assert list(decode_response(payload_of(response))) == [4.0, 3.0]
+
+
+@pytest.mark.parametrize("payload, message", [
+    (payload_of(encode_request("divide", [1.0], [0.0])), "Cannot divide by zero."),
+    (struct.pack("<HI", 999, 0), "Operation code 999 is not registered."),
+    (b"", "Truncated request frame."),
+])
+def test_process_request_errors(payload, message):
+    """
+    Parameterized test for requests that produce error responses.
+    """
+    with pytest.raises(ValueError) as e:
+        decode_response(payload_of(process_request(payload)))
+    assert str(e.value) == message
+
+
+def test_read_frames_from_stream():
+    """
+    Test reading consecutive frames from a stream.
+    """
+    # Arrange
+    first = encode_request("add", [1.0], [2.0])
+    second = encode_request("subtract", [5.0], [3.0])
+    stream = BytesIO(first + second)
+
+    # Act
+    payloads = list(iter_frames(stream))
+
+    # Assert
+    assert payloads == [payload_of(first), payload_of(second)]
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"\x01\x00", "Truncated frame length."),
+    (LENGTH.pack(10) + b"\x00", "Truncated frame payload."),
+    (LENGTH.pack(MAX_FRAME_SIZE + 1), "exceeds"),
+])
+def test_read_frame_malformed(data, message):
+    """
+    Parameterized test for truncated and oversized frames.
+    """
+    with pytest.raises(ValueError) as e:
+        read_frame(BytesIO(data))
+    assert message in str(e.value)
+
+
+def test_run_binary_batch_file(tmp_path):
+    """
+    Test binary batch mode over a file of request frames.
+    """
+    # Arrange
+    path = tmp_path / "requests.bin"
+    path.write_bytes(encode_request("add", [1.0, 2.0], [3.0, 4.0]) + encode_request("divide", [1.0], [0.0]))
+    output = BytesIO()
+
+    # Act
+    count = run_binary_batch(str(path), output)
+
+    # Assert
+    assert count == 2
+    responses = list(iter_frames(BytesIO(output.getvalue())))
+    assert list(decode_response(responses[0])) == [4.0, 6.0]
+    with pytest.raises(ValueError):
+        decode_response(responses[1])
+
+
+def test_run_binary_batch_stdin(monkeypatch):
+    """
+    Test binary batch mode reading standard input and writing standard output.
+    """
+    # Arrange
+    class Stream:
+        def __init__(self, data=b""):
+            self.buffer = BytesIO(data)
+    stdin = Stream(encode_request("multiply", [2.0], [3.0]))
+    stdout = Stream()
+    monkeypatch.setattr('sys.stdin', stdin)
+    monkeypatch.setattr('sys.stdout', stdout)
+
+    # Act
+    count = run_binary_batch("-")
+
+    # Assert
+    assert count == 1
+    assert list(decode_response(payload_of(stdout.buffer.getvalue()))) == [6.0]
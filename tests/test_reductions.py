@@ -0,0 +1,207 @@
+"""
+Tests for the reductions module of the application.
+
+These tests check compensated summation, recognition of n-ary commands, streaming of
+operand files and left-to-right folding of the other operations.
+"""
+
+import math
+import pytest
+from app.reductions import (
+    CompensatedSum,
+    ReductionCommand,
+    evaluate_reduction,
+    iter_file_values,
+    reduce_values,
+    reduction_command,
+)
+
+
+def write_doubles(path, values):
+    """Helper that writes values to path as packed little-endian doubles."""
+    import struct
+    path.write_bytes(struct.pack(f"<{len(values)}d", *values))
+    return str(path)
+
+
+def test_compensated_sum_is_accurate():
+    """
+    Test that compensated summation keeps the digits that chained additions lose.
+    """
+    # Arrange
+    values = [0.1] * 1_000_000
+
+    # Act
+    total = CompensatedSum()
+    total.update(values)
+
+    # Assert
+    assert total.value == math.fsum(values) == 100000.0
+    assert sum(values) != 100000.0  # the naive sum drifts
+
+
+def test_compensated_sum_mixed_magnitudes():
+    """
+    Test that small values survive being added next to much larger ones.
+    """
+    # Arrange
+    total = CompensatedSum()
+
+    # Act
+    for value in (1e100, 1.0, -1e100):
+        total.add(value)
+
+    # Assert
+    assert total.value == 1.0
+
+
+def test_compensated_sum_infinite():
+    """
+    Test that an infinite total is returned as is, instead of nan from the compensation.
+    """
+    # Arrange
+    total = CompensatedSum()
+
+    # Act
+    total.update([float("inf"), 1.0])
+
+    # Assert
+    assert total.value == float("inf")
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("add 1 2 3", ReductionCommand("add", ("1", "2", "3"))),
+    ("MULTIPLY 1 2 3 4", ReductionCommand("multiply", ("1", "2", "3", "4"))),
+    ("sum @values.bin", ReductionCommand("sum", ("@values.bin",))),
+    ("sum 1 2", ReductionCommand("sum", ("1", "2"))),
+    ("add 1 2", None),
+    ("add 5", None),
+    ("sum", None),
+    ("1 + 2 + 3", None),
+])
+def test_reduction_command(line, expected):
+    """
+    Test that only "sum" lines and operations with three or more operands are reductions.
+    """
+    # Act & Assert
+    assert reduction_command(line.split()) == expected
+
+
+def test_iter_file_values_in_chunks(tmp_path, monkeypatch):
+    """
+    Test that operand files are streamed chunk by chunk.
+    """
+    # Arrange
+    import app.reductions
+    monkeypatch.setattr(app.reductions, "READ_CHUNK", 2)
+    path = write_doubles(tmp_path / "values.bin", [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    # Act & Assert
+    assert list(iter_file_values(path)) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("operands, message", [
+    (("@{tmp}/missing.bin",), "Cannot read vector file"),
+    (("@{tmp}/odd.bin",), "does not contain packed doubles."),
+    (("1", "x"), "Invalid operand 'x'."),
+])
+def test_evaluate_reduction_invalid_operands(tmp_path, operands, message):
+    """
+    Test that unreadable files, truncated files and invalid numbers raise ValueError.
+    """
+    # Arrange
+    (tmp_path / "odd.bin").write_bytes(b"\x00" * 12)
+    command = ReductionCommand("sum", tuple(token.format(tmp=tmp_path) for token in operands))
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        evaluate_reduction(command)
+    assert message in str(e.value)
+
+
+def test_evaluate_reduction_files(tmp_path):
+    """
+    Test that file and number operands are mixed in order, and files can be refused.
+    """
+    # Arrange
+    path = write_doubles(tmp_path / "values.bin", [0.1] * 10)
+    command = ReductionCommand("sum", (f"@{path}", "1"))
+
+    # Act & Assert
+    assert evaluate_reduction(command) == 2.0
+    with pytest.raises(ValueError) as e:
+        evaluate_reduction(command, allow_files=False)
+    assert "File operands are not allowed here." in str(e.value)
+
+
+@pytest.mark.parametrize("operation, values, expected", [
+    ("add", [1, 2, 3, 4], 10.0),
+    ("sum", [0.1, 0.2, 0.3], 0.6),
+    ("subtract", [10, 1, 2], 7.0),
+    ("multiply", [1, 2, 3, 4], 24.0),
+    ("divide", [100, 2, 5], 10.0),
+    ("add", [5], 5.0),
+])
+def test_reduce_values(operation, values, expected):
+    """
+    Test that every operation is applied from left to right.
+    """
+    # Act & Assert
+    assert reduce_values(operation, map(float, values)) == expected
+
+
+def test_reduce_values_errors():
+    """
+    Test that empty input, unknown operations and division by zero raise errors.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        reduce_values("add", [])
+    assert "A reduction needs at least one value." in str(e.value)
+    with pytest.raises(ValueError) as e:
+        reduce_values("modulus", [1.0, 2.0, 3.0])
+    assert "Operation 'modulus' is not supported." in str(e.value)
+    with pytest.raises(ZeroDivisionError):
+        reduce_values("divide", [1.0, 2.0, 0.0])
+
+
+@pytest.mark.parametrize("operation, operands, expected", [
+    ("sum", ("0.1", "0.2", "0.3"), "0.6"),
+    ("add", ("0.1", "0.2"), "0.3"),
+    ("multiply", ("1.5", "2", "3"), "9.0"),
+    ("divide", ("1", "4", "2"), "0.125"),
+])
+def test_evaluate_reduction_with_backend(operation, operands, expected):
+    """
+    Test that a backend parses the operands and reduces them without float rounding.
+    """
+    # Arrange
+    from app.backends import get_backend
+    command = ReductionCommand(operation, operands)
+
+    # Act
+    result = evaluate_reduction(command, backend=get_backend("decimal"))
+
+    # Assert
+    assert str(result) == expected
+
+
+def test_evaluate_reduction_with_backend_errors(tmp_path):
+    """
+    Test that a backend rejects file operands, invalid numbers and unknown operations.
+    """
+    # Arrange
+    from app.backends import get_backend
+    backend = get_backend("fraction")
+    path = write_doubles(tmp_path / "values.bin", [1.0])
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        evaluate_reduction(ReductionCommand("sum", (f"@{path}", "1")), backend=backend)
+    assert "File operands hold doubles and cannot be used with the fraction backend." in str(e.value)
+    with pytest.raises(ValueError) as e:
+        evaluate_reduction(ReductionCommand("sum", ("1", "x")), backend=backend)
+    assert "Invalid operand 'x'." in str(e.value)
+    with pytest.raises(ValueError) as e:
+        evaluate_reduction(ReductionCommand("modulus", ("1", "2", "3")), backend=backend)
+    assert "Operation 'modulus' is not supported." in str(e.value)
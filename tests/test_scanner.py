@@ -0,0 +1,108 @@
+"""
+Tests for the fast-path command scanner.
+"""
+
+import math
+import runpy
+import pytest
+from app.calculation import CalculatorFactory
+from app.scanner import EMPTY, MALFORMED, UNKNOWN_OPERATION, parse_throughput, sample_lines, scan
+
+
+@pytest.mark.parametrize("line, operation, a, b", [
+    ("add 5 3", "add", 5.0, 3.0),
+    ("  SUBTRACT 10 4  \n", "subtract", 10.0, 4.0),
+    ("multiply -1.5e3 +.5", "multiply", -1500.0, 0.5),
+    ("divide 5. -.5", "divide", 5.0, -0.5),
+    ("add 1_000 inf", "add", 1000.0, math.inf),
+    ("add -Infinity 1E-2", "add", -math.inf, 0.01),
+    ("add \u0665 1", "add", 5.0, 1.0),
+])
+def test_scan_valid(line, operation, a, b):
+    """
+    Parameterized test for lines the scanner accepts, in every number form float() accepts.
+    """
+    assert scan(line) == (CalculatorFactory.operation_code(operation), a, b)
+
+
+def test_scan_nan():
+    """
+    Test that nan is accepted (and compared with isnan, since nan != nan).
+    """
+    code, a, b = scan("add nan NaN")
+    assert code == CalculatorFactory.operation_code("add")
+    assert math.isnan(a) and math.isnan(b)
+
+
+@pytest.mark.parametrize("line, error", [
+    ("", EMPTY),
+    ("   \n", EMPTY),
+    ("add 5", MALFORMED),
+    ("add 5 3 1", MALFORMED),
+    ("add five three", MALFORMED),
+    ("add 5 three", MALFORMED),
+    ("add --5 2", MALFORMED),
+    ("add - 2", MALFORMED),
+    ("add -. 2", MALFORMED),
+    ("add 1.2.3 4", MALFORMED),
+    ("add 1e 2", MALFORMED),
+    ("add 5x 3", MALFORMED),
+    ("modulus 5x 3", MALFORMED),
+    ("add ² 1", MALFORMED),
+    ("modulus 5 3", UNKNOWN_OPERATION),
+])
+def test_scan_errors(line, error):
+    """
+    Parameterized test for lines the scanner rejects; none of them raise.
+    """
+    assert scan(line) == (error, 0.0, 0.0)
+
+
+def test_scan_agrees_with_float():
+    """
+    Test that every number token the scanner accepts is one float() can convert, and vice versa.
+    """
+    tokens = ["5", "-5", "+5", "5.", ".5", "-.5", "1e5", "1E+5", "1_0", "inf", "-nan", "1__0", "e5", "5e", ".", "+-1", "0x10"]
+    for token in tokens:
+        try:
+            float(token)
+            convertible = True
+        except ValueError:
+            convertible = False
+        assert (scan(f"add {token} 1")[0] >= 0) == convertible, token
+
+
+def test_sample_lines():
+    """
+    Test that the benchmark sample mixes valid and malformed lines as requested.
+    """
+    lines = sample_lines(100, malformed_ratio=0.5)
+    malformed = sum(1 for line in lines if scan(line)[0] == MALFORMED)
+    assert len(lines) == 100
+    assert malformed == 50
+    assert all(scan(line)[0] >= 0 for line in sample_lines(10, malformed_ratio=0))
+
+
+def test_parse_throughput():
+    """
+    Test that the throughput benchmark reports both parsers.
+    """
+    result = parse_throughput(sample_lines(200), rounds=1)
+    assert result["lines"] == 200
+    assert result["before_lines_per_second"] > 0
+    assert result["after_lines_per_second"] > 0
+    assert result["speedup"] == result["after_lines_per_second"] / result["before_lines_per_second"]
+
+
+def test_scanner_benchmark_main(monkeypatch, capsys):
+    """
+    Test the "python -m app.scanner" benchmark entry point with a tiny sample.
+    """
+    monkeypatch.setattr("sys.argv", ["app.scanner", "50", "0.5"])
+    runpy.run_module("app.scanner", run_name="__main__")
+    captured = capsys.readouterr()
+    assert "lines:            50" in captured.out
+    assert "lines/s" in captured.out
+    # The all-valid case is always reported next to the requested ratio.
+    assert "malformed:        0%" in captured.out
+    assert "malformed:        50%" in captured.out
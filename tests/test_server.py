@@ -0,0 +1,216 @@
+"""
+Tests for the asyncio calculation server.
+
+Each test starts a real server on a free local port (or a Unix socket) inside asyncio.run.
+"""
+
+import asyncio
+import pytest
+from app.server import LINE_LIMIT, parse_address, serve, start_server, start_unix_server
+from app.protocol import LENGTH as LENGTH_STRUCT, MAX_FRAME_SIZE, decode_response, encode_request
+
+
+async def exchange(reader, writer, payload: bytes, replies: int) -> list:
+    """Helper that sends payload and reads the given number of reply lines."""
+    writer.write(payload)
+    await writer.drain()
+    return [(await reader.readline()).decode().strip() for _ in range(replies)]
+
+
+def test_server_single_request():
+    """
+    Test one request and response over TCP.
+    """
+    async def scenario():
+        server = await start_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = await exchange(reader, writer, b"add 5 3\n", 1)
+            writer.close()
+            await writer.wait_closed()
+        return replies
+
+    assert asyncio.run(scenario()) == ["8.0"]
+
+
+def test_server_pipelined_requests():
+    """
+    Test that pipelined requests are answered in order, including errors and blank lines.
+    """
+    async def scenario():
+        server = await start_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            payload = b"add 1 2\n\ndivide 1 0\nMULTIPLY 2 3\nbogus\nexit\n"
+            replies = await exchange(reader, writer, payload, 4)
+            closed = await reader.read()  # the server closes the connection after 'exit'
+            writer.close()
+            await writer.wait_closed()
+        return replies, closed
+
+    replies, closed = asyncio.run(scenario())
+    assert replies == [
+        "3.0",
+        "error: Cannot divide by zero.",
+        "6.0",
+        "error: Invalid input. Please follow the format: <operation> <num1> <num2>",
+    ]
+    assert closed == b""
+
+
+def test_server_many_concurrent_clients():
+    """
+    Test that many clients can be served at the same time by one server.
+    """
+    async def client(port, i):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = await exchange(reader, writer, f"add {i} 1\n".encode(), 1)
+        writer.close()
+        await writer.wait_closed()
+        return replies[0]
+
+    async def scenario():
+        server = await start_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(*(client(port, i) for i in range(200)))
+
+    assert asyncio.run(scenario()) == [f"{i + 1}.0" for i in range(200)]
+
+
+def test_server_line_too_long():
+    """
+    Test that an oversized request line gets an error and the connection is closed.
+    """
+    async def scenario():
+        server = await start_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"a" * (LINE_LIMIT + 10) + b"\n")
+            await writer.drain()
+            reply = await reader.read()
+            writer.close()
+            await writer.wait_closed()
+        return reply
+
+    assert asyncio.run(scenario()) == b"error: Request line too long.\n"
+
+
+def test_unix_server(tmp_path):
+    """
+    Test the Unix-socket server.
+    """
+    path = str(tmp_path / "calc.sock")
+
+    async def scenario():
+        server = await start_unix_server(path)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            replies = await exchange(reader, writer, b"subtract 10 4\n", 1)
+            writer.close()
+            await writer.wait_closed()
+        return replies
+
+    assert asyncio.run(scenario()) == ["6.0"]
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("8765", ("tcp", "127.0.0.1", 8765)),
+    ("0.0.0.0:9000", ("tcp", "0.0.0.0", 9000)),
+    ("unix:/tmp/calc.sock", ("unix", "/tmp/calc.sock")),
+])
+def test_parse_address(address, expected):
+    """
+    Parameterized test for the accepted server address forms.
+    """
+    assert parse_address(address) == expected
+
+
+def test_parse_address_invalid():
+    """
+    Test that a malformed address raises ValueError.
+    """
+    with pytest.raises(ValueError) as e:
+        parse_address("localhost:http")
+    assert "Invalid server address 'localhost:http'." in str(e.value)
+
+
+@pytest.mark.parametrize("kind", ["tcp", "unix"])
+def test_serve_until_cancelled(tmp_path, kind):
+    """
+    Test that serve listens on the given address and stops when cancelled.
+    """
+    address = "127.0.0.1:0" if kind == "tcp" else f"unix:{tmp_path / 'calc.sock'}"
+
+    async def scenario():
+        ready = asyncio.Event()
+        task = asyncio.create_task(serve(address, ready))
+        await ready.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+
+#========== Tests for the binary frame server ===========
+
+def test_binary_server_pipelined_frames():
+    """
+    Test that pipelined binary frames are answered in order.
+    """
+    async def read_response(reader):
+        (length,) = LENGTH_STRUCT.unpack(await reader.readexactly(4))
+        return await reader.readexactly(length)
+
+    async def scenario():
+        server = await start_server("127.0.0.1", 0, binary=True)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(encode_request("add", [1.0, 2.0], [3.0, 4.0]) + encode_request("divide", [1.0], [0.0]))
+            await writer.drain()
+            first = await read_response(reader)
+            second = await read_response(reader)
+            # An oversized frame gets an error response and the connection is closed.
+            writer.write(LENGTH_STRUCT.pack(MAX_FRAME_SIZE + 1))
+            await writer.drain()
+            third = await read_response(reader)
+            closed = await reader.read()
+            writer.close()
+            await writer.wait_closed()
+        return first, second, third, closed
+
+    first, second, third, closed = asyncio.run(scenario())
+    assert list(decode_response(first)) == [4.0, 6.0]
+    with pytest.raises(ValueError) as e:
+        decode_response(second)
+    assert str(e.value) == "Cannot divide by zero."
+    with pytest.raises(ValueError) as e:
+        decode_response(third)
+    assert "exceeds" in str(e.value)
+    assert closed == b""
+
+
+def test_binary_unix_server(tmp_path):
+    """
+    Test the binary frame format over a Unix socket, closing cleanly after one frame.
+    """
+    path = str(tmp_path / "calc.sock")
+
+    async def scenario():
+        server = await start_unix_server(path, binary=True)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(encode_request("multiply", [2.0], [3.0]))
+            await writer.drain()
+            (length,) = LENGTH_STRUCT.unpack(await reader.readexactly(4))
+            payload = await reader.readexactly(length)
+            writer.close()
+            await writer.wait_closed()
+        return payload
+
+    assert list(decode_response(asyncio.run(scenario()))) == [6.0]
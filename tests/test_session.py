@@ -0,0 +1,171 @@
+"""
+Tests for the session module of the application.
+
+These tests check that session snapshots restore the history and the variables,
+for float and exact sessions, and that invalid snapshots are rejected.
+"""
+
+import json
+import pytest
+from array import array
+from fractions import Fraction
+from app.backends import get_backend
+from app.calculation import CalculatorFactory
+from app.history import History, HistoryLog
+from app.variables import Workspace
+from app.session import SNAPSHOT_HEADER, SNAPSHOT_MAGIC, load_session, save_session
+
+
+def append_rows(history, *rows):
+    """Helper that appends (operation, a, b) rows to a History."""
+    for operation, a, b in rows:
+        calculation = CalculatorFactory.create_calculator(operation, a, b)
+        history.append(calculation, calculation.excute())
+    return history
+
+
+def test_save_and_load_session(tmp_path):
+    """
+    Test that a float session is restored with its history and variables, without recomputing them.
+    """
+    # Arrange
+    history = append_rows(History(), ("add", 5.0, 3.0), ("divide", 9.0, 2.0))
+    workspace = Workspace()
+    workspace.define("x = add 5 3")
+    workspace.define("y = multiply x 2")
+    path = str(tmp_path / "session.snap")
+
+    # Act
+    count = save_session(path, history, workspace)
+    before = CalculatorFactory.stats_for("multiply").executions
+    created = CalculatorFactory.stats_for("multiply").creations
+    restored_history, restored_workspace = load_session(path)
+
+    # Assert
+    assert count == 2
+    assert list(restored_history.entries()) == list(history.entries())
+    assert [str(variable) for variable in restored_workspace] == [str(variable) for variable in workspace]
+    assert CalculatorFactory.stats_for("multiply").executions == before
+    assert CalculatorFactory.stats_for("multiply").creations == created
+    _, recomputed = restored_workspace.define("x = 1")  # the dependency graph is restored too
+    assert recomputed == ["y"] and restored_workspace["y"].value == 2.0
+
+
+def test_save_session_with_history_log(tmp_path):
+    """
+    Test that a history backed by a log is saved with the entries that are only in the log.
+    """
+    # Arrange
+    history = History(HistoryLog(str(tmp_path / "history.log")), resident=2)
+    append_rows(history, *[("add", float(i), 1.0) for i in range(6)])
+    path = str(tmp_path / "session.snap")
+
+    # Act
+    save_session(path, history, Workspace())
+    history.close()
+    restored, _ = load_session(path)
+
+    # Assert
+    assert [row[1] for row in restored.entries()] == [float(i) for i in range(6)]
+    assert restored.log is None
+
+
+def test_save_and_load_exact_session(tmp_path):
+    """
+    Test that an exact session keeps its Fraction values, and must be loaded with the same backend.
+    """
+    # Arrange
+    backend = get_backend("fraction")
+    history = append_rows(History(exact=True), ("divide", Fraction(1), Fraction(3)))
+    workspace = Workspace(backend)
+    workspace.define("x = 1/3")
+    workspace.define("y = add x x")
+    path = str(tmp_path / "session.snap")
+
+    # Act
+    save_session(path, history, workspace)
+    restored_history, restored_workspace = load_session(path, backend)
+
+    # Assert
+    assert restored_history.exact
+    assert restored_history.entry(0) == ("divide", Fraction(1), Fraction(3), Fraction(1, 3))
+    assert restored_workspace["y"].value == Fraction(2, 3)
+    with pytest.raises(ValueError) as e:
+        load_session(path)
+    assert "was saved by a session with the fraction backend" in str(e.value)
+
+
+def test_load_session_invalid(tmp_path):
+    """
+    Test that files that are not snapshots, or have a damaged history, raise ValueError.
+    """
+    # Arrange
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a snapshot at all")
+    metadata = json.dumps({"backend": "float", "variables": []}).encode()
+    truncated = tmp_path / "truncated.snap"
+    truncated.write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(metadata)) + metadata + b"CALC")
+
+    # Act & Assert
+    for path in (other, truncated):
+        with pytest.raises(ValueError) as e:
+            load_session(str(path))
+        assert "is not a session snapshot." in str(e.value)
+
+
+@pytest.mark.parametrize("metadata", [
+    {},
+    [],
+    "snapshot",
+    {"backend": "float"},
+    {"variables": []},
+    {"backend": "float", "variables": [{"name": "x"}]},
+    {"backend": "float", "variables": [{"name": "y", "operation": "add", "operands": [{"variable": "x"}, {"number": "1"}], "value": "2"}]},
+    {"backend": "float", "variables": [], "history": [7]},
+    {"backend": "float", "variables": 3},
+])
+def test_load_session_invalid_metadata(tmp_path, metadata):
+    """
+    Test that snapshots whose metadata has missing keys or values of the wrong type raise ValueError.
+    """
+    # Arrange
+    encoded = json.dumps(metadata).encode()
+    path = tmp_path / "bad.snap"
+    path.write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(encoded)) + encoded)
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        load_session(str(path))
+    assert f"'{path}' is not a session snapshot." in str(e.value)
+
+
+def test_load_session_oversized_row_count(tmp_path):
+    """
+    Test that a snapshot whose history claims more rows than the file holds raises ValueError, not MemoryError.
+    """
+    # Arrange
+    from app.export import COLUMNAR_HEADER, COLUMNAR_MAGIC
+    metadata = json.dumps({"backend": "float", "variables": []}).encode()
+    path = tmp_path / "s.bin"
+    path.write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(metadata)) + metadata + COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, 2 ** 62))
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        load_session(str(path))
+    assert f"'{path}' is not a session snapshot." in str(e.value)
+
+
+def test_load_session_unknown_operation(tmp_path):
+    """
+    Test that a snapshot whose variables use an operation that is not registered here is rejected.
+    """
+    # Arrange
+    records = [{"name": "x", "operation": "power", "operands": [{"number": "2"}, {"number": "3"}], "value": "8"}]
+    metadata = json.dumps({"backend": "float", "variables": records}).encode()
+    path = tmp_path / "session.snap"
+    path.write_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(metadata)) + metadata)
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        load_session(str(path))
+    assert "The snapshot uses operations that are not registered: power." in str(e.value)
@@ -0,0 +1,193 @@
+"""
+Tests for the per-operation statistics module and its use by the CalculatorFactory.
+"""
+
+import pytest
+from app.calculation import CalculatorFactory
+from app.stats import BUCKET_BOUNDS_NS, OperationStats, format_ns, format_table
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    """Fixture that starts and ends every test with empty statistics."""
+    CalculatorFactory.reset_stats()
+    yield
+    CalculatorFactory.reset_stats()
+
+
+def test_observe_fills_buckets():
+    """
+    Test that observed latencies land in the right histogram buckets.
+    """
+    # Arrange
+    stats = OperationStats()
+
+    # Act
+    stats.observe(100)          # first bucket
+    stats.observe(500)          # bucket bounded by 500 (bounds are inclusive)
+    stats.observe(10 ** 9)      # overflow bucket
+
+    # Assert
+    assert stats.executions == 3
+    assert stats.buckets[0] == 1
+    assert stats.buckets[BUCKET_BOUNDS_NS.index(500)] == 1
+    assert stats.buckets[-1] == 1
+    assert stats.max_ns == 10 ** 9
+    assert stats.total_ns == 100 + 500 + 10 ** 9
+
+
+def test_percentiles():
+    """
+    Test percentile estimates from the histogram.
+    """
+    # Arrange
+    stats = OperationStats()
+    for _ in range(98):
+        stats.observe(200)
+    stats.observe(40_000)
+    stats.observe(10 ** 9)
+
+    # Act & Assert
+    assert stats.percentile(50) == 250          # upper bound of the first bucket
+    assert stats.percentile(99) == 50_000       # upper bound of the 25us-50us bucket
+    assert stats.percentile(100) == 10 ** 9     # overflow bucket reports the maximum
+    assert OperationStats().percentile(50) == 0
+
+
+def test_snapshot():
+    """
+    Test the snapshot dictionary.
+    """
+    # Arrange
+    stats = OperationStats()
+    stats.creations = 2
+    stats.errors = 1
+    stats.observe(300)
+
+    # Act
+    snapshot = stats.snapshot()
+
+    # Assert
+    assert snapshot == {
+        "creations": 2, "executions": 1, "errors": 1, "mean_ns": 300,
+        "p50_ns": 300, "p95_ns": 300, "p99_ns": 300, "max_ns": 300,
+    }
+    assert OperationStats().snapshot()["mean_ns"] == 0
+
+
+@pytest.mark.parametrize("latency, expected", [
+    (250, "250ns"),
+    (2_500, "2.5us"),
+    (2_500_000, "2.5ms"),
+    (2_500_000_000, "2.50s"),
+])
+def test_format_ns(latency, expected):
+    """
+    Parameterized test for latency formatting.
+    """
+    assert format_ns(latency) == expected
+
+
+def test_format_table():
+    """
+    Test that the table has a header and one sorted row per operation.
+    """
+    stats = {"divide": OperationStats().snapshot(), "add": OperationStats().snapshot()}
+    lines = format_table(stats).splitlines()
+    assert lines[0].split() == ["operation", "created", "executed", "errors", "p50", "p95", "p99"]
+    assert [line.split()[0] for line in lines[1:]] == ["add", "divide"]
+
+
+def test_factory_counts_creations_executions_and_errors():
+    """
+    Test that the factory records creations, executions, latencies and errors per operation.
+    """
+    # Act
+    CalculatorFactory.create_calculator("add", 5.0, 3.0).result
+    CalculatorFactory.create_calculator("add", 1.0, 1.0)
+    with pytest.raises(ZeroDivisionError):
+        CalculatorFactory.create_calculator("divide", 1.0, 0.0).result
+    stats = CalculatorFactory.get_stats()
+
+    # Assert
+    assert stats["add"]["creations"] == 2
+    assert stats["add"]["executions"] == 1
+    assert stats["add"]["p50_ns"] > 0
+    assert stats["divide"]["creations"] == 1
+    assert stats["divide"]["executions"] == 0
+    assert stats["divide"]["errors"] == 1
+
+
+def test_factory_counts_batch_rows():
+    """
+    Test that evaluate_batch counts one execution per row, and one error per failed batch.
+    """
+    # Act
+    CalculatorFactory.evaluate_batch("multiply", [1.0, 2.0, 3.0], [1.0, 1.0, 1.0])
+    with pytest.raises(ZeroDivisionError):
+        CalculatorFactory.evaluate_batch("divide", [1.0], [0.0])
+
+    # Assert
+    assert CalculatorFactory.stats_for("multiply").executions == 3
+    assert CalculatorFactory.stats_for("divide").errors == 1
+
+
+def test_reset_stats():
+    """
+    Test that reset_stats clears every operation.
+    """
+    CalculatorFactory.create_calculator("add", 1.0, 1.0)
+    CalculatorFactory.reset_stats()
+    assert CalculatorFactory.get_stats() == {}
+
+
+def test_merge():
+    """
+    Test that merging adds the counters and histograms and keeps the largest latency.
+    """
+    # Arrange
+    first, second = OperationStats(), OperationStats()
+    first.observe(100)
+    second.observe(2_000)
+    second.errors += 1
+
+    # Act
+    first.merge(second)
+
+    # Assert
+    assert first.executions == 2 and first.errors == 1
+    assert first.total_ns == 2_100 and first.max_ns == 2_000
+    assert sum(first.buckets) == 2
+
+
+def test_factory_stats_are_counted_per_thread():
+    """
+    Test that every thread counts into its own shard, and get_stats adds all of them up without losing updates.
+    """
+    # Arrange
+    import threading
+    threads_count, calls = 16, 2_000
+    barrier = threading.Barrier(threads_count)
+
+    def work():
+        barrier.wait()
+        for _ in range(calls):
+            CalculatorFactory.compute("add", 1.0, 2.0)
+        CalculatorFactory.create_calculator("multiply", 2.0, 3.0).result
+
+    threads = [threading.Thread(target=work) for _ in range(threads_count)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = CalculatorFactory.get_stats()
+
+    # Assert
+    assert stats["add"]["executions"] == threads_count * calls
+    assert stats["multiply"]["creations"] == threads_count
+    assert stats["multiply"]["executions"] == threads_count
+    assert CalculatorFactory.stats_for("add").executions == 0  # this thread's own shard
+    CalculatorFactory.reset_stats()
+    assert CalculatorFactory.get_stats() == {}
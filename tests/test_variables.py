@@ -0,0 +1,170 @@
+"""
+Tests for the variables module of the application.
+
+These tests check assignments, incremental recomputation of dependents, all-or-nothing
+failures and the validation of names, operands and cycles.
+"""
+
+import pytest
+from fractions import Fraction
+from app.backends import get_backend
+from app.calculation import CalculatorFactory
+from app.variables import Variable, Workspace
+
+
+@pytest.fixture
+def workspace():
+    """Fixture with the chain x -> y -> z and an unrelated variable w."""
+    workspace = Workspace()
+    workspace.define("x = add 5 3")
+    workspace.define("y = multiply x 2")
+    workspace.define("z = subtract y 1")
+    workspace.define("w = add 1 1")
+    return workspace
+
+
+def test_define_chain(workspace):
+    """
+    Test that variables are computed from numbers and from other variables.
+    """
+    # Act & Assert
+    assert [variable.value for variable in workspace] == [8.0, 16.0, 15.0, 2.0]
+    assert str(workspace["y"]) == "y = multiply x 2.0 = 16.0"
+    assert workspace["y"].dependencies() == ["x"]
+    assert "z" in workspace and len(workspace) == 4
+
+
+def test_reassign_recomputes_only_dependents(workspace):
+    """
+    Test that reassigning a variable recomputes its transitive dependents and nothing else.
+    """
+    # Arrange
+    unrelated = workspace["w"].calculation
+
+    # Act
+    variable, recomputed = workspace.define("x = 10")
+
+    # Assert
+    assert str(variable) == "x = 10.0"
+    assert recomputed == ["y", "z"]
+    assert workspace["z"].value == 19.0
+    assert workspace["w"].calculation is unrelated  # memoized result kept
+
+
+def test_reassign_with_same_value_stops_recomputation(workspace):
+    """
+    Test that dependents are not recomputed when the reassigned variable keeps its value.
+    """
+    # Arrange
+    before = CalculatorFactory.stats_for("multiply").executions
+
+    # Act
+    _, recomputed = workspace.define("x = multiply 4 2")
+
+    # Assert
+    assert recomputed == []
+    assert CalculatorFactory.stats_for("multiply").executions == before + 1  # only x itself
+
+
+def test_redefine_moves_dependencies(workspace):
+    """
+    Test that a redefined variable no longer depends on its old operands.
+    """
+    # Act
+    workspace.define("y = multiply w 3")
+    _, recomputed = workspace.define("x = 1")
+    _, recomputed_w = workspace.define("w = 3")
+
+    # Assert
+    assert recomputed == []
+    assert recomputed_w == ["y", "z"]
+    assert workspace["z"].value == 8.0
+
+
+def test_recompute_in_dependency_order():
+    """
+    Test that a variable reached through several paths is recomputed once, after all its inputs.
+    """
+    # Arrange
+    workspace = Workspace()
+    workspace.define("a = 1")
+    workspace.define("b = add a 1")
+    workspace.define("c = multiply a b")
+    workspace.define("d = add c b")
+
+    # Act
+    _, recomputed = workspace.define("a = 2")
+
+    # Assert
+    assert recomputed == ["b", "c", "d"]
+    assert workspace["d"].value == 9.0
+
+
+def test_failed_assignment_changes_nothing(workspace):
+    """
+    Test that an error in a dependent leaves every variable as it was.
+    """
+    # Arrange
+    workspace.define("v = divide 1 z")
+
+    # Act & Assert
+    with pytest.raises(ZeroDivisionError):
+        workspace.define("x = 0.5")
+    assert workspace["x"].value == 8.0
+    assert workspace["v"].value == 1 / 15
+
+
+@pytest.mark.parametrize("source, message", [
+    ("x = y", "Variable 'x' cannot depend on itself."),
+    ("x = add x 1", "Variable 'x' cannot depend on itself."),
+    ("y = add q 1", "Variable 'q' is not defined."),
+    ("add = 5", "'add' is a command or operation and cannot be a variable name."),
+    ("history = 5", "'history' is a command or operation and cannot be a variable name."),
+    ("2x = 5", "Invalid variable name '2x'."),
+    ("x = add 1", "Invalid assignment."),
+    ("x = add 1 2,3", "Invalid operand '2,3'."),
+    ("x = modulus 1 2", "Operation 'modulus' is not supported."),
+])
+def test_define_invalid(workspace, source, message):
+    """
+    Test that invalid names, operands, assignments and cycles raise ValueError.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        workspace.define(source)
+    assert message in str(e.value)
+
+
+def test_long_chain():
+    """
+    Test that long chains are recomputed without hitting the recursion limit.
+    """
+    # Arrange
+    workspace = Workspace()
+    workspace.define("v0 = 0")
+    for i in range(1, 3000):
+        workspace.define(f"v{i} = add v{i - 1} 1")
+
+    # Act
+    _, recomputed = workspace.define("v0 = 1")
+
+    # Assert
+    assert len(recomputed) == 2999
+    assert workspace["v2999"].value == 3000.0
+
+
+def test_workspace_with_backend():
+    """
+    Test that a workspace with a backend parses and computes exactly.
+    """
+    # Arrange
+    workspace = Workspace(get_backend("fraction"))
+
+    # Act
+    workspace.define("x = 1/3")
+    workspace.define("y = add x x")
+
+    # Assert
+    assert workspace["y"].value == Fraction(2, 3)
+    assert repr(workspace["y"]) == "Variable('y', 'add', ('x', 'x'))"
+    assert isinstance(workspace["x"], Variable)
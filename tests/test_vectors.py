@@ -0,0 +1,137 @@
+"""
+Tests for the vectors module of the application.
+
+These tests check parsing of inline and file vector operands, broadcasting,
+element-wise evaluation and formatting of vector results.
+"""
+
+import pytest
+from array import array
+from app.vectors import VectorCommand, evaluate_vector, format_vector, is_vector_command, parse_operand
+
+
+def write_doubles(path, values):
+    """Helper that writes values to path as packed little-endian doubles."""
+    import struct
+    path.write_bytes(struct.pack(f"<{len(values)}d", *values))
+    return str(path)
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("add 1,2,3 4,5,6", True),
+    ("multiply @a.bin 2", True),
+    ("add 5 3", False),
+    ("add 1,2", False),
+    ("add 1,2 3,4 5,6", False),
+])
+def test_is_vector_command(line, expected):
+    """
+    Test that only three-token lines with a vector operand are vector commands.
+    """
+    # Act & Assert
+    assert is_vector_command(line.split()) is expected
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("1,2.5,-3", [1.0, 2.5, -3.0]),
+    ("7", [7.0]),
+    ("1e3,inf", [1000.0, float("inf")]),
+])
+def test_parse_inline_operand(token, expected):
+    """
+    Test that inline operands become array('d') buffers.
+    """
+    # Act
+    values = parse_operand(token)
+
+    # Assert
+    assert values.typecode == "d"
+    assert values.tolist() == expected
+
+
+def test_parse_file_operand(tmp_path):
+    """
+    Test that "@path" operands read packed little-endian doubles.
+    """
+    # Arrange
+    path = write_doubles(tmp_path / "values.bin", [1.5, 2.5, 3.5])
+
+    # Act & Assert
+    assert parse_operand(f"@{path}").tolist() == [1.5, 2.5, 3.5]
+
+
+@pytest.mark.parametrize("token, message", [
+    ("1,,2", "Invalid vector operand '1,,2'."),
+    ("1,x", "Invalid vector operand '1,x'."),
+    ("@{tmp}/missing.bin", "Cannot read vector file"),
+    ("@{tmp}/odd.bin", "does not contain packed doubles."),
+])
+def test_parse_operand_invalid(tmp_path, token, message):
+    """
+    Test that invalid numbers and unreadable or truncated files raise ValueError.
+    """
+    # Arrange
+    (tmp_path / "odd.bin").write_bytes(b"\x00" * 12)
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        parse_operand(token.format(tmp=tmp_path))
+    assert message in str(e.value)
+
+
+def test_parse_file_operand_not_allowed(tmp_path):
+    """
+    Test that file operands are refused when files are not allowed.
+    """
+    # Arrange
+    path = write_doubles(tmp_path / "values.bin", [1.0])
+
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        parse_operand(f"@{path}", allow_files=False)
+    assert "File operands are not allowed here." in str(e.value)
+
+
+@pytest.mark.parametrize("operation, a, b, expected", [
+    ("add", "1,2,3", "4,5,6", [5.0, 7.0, 9.0]),
+    ("multiply", "1,2,3", "2", [2.0, 4.0, 6.0]),
+    ("subtract", "10", "1,2,3", [9.0, 8.0, 7.0]),
+    ("divide", "8,6", "2,3", [4.0, 2.0]),
+])
+def test_evaluate_vector(operation, a, b, expected):
+    """
+    Test element-wise evaluation, including broadcasting of single values on either side.
+    """
+    # Act
+    values = evaluate_vector(VectorCommand(operation, a, b))
+
+    # Assert
+    assert values == array("d", expected)
+
+
+def test_evaluate_vector_errors():
+    """
+    Test that mismatched lengths, division by zero and unknown operations raise errors.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError) as e:
+        evaluate_vector(VectorCommand("add", "1,2", "1,2,3"))
+    assert "Vector operands must have the same length" in str(e.value)
+    with pytest.raises(ZeroDivisionError):
+        evaluate_vector(VectorCommand("divide", "1,2", "1,0"))
+    with pytest.raises(ValueError) as e:
+        evaluate_vector(VectorCommand("modulus", "1,2", "1,2"))
+    assert "Operation 'modulus' is not supported." in str(e.value)
+
+
+def test_format_vector():
+    """
+    Test that results are comma-separated, and long results are shortened only when a limit is given.
+    """
+    # Arrange
+    values = array("d", range(10))
+
+    # Act & Assert
+    assert format_vector(array("d", [5.0, 7.0])) == "5.0,7.0"
+    assert format_vector(values) == ",".join(str(float(i)) for i in range(10))
+    assert format_vector(values, limit=4) == "0.0,1.0,...,8.0,9.0 (10 values)"